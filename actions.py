@@ -1,90 +1,667 @@
 import os
-import requests
-from typing import Any, Text, Dict, List, Optional
-from datetime import datetime
+import asyncio
+import importlib.util
+import aiohttp
+import threading
+import time
+from collections import OrderedDict, deque
+from urllib.parse import urlsplit
+from typing import Any, Awaitable, Callable, Text, Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, timezone
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from rasa_sdk import Action, Tracker, FormValidationAction
 from rasa_sdk.executor import CollectingDispatcher
 from rasa_sdk.types import DomainDict
 from rasa_sdk.events import SlotSet, AllSlotsReset
 import re
 
-# Optional: OpenAI for advanced queries
-try:
-    import openai
-    openai.api_key = os.getenv("OPENAI_API_KEY")
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-    openai = None
+from medlineplus_mirror import MedlinePlusMirror
+from metrics import ANSWER_SOURCE, REGISTRY, UPSTREAM_LATENCY, instrument_action
+from structured_logging import bind_request_id, get_logger
+from symptom_extraction import CHECKER_SYMPTOM_KEYWORDS, SYMPTOM_EXTRACTOR
+from symptom_rules import SYMPTOM_RULES_PATH, ConditionRules
+from text_normalizer import STOPWORDS, normalize
+
+logger = get_logger("healthbot.actions")
+
+# Optional: OpenAI for advanced queries.
+# Only checked for here; the client itself is imported on first use.
+OPENAI_AVAILABLE = importlib.util.find_spec("openai") is not None
+_openai = None
+
+
+def get_llm_backend():
+    """Import and configure the OpenAI client on first use; None if not installed"""
+    global _openai
+    if _openai is None and OPENAI_AVAILABLE:
+        import openai
+        openai.api_key = os.getenv("OPENAI_API_KEY")
+        _openai = openai
+    return _openai
+
+# ========================================
+# RESPONSE CACHE
+# ========================================
+HEALTH_INFO_CACHE_SIZE = int(os.getenv("HEALTH_INFO_CACHE_SIZE", "512"))
+HEALTH_INFO_CACHE_TTL = float(os.getenv("HEALTH_INFO_CACHE_TTL", "3600"))
+HEALTH_INFO_NEGATIVE_TTL = float(os.getenv("HEALTH_INFO_NEGATIVE_TTL", "300"))
+MEDLINEPLUS_URL = os.getenv("MEDLINEPLUS_URL", "https://connect.medlineplus.gov/service")
+HEALTH_INFO_LATENCY_BUDGET = float(os.getenv("HEALTH_INFO_LATENCY_BUDGET", "3"))
+MEDLINEPLUS_HEDGE_DELAY = float(os.getenv("MEDLINEPLUS_HEDGE_DELAY", "1"))
+
+# "remote_first" asks MedlinePlus before the local knowledge base;
+# "local_first" answers local topics instantly and enriches in the background.
+HEALTH_ANSWER_MODE = os.getenv("HEALTH_ANSWER_MODE", "remote_first")
+HEALTH_REMOTE_ENRICHMENT = os.getenv("HEALTH_REMOTE_ENRICHMENT", "true").lower() == "true"
+
+# Questions that name no topic ("why is my skin yellow") are matched against the
+# local passages by TF-IDF (passage_index.py) before going upstream. The
+# threshold is calibrated on
+# benchmarks/retrieval_labels.jsonl (python benchmarks/retrieval_threshold.py).
+LOCAL_RETRIEVAL_ENABLED = os.getenv("LOCAL_RETRIEVAL_ENABLED", "true").lower() == "true"
+LOCAL_RETRIEVAL_MIN_SCORE = float(os.getenv("LOCAL_RETRIEVAL_MIN_SCORE", "0.18"))
+
+# "live" queries connect.medlineplus.gov; "mirror" queries the local index
+# built with `python medlineplus_mirror.py import <xml>`.
+HEALTH_INFO_SOURCE = os.getenv("HEALTH_INFO_SOURCE", "live")
+MEDLINEPLUS_MIRROR_DB = os.getenv("MEDLINEPLUS_MIRROR_DB", "medlineplus.db")
+
+_medlineplus_mirror: Optional[MedlinePlusMirror] = None
+_medlineplus_mirror_lock = threading.Lock()
+
+
+def get_medlineplus_mirror() -> MedlinePlusMirror:
+    global _medlineplus_mirror
+    with _medlineplus_mirror_lock:
+        if _medlineplus_mirror is None:
+            _medlineplus_mirror = MedlinePlusMirror(MEDLINEPLUS_MIRROR_DB)
+        return _medlineplus_mirror
+
+
+async def lookup_medlineplus_mirror(query: Text) -> Optional[Tuple[Text, Text, Text]]:
+    """Mirror lookup on the default executor, so the SQLite query never blocks the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, lambda: get_medlineplus_mirror().lookup(query))
+
+
+class TTLCache:
+    """
+    Bounded, thread-safe LRU cache with a per-entry time-to-live.
+    None is a valid cached value, so "no result" answers are cached too.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Text, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Text) -> Tuple[bool, Any]:
+        """Return (found, value); expired entries count as a miss"""
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return False, None
+            expires_at, value = item
+            if expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return False, None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def set(self, key: Text, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def peek(self, key: Text) -> Tuple[bool, Any]:
+        """Like get() but without touching LRU order or counters"""
+        with self._lock:
+            item = self._data.get(key)
+        if item is None or item[0] <= time.monotonic():
+            return False, None
+        return True, item[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[Text, int]:
+        with self._lock:
+            return {
+                'size': len(self._data),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+HEALTH_INFO_CACHE = TTLCache(maxsize=HEALTH_INFO_CACHE_SIZE, ttl=HEALTH_INFO_CACHE_TTL)
+
+
+def _cache_samples(cache: TTLCache) -> List[Tuple[Tuple[Text, ...], float]]:
+    stats = cache.stats()
+    lookups = stats['hits'] + stats['misses']
+    samples = [((key,), float(value)) for key, value in stats.items()]
+    samples.append((('hit_ratio',), stats['hits'] / lookups if lookups else 0.0))
+    return samples
+
+
+REGISTRY.gauge(
+    "healthbot_health_info_cache", "search_health_info cache size, counters and hit ratio",
+    lambda: _cache_samples(HEALTH_INFO_CACHE), ("stat",))
+
+# ========================================
+# SHARED HTTP CLIENT
+# ========================================
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "20"))
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+
+_http_session: Optional[aiohttp.ClientSession] = None
+_http_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """
+    Return the pooled ClientSession shared by every action.
+    A session is bound to its event loop, so it is recreated if the loop changes.
+    """
+    global _http_session, _http_session_loop
+    loop = asyncio.get_running_loop()
+    if _http_session is None or _http_session.closed or _http_session_loop is not loop:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        )
+        _http_session = aiohttp.ClientSession(
+            connector=connector,
+            headers={'User-Agent': 'HealthBot/1.0'},
+        )
+        _http_session_loop = loop
+    return _http_session
+
+
+async def close_http_session() -> None:
+    global _http_session, _http_session_loop
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+    _http_session_loop = None
+
+
+# ========================================
+# CIRCUIT BREAKERS
+# ========================================
+BREAKER_WINDOW = float(os.getenv("BREAKER_WINDOW", "60"))
+BREAKER_MIN_CALLS = int(os.getenv("BREAKER_MIN_CALLS", "5"))
+BREAKER_FAILURE_RATE = float(os.getenv("BREAKER_FAILURE_RATE", "0.5"))
+BREAKER_RESET_TIMEOUT = float(os.getenv("BREAKER_RESET_TIMEOUT", "30"))
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker for one upstream host.
+    Opens when at least failure_rate of the calls in the last `window` seconds
+    failed (given min_calls), rejects calls for reset_timeout, then lets a single
+    half-open probe through to decide whether to close again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(
+        self,
+        name: Text,
+        window: float = BREAKER_WINDOW,
+        min_calls: int = BREAKER_MIN_CALLS,
+        failure_rate: float = BREAKER_FAILURE_RATE,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+    ):
+        self.name = name
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._calls: "deque[Tuple[float, bool]]" = deque()
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self._record(True)
+
+    def record_failure(self) -> None:
+        self._record(False)
+
+    def release(self) -> None:
+        """Forget an allowed call that was cancelled before it completed"""
+        self._probe_in_flight = False
+
+    def _record(self, ok: bool) -> None:
+        now = time.monotonic()
+        if self.state == self.HALF_OPEN:
+            self._probe_in_flight = False
+            self._calls.clear()
+            if ok:
+                self.state = self.CLOSED
+            else:
+                self._trip(now)
+            return
+        
+        self._calls.append((now, ok))
+        while self._calls and now - self._calls[0][0] > self.window:
+            self._calls.popleft()
+        failures = sum(1 for _, call_ok in self._calls if not call_ok)
+        if len(self._calls) >= self.min_calls and failures >= self.failure_rate * len(self._calls):
+            self._trip(now)
+
+    def _trip(self, now: float) -> None:
+        logger.warning("Circuit opened for %s", self.name, extra={'upstream': self.name})
+        self.state = self.OPEN
+        self._opened_at = now
+        self._calls.clear()
+
+
+_circuit_breakers: Dict[Text, CircuitBreaker] = {}
+
+REGISTRY.gauge(
+    "healthbot_circuit_open", "1 while the upstream's circuit breaker rejects calls",
+    lambda: [((host,), float(b.state != CircuitBreaker.CLOSED)) for host, b in list(_circuit_breakers.items())],
+    ("host",))
+
+
+def get_circuit_breaker(url: Text) -> CircuitBreaker:
+    host = urlsplit(url).netloc
+    breaker = _circuit_breakers.get(host)
+    if breaker is None:
+        breaker = _circuit_breakers[host] = CircuitBreaker(host)
+    return breaker
+
+
+async def fetch_json(
+    url: Text,
+    params: Optional[Dict[Text, Any]] = None,
+    timeout: float = 10.0,
+) -> Tuple[int, Any]:
+    """
+    GET a JSON document; returns (status, data) with data None unless status is 200.
+    Raises CircuitOpenError without touching the network if the host's circuit is open.
+    """
+    breaker = get_circuit_breaker(url)
+    if not breaker.allow():
+        UPSTREAM_LATENCY.observe(0.0, breaker.name, "circuit_open")
+        raise CircuitOpenError(f"circuit open for {breaker.name}")
+    
+    session = await get_http_session()
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            outcome = str(response.status)
+            if response.status >= 500 or response.status == 429:
+                breaker.record_failure()
+                return response.status, None
+            if response.status != 200:
+                breaker.record_success()
+                return response.status, None
+            data = await response.json(content_type=None)
+    except asyncio.CancelledError:
+        outcome = "cancelled"
+        breaker.release()
+        raise
+    except Exception:
+        outcome = "error"
+        breaker.record_failure()
+        raise
+    finally:
+        UPSTREAM_LATENCY.observe(time.perf_counter() - start, breaker.name, outcome)
+    
+    breaker.record_success()
+    return response.status, data
+
+
+async def hedged(factory: Callable[[], Awaitable[Any]], delay: float) -> Any:
+    """
+    Await factory(); if it has not finished after `delay` seconds, start a second
+    identical request and return whichever succeeds first.
+    """
+    first = asyncio.ensure_future(factory())
+    if delay <= 0:
+        return await first
+    done, _ = await asyncio.wait({first}, timeout=delay)
+    if done:
+        return first.result()
+    
+    pending = {first, asyncio.ensure_future(factory())}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+        return first.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+# ========================================
+# DISEASE.SH SNAPSHOT STORE
+# ========================================
+DISEASE_SH_URL = os.getenv("DISEASE_SH_URL", "https://disease.sh").rstrip('/')
+
+DISEASE_SH_SNAPSHOTS = {
+    'india': (f"{DISEASE_SH_URL}/v3/covid-19/countries/india", None),
+    'global': (f"{DISEASE_SH_URL}/v3/covid-19/all", None),
+    'vaccine_india': (f"{DISEASE_SH_URL}/v3/covid-19/vaccine/coverage/countries/india", {'lastdays': 1}),
+}
+SNAPSHOT_REFRESH_INTERVAL = float(os.getenv("SNAPSHOT_REFRESH_INTERVAL", "900"))
+
+
+class SnapshotStore:
+    """
+    In-process store of disease.sh statistics, refreshed on an interval by APScheduler.
+    Readers always get the last good snapshot; a stale one triggers a background
+    refresh instead of a blocking fetch (stale-while-revalidate).
+    The scheduler is bound to one event loop. The first read on a loop (or an
+    explicit start()) sets it up; a read on another loop, after a worker restart
+    or in tests, replaces it instead of relying on the old loop's jobs.
+    """
+
+    def __init__(self, endpoints: Dict[Text, Tuple[Text, Optional[Dict[Text, Any]]]], refresh_interval: float):
+        self.endpoints = endpoints
+        self.refresh_interval = refresh_interval
+        self._snapshots: Dict[Text, Tuple[Any, datetime, float]] = {}
+        self._inflight: Dict[Text, "asyncio.Task"] = {}
+        self._scheduler: Optional[AsyncIOScheduler] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self) -> None:
+        """Schedule periodic refreshes on the running event loop (once per loop)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self.shutdown()
+        # Refreshes started on a previous loop can never finish on this one
+        self._inflight.clear()
+        self._loop = loop
+        self._scheduler = AsyncIOScheduler(event_loop=loop)
+        self._scheduler.add_job(
+            self.refresh_all,
+            'interval',
+            seconds=self.refresh_interval,
+            next_run_time=datetime.now(timezone.utc),
+            coalesce=True,
+            max_instances=1,
+        )
+        self._scheduler.start()
+
+    def shutdown(self) -> None:
+        # A scheduler whose loop has closed is already dead, and can no longer be reached
+        if self._scheduler is not None and self._scheduler.running and not self._loop.is_closed():
+            self._scheduler.shutdown(wait=False)
+        self._scheduler = None
+        self._loop = None
+
+    async def refresh_all(self) -> None:
+        await asyncio.gather(*(self.refresh(name) for name in self.endpoints))
+
+    async def refresh(self, name: Text) -> bool:
+        """Fetch one endpoint; concurrent callers share a single in-flight request"""
+        task = self._inflight.get(name)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(name))
+            self._inflight[name] = task
+            task.add_done_callback(lambda _: self._inflight.pop(name, None))
+        return await asyncio.shield(task)
+
+    async def _fetch(self, name: Text) -> bool:
+        url, params = self.endpoints[name]
+        try:
+            status, data = await fetch_json(url, params=params, timeout=8)
+        except Exception as e:
+            logger.warning("Snapshot refresh failed for %s: %s", name, e)
+            return False
+        if status != 200:
+            logger.warning("Snapshot refresh for %s returned status %s", name, status)
+            return False
+        self._snapshots[name] = (data, datetime.now(timezone.utc), time.monotonic())
+        return True
+
+    async def get(self, name: Text) -> Optional[Tuple[Any, datetime]]:
+        """
+        Return (data, last_updated) or None if the endpoint has never been fetched.
+        Only the very first read of an endpoint waits on the network.
+        """
+        if self._loop is not asyncio.get_running_loop():
+            self.start()
+        snapshot = self._snapshots.get(name)
+        if snapshot is None:
+            await self.refresh(name)
+            snapshot = self._snapshots.get(name)
+            if snapshot is None:
+                return None
+        data, updated_at, fetched_at = snapshot
+        if time.monotonic() - fetched_at > self.refresh_interval and name not in self._inflight:
+            asyncio.ensure_future(self.refresh(name))
+        return data, updated_at
+
+
+DISEASE_SNAPSHOTS = SnapshotStore(DISEASE_SH_SNAPSHOTS, SNAPSHOT_REFRESH_INTERVAL)
+
+
+def format_last_updated(updated_at: datetime) -> str:
+    return f"🕒 Last updated: {updated_at.strftime('%d %b %Y, %H:%M')} UTC"
+
 
 # ========================================
 # API HELPER FUNCTIONS
 # ========================================
 
-def search_health_info(query: str) -> Optional[str]:
+async def search_health_info(query: str) -> Optional[str]:
     """
     Search health information using multiple reliable sources
     Priority: MedlinePlus (NIH) > Disease Stats > Manual Fallback
+    Answers (including "no result") are cached per cleaned query.
     """
     try:
-        query = query.strip().lower()
-        
-        # Clean query
-        query = re.sub(r'^(what is|tell me about|tell about|info about|information on|i have|my)\s+', '', query, flags=re.IGNORECASE)
-        query = re.sub(r'\s+(info|information|symptoms|symptom)$', '', query, flags=re.IGNORECASE)
-        query = ' '.join(query.split()).strip()
+        query = normalize(query).query
         
         if len(query) < 3:
             return None
         
-        print(f"[DEBUG] Searching health info for: '{query}'")
+        found, cached = HEALTH_INFO_CACHE.get(query)
+        if found:
+            logger.debug("Health info cache hit for %r", query)
+            return cached
         
-        # ===============================
-        # METHOD 1: MedlinePlus NIH API
-        # ===============================
         try:
+            result, definitive = await asyncio.wait_for(
+                _fetch_health_info(query), HEALTH_INFO_LATENCY_BUDGET
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Health info search for %r exceeded %ss budget", query, HEALTH_INFO_LATENCY_BUDGET)
+            return None
+        
+        # Only cache outcomes the upstream actually answered; transport
+        # errors are retried on the next turn.
+        if result is not None:
+            HEALTH_INFO_CACHE.set(query, result)
+        elif definitive:
+            HEALTH_INFO_CACHE.set(query, None, ttl=HEALTH_INFO_NEGATIVE_TTL)
+        
+        return result
+        
+    except Exception as e:
+        logger.exception("Health info search failed: %s", e)
+        return None
+
+
+_background_tasks: set = set()
+_READ_MORE_RE = re.compile(r"🔗 Read more: (\S+)")
+
+
+def warm_health_info(query: str) -> None:
+    """Start a background search_health_info so a later turn is a cache hit"""
+    key = normalize(query).query
+    if len(key) < 3 or HEALTH_INFO_CACHE.peek(key)[0]:
+        return
+    if any(getattr(task, 'query', None) == key for task in _background_tasks):
+        return
+    task = asyncio.ensure_future(search_health_info(key))
+    task.query = key
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def cached_read_more_link(query: str) -> Optional[str]:
+    """MedlinePlus link for the query if an earlier lookup already cached one"""
+    found, answer = HEALTH_INFO_CACHE.peek(normalize(query).query)
+    if not found or not answer:
+        return None
+    match = _READ_MORE_RE.search(answer)
+    return match.group(1) if match else None
+
+
+async def _fetch_health_info(query: str) -> Tuple[Optional[str], bool]:
+    """
+    Uncached lookup behind search_health_info.
+    Returns (answer, definitive) where definitive is False if any upstream failed.
+    """
+    definitive = True
+    
+    logger.debug("Searching health info for %r", query)
+    
+    # ===============================
+    # METHOD 1: MedlinePlus NIH API
+    # ===============================
+    try:
+        if HEALTH_INFO_SOURCE == "mirror":
+            # Offline MedlinePlus mirror (no network)
+            hit = await lookup_medlineplus_mirror(query)
+            if hit:
+                return format_medlineplus_answer(*hit), True
+        else:
             # MedlinePlus Health Topics API (Free, Reliable)
-            url = "https://connect.medlineplus.gov/service"
+            url = MEDLINEPLUS_URL
             params = {
                 'mainSearchCriteria.v.c': query,
                 'informationRecipient.languageCode.c': 'en',
                 'knowledgeResponseType': 'application/json'
             }
             
-            headers = {'User-Agent': 'HealthBot/1.0'}
-            response = requests.get(url, params=params, timeout=10, headers=headers)
+            status, data = await hedged(
+                lambda: fetch_json(url, params=params, timeout=HEALTH_INFO_LATENCY_BUDGET),
+                MEDLINEPLUS_HEDGE_DELAY,
+            )
             
-            if response.status_code == 200:
-                data = response.json()
-                
-                feed = data.get('feed', {})
-                entries = feed.get('entry', [])
-                
-                if entries:
-                    entry = entries[0]
-                    
-                    # Extract information
-                    title_obj = entry.get('title', {})
-                    title = title_obj.get('_value', '') if isinstance(title_obj, dict) else str(title_obj)
-                    
-                    summary_obj = entry.get('summary', {})
-                    summary = summary_obj.get('_value', '') if isinstance(summary_obj, dict) else str(summary_obj)
-                    
-                    # Get URL
-                    link = ''
-                    links = entry.get('link', [])
-                    if isinstance(links, list):
-                        for l in links:
-                            if isinstance(l, dict) and l.get('rel') == 'alternate':
-                                link = l.get('href', '')
-                                break
-                    
-                    if title and summary and len(summary) > 80:
-                        # Limit summary to 500 chars
-                        if len(summary) > 500:
-                            summary = summary[:500] + "..."
-                        
-                        return f"""📚 **{title}**
+            if status == 200:
+                answer = format_medlineplus_entry(data)
+                if answer:
+                    return answer, True
+            else:
+                definitive = False
+            
+            logger.debug("MedlinePlus returned status %s", status)
+    
+    except Exception as e:
+        definitive = False
+        logger.warning("MedlinePlus lookup failed: %s", e)
+    
+    # ===============================
+    # METHOD 2: Disease.sh for COVID
+    # ===============================
+    # In mirror mode the mirror's COVID-19 topic (METHOD 1) is the answer; no network
+    if HEALTH_INFO_SOURCE != "mirror" and ('covid' in query or 'coronavirus' in query):
+        try:
+            snapshot = await DISEASE_SNAPSHOTS.get('india')
+            
+            if snapshot:
+                return format_covid_india_stats(*snapshot), True
+            definitive = False
+        
+        except Exception as e:
+            definitive = False
+            logger.warning("COVID stats error: %s", e)
+    
+    # ===============================
+    # FINAL FALLBACK
+    # ===============================
+    return None, definitive
+
+
+def format_medlineplus_entry(data: Dict[Text, Any]) -> Optional[str]:
+    """Format the first MedlinePlus feed entry, or None if it is unusable"""
+    feed = data.get('feed', {})
+    entries = feed.get('entry', [])
+    
+    if not entries:
+        return None
+    
+    entry = entries[0]
+    
+    # Extract information
+    title_obj = entry.get('title', {})
+    title = title_obj.get('_value', '') if isinstance(title_obj, dict) else str(title_obj)
+    
+    summary_obj = entry.get('summary', {})
+    summary = summary_obj.get('_value', '') if isinstance(summary_obj, dict) else str(summary_obj)
+    
+    # Get URL
+    link = ''
+    links = entry.get('link', [])
+    if isinstance(links, list):
+        for l in links:
+            if isinstance(l, dict) and l.get('rel') == 'alternate':
+                link = l.get('href', '')
+                break
+    
+    if not (title and summary and len(summary) > 80):
+        return None
+    
+    return format_medlineplus_answer(title, summary, link)
+
+
+def format_medlineplus_answer(title: str, summary: str, link: str) -> str:
+    # Limit summary to 500 chars
+    if len(summary) > 500:
+        summary = summary[:500] + "..."
+    
+    return f"""📚 **{title}**
 
 {summary}
 
@@ -95,24 +672,10 @@ This is general health information. Not a substitute for professional medical ad
 🏥 Visit nearest PHC/Government hospital
 
 🔗 Read more: {link if link else 'https://medlineplus.gov'}"""
-            
-            print(f"[DEBUG] MedlinePlus returned status: {response.status_code}")
-        
-        except Exception as e:
-            print(f"[DEBUG] MedlinePlus API error: {e}")
-        
-        # ===============================
-        # METHOD 2: Disease.sh for COVID
-        # ===============================
-        if 'covid' in query or 'coronavirus' in query:
-            try:
-                url = "https://disease.sh/v3/covid-19/countries/india"
-                response = requests.get(url, timeout=8)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    return f"""📊 **COVID-19 Statistics - India**
+
+
+def format_covid_india_stats(data: Dict[Text, Any], updated_at: datetime) -> str:
+    return f"""📊 **COVID-19 Statistics - India**
 
 **Current Status:**
 • Total Cases: {data.get('cases', 'N/A'):,}
@@ -125,21 +688,9 @@ This is general health information. Not a substitute for professional medical ad
 📱 CoWIN: cowin.gov.in
 📞 COVID Helpline: 1800-11-4377
 🏥 Free testing at Government hospitals
-⚠️ Follow COVID-appropriate behavior"""
-            
-            except Exception as e:
-                print(f"[DEBUG] COVID stats error: {e}")
-        
-        # ===============================
-        # FINAL FALLBACK
-        # ===============================
-        return None
-        
-    except Exception as e:
-        print(f"[ERROR] Health info search failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return None
+⚠️ Follow COVID-appropriate behavior
+
+{format_last_updated(updated_at)}"""
 
 
 # ========================================
@@ -174,7 +725,7 @@ class ActionSetLanguage(Action):
         domain: Dict[Text, Any],
     ) -> List[Dict[Text, Any]]:
         
-        message = tracker.latest_message.get('text', '').lower()
+        message = normalize(tracker.latest_message.get('text', '')).text
         
         # Detect language
         if any(word in message for word in ['hindi', 'हिंदी', 'हिन्दी']):
@@ -203,7 +754,7 @@ class ActionVaccinationSchedule(Action):
         domain: Dict[Text, Any],
     ) -> List[Dict[Text, Any]]:
         
-        message = tracker.latest_message.get('text', '').lower()
+        message = normalize(tracker.latest_message.get('text', '')).text
         schedule = self._get_vaccination_schedule(message)
         dispatcher.utter_message(text=schedule)
         return []
@@ -315,30 +866,30 @@ class ActionFetchGovernmentData(Action):
     def name(self) -> Text:
         return "action_fetch_government_data"
 
-    def run(
+    async def run(
         self,
         dispatcher: CollectingDispatcher,
         tracker: Tracker,
         domain: Dict[Text, Any],
     ) -> List[Dict[Text, Any]]:
         
+        bind_request_id(tracker.sender_id)
+        
         try:
             message = "🇮🇳 **Government of India Health Data:**\n\n"
             
             # COVID-19 Data for India
-            response = requests.get(
-                "https://disease.sh/v3/covid-19/countries/india",
-                timeout=5
-            )
+            snapshot = await DISEASE_SNAPSHOTS.get('india')
             
-            if response.status_code == 200:
-                data = response.json()
+            if snapshot:
+                data, updated_at = snapshot
                 message += "📊 **COVID-19 Statistics (India):**\n"
                 message += f"• Total Cases: {data.get('cases', 'N/A'):,}\n"
                 message += f"• Active Cases: {data.get('active', 'N/A'):,}\n"
                 message += f"• Recovered: {data.get('recovered', 'N/A'):,}\n"
                 message += f"• Deaths: {data.get('deaths', 'N/A'):,}\n"
-                message += f"• Today's Cases: {data.get('todayCases', 'N/A'):,}\n\n"
+                message += f"• Today's Cases: {data.get('todayCases', 'N/A'):,}\n"
+                message += f"{format_last_updated(updated_at)}\n\n"
             
             message += """📱 **Government Health Resources:**
 
@@ -371,11 +922,21 @@ Visit: nhp.gov.in"""
                      "📞 National Health Helpline: 1075\n"
                      "🌐 Visit: mohfw.gov.in"
             )
-            print(f"Error: {e}")
+            logger.exception("Government data fetch failed: %s", e)
         
         return []
 
 
+# ========================================
+# SYMPTOM RULES
+# ========================================
+# Condition rules for the symptom checker, compiled to bit masks (see symptom_rules.py)
+SYMPTOM_RULES = ConditionRules.load(SYMPTOM_RULES_PATH)
+_unmatched_symptoms = SYMPTOM_RULES.unknown_symptoms(CHECKER_SYMPTOM_KEYWORDS)
+if _unmatched_symptoms:
+    logger.warning("Symptom rules name symptoms the checker never extracts: %s", ", ".join(_unmatched_symptoms))
+
+
 # ========================================
 # ENHANCED SYMPTOM CHECKER
 # ========================================
@@ -383,25 +944,24 @@ class ActionSymptomChecker(Action):
     def name(self) -> Text:
         return "action_symptom_checker"
 
-    def run(
+    async def run(
         self,
         dispatcher: CollectingDispatcher,
         tracker: Tracker,
         domain: Dict[Text, Any],
     ) -> List[Dict[Text, Any]]:
         
-        message = tracker.latest_message.get('text', '').lower()
+        message = normalize(tracker.latest_message.get('text', '')).text
         
         # If user is just asking about a disease (not reporting symptoms), redirect
         if any(phrase in message for phrase in ['what is', 'tell me about', 'info about', 'information on']):
-        # Call disease info action instead
-           action = ActionAnswerHealthQuestion()
-        return action.run(dispatcher, tracker, domain)
+            # Call disease info action instead
+            action = ActionAnswerHealthQuestion()
+            return await action.run(dispatcher, tracker, domain)
+        
         # Extract multiple symptoms
         symptoms = self._extract_multiple_symptoms(message)
         
-     
-        
         # Analyze symptoms
         analysis = self._analyze_symptoms(symptoms)
         
@@ -417,61 +977,14 @@ class ActionSymptomChecker(Action):
     
     def _extract_multiple_symptoms(self, message):
         """Extract all symptoms from message"""
-        symptom_keywords = {
-            'fever': ['fever', 'temperature', 'feverish'],
-            'cough': ['cough', 'coughing'],
-            'headache': ['headache', 'head pain', 'migraine'],
-            'body ache': ['body ache', 'body pain', 'muscle pain'],
-            'fatigue': ['tired', 'fatigue', 'weakness', 'weak'],
-            'sore throat': ['sore throat', 'throat pain'],
-            'nausea': ['nausea', 'vomiting'],
-            'breathlessness': ['breathless', 'breathing problem', 'shortness of breath'],
-            'chest pain': ['chest pain'],
-            'stomach pain': ['stomach pain', 'stomach ache', 'abdominal pain'],
-            'diarrhea': ['diarrhea', 'loose motion'],
-            'rash': ['rash', 'skin rash'],
-            'leg pain': ['leg pain', 'leg hurt'],
-            'joint pain': ['joint pain', 'knee pain'],
-        }
-        
-        found_symptoms = []
-        for symptom, keywords in symptom_keywords.items():
-            if any(kw in message for kw in keywords):
-                found_symptoms.append(symptom)
-        
-        return found_symptoms
+        return SYMPTOM_EXTRACTOR.symptoms(message, 'checker')
     
     def _analyze_symptoms(self, symptoms):
-        """Analyze combination of symptoms"""
-        conditions = []
-        
-        flu_symptoms = {'fever', 'cough', 'body ache', 'fatigue'}
-        if len(set(symptoms) & flu_symptoms) >= 2:
-            conditions.append("🟡 **Flu/Influenza** - Rest, hydrate, monitor temperature")
-        
-        covid_symptoms = {'fever', 'cough', 'breathlessness', 'fatigue'}
-        if len(set(symptoms) & covid_symptoms) >= 2:
-            conditions.append("🟠 **Possible COVID-19** - Get tested immediately! Isolate yourself.")
-        
-        cold_symptoms = {'sore throat', 'cough', 'headache'}
-        if len(set(symptoms) & cold_symptoms) >= 2:
-            conditions.append("🟢 **Common Cold** - Rest, warm fluids, steam inhalation")
+        """Analyze combination of symptoms against the rules in symptom_rules.yml"""
+        conditions = [rule.message for rule in SYMPTOM_RULES.evaluate(symptoms)]
         
-        dengue_symptoms = {'fever', 'headache', 'body ache', 'rash'}
-        if len(set(symptoms) & dengue_symptoms) >= 3:
-            conditions.append("🔴 **Possible Dengue** - See doctor immediately! Get tested.")
-        
-        gastro_symptoms = {'stomach pain', 'nausea', 'diarrhea'}
-        if len(set(symptoms) & gastro_symptoms) >= 2:
-            conditions.append("🟡 **Gastroenteritis** - Stay hydrated (ORS), avoid solid food temporarily")
-        
-        # Emergency symptoms
-        emergency_symptoms = {'breathlessness', 'chest pain'}
-        if any(s in emergency_symptoms for s in symptoms):
-            conditions.insert(0, "🔴 **EMERGENCY** - Seek immediate medical attention! Call 108")
-        
-        if not conditions:
-            conditions.append("🟢 **General illness** - Monitor symptoms and consult doctor if worsens")
+        if not conditions and SYMPTOM_RULES.fallback:
+            conditions.append(SYMPTOM_RULES.fallback)
         
         return "\n\n".join(conditions)
 
@@ -490,7 +1003,7 @@ class ActionMedicationInfo(Action):
         domain: Dict[Text, Any],
     ) -> List[Dict[Text, Any]]:
         
-        message = tracker.latest_message.get('text', '').lower()
+        message = normalize(tracker.latest_message.get('text', '')).text
         
         medications = {
             'paracetamol': """💊 **Paracetamol:**
@@ -526,58 +1039,245 @@ class ActionMedicationInfo(Action):
 
 
 # ========================================
-# ⭐ SINGLE UNIFIED HEALTH QUESTION HANDLER ⭐
-# THIS IS THE ONLY ActionAnswerHealthQuestion CLASS
-# ========================================
+# HEALTH KNOWLEDGE BASE
 # ========================================
-# ⭐ SINGLE UNIFIED HEALTH QUESTION HANDLER ⭐
-# THIS IS THE ONLY ActionAnswerHealthQuestion CLASS
-# ========================================
-class ActionAnswerHealthQuestion(Action):
-    def name(self) -> Text:
-        return "action_answer_health_question"
+def tokenize(text: str) -> List[str]:
+    return list(normalize(text).tokens)
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance (adjacent swaps count as one edit), capped at limit + 1"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class FuzzyIndex:
+    """
+    SymSpell-style spelling correction over a fixed vocabulary.
+    Every term is indexed under all strings reachable by deleting up to
+    max_distance characters; a query generates its own deletes and only the
+    terms sharing one are compared by edit distance. Short words allow one
+    edit, longer ones two, so "diabetis" resolves but "cold" does not turn into
+    "gold". A word may reach several terms ("tyfoid": typhoid and thyroid);
+    candidates() returns them all, closest first.
+    """
 
-    def run(
-        self,
-        dispatcher: CollectingDispatcher,
-        tracker: Tracker,
-        domain: Dict[Text, Any],
-    ) -> List[Dict[Text, Any]]:
-        
-        question = tracker.latest_message.get('text', '').lower()
-        
-        # Clean the query
-        question = re.sub(r'^(i have|what is|tell me about|tell about|info about|information on|about|info on)\s+', '', question, flags=re.IGNORECASE)
-        question = re.sub(r'\s+(info|information|symptoms|symptom|disease)$', '', question, flags=re.IGNORECASE)
-        question = question.strip()
-        
-        print(f"[DEBUG] Cleaned question: '{question}'")
-        
-        # Quick response topics
-        quick_topics = {
-            'water': "💧 **Water Intake:** Adults should drink 8-10 glasses (2-3 liters) daily. More if exercising or hot weather. 📞 1075",
-            'sleep': "😴 **Sleep:** Adults need 7-9 hours. Tips: fixed schedule, dark room, no screens before bed. 📞 1075",
-            'exercise': "🏃 **Exercise:** 30 minutes moderate activity daily, 5 days/week. Walking, jogging, yoga, cycling. 📞 1075",
-            'diet': "🥗 **Healthy Diet:** Eat variety: fruits, vegetables, whole grains, lean proteins. Limit sugar, salt, processed foods. 📞 1075",
-        }
-        
-        # Check quick topics first
-        for topic, answer in quick_topics.items():
-            if topic in question:
-                dispatcher.utter_message(text=answer)
-                return []
-        
-        # Try external API
-        print(f"[DEBUG] Trying API search for: {question}")
-        result = search_health_info(question)
-        
-        if result:
-            dispatcher.utter_message(text=result)
+    def __init__(self, terms: List[str], max_distance: int = 2, min_length: int = 4):
+        self.max_distance = max_distance
+        self.min_length = min_length
+        self._rank: Dict[str, int] = {}
+        self._deletes: Dict[str, List[str]] = {}
+        # Recent lookups; users repeat the same misspellings
+        self._memo: Dict[str, List[str]] = {}
+        
+        for term in terms:
+            if term in self._rank or len(term) < min_length:
+                continue
+            self._rank[term] = len(self._rank)
+            for variant in self._variants(term, self._allowed(term)):
+                self._deletes.setdefault(variant, []).append(term)
+
+    def _allowed(self, word: str) -> int:
+        return min(self.max_distance, 1 if len(word) <= 5 else 2)
+
+    @staticmethod
+    def _variants(word: str, distance: int) -> set:
+        variants = {word}
+        frontier = {word}
+        for _ in range(distance):
+            frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+            variants |= frontier
+        return variants
+
+    def candidates(self, word: str) -> List[str]:
+        """Vocabulary terms within the allowed distance, closest (then first listed) first"""
+        if word in self._rank:
+            return [word]
+        if len(word) < self.min_length:
             return []
-        
-        # Comprehensive local knowledge base
-        health_topics = {
-            'fever': """🌡️ **Fever Management:**
+        if word in self._memo:
+            return self._memo[word]
+        limit = self._allowed(word)
+        found: Dict[str, Tuple[int, int]] = {}
+        for variant in self._variants(word, limit):
+            for term in self._deletes.get(variant, ()):
+                if term in found:
+                    continue
+                distance = edit_distance(word, term, min(limit, self._allowed(term)))
+                if distance <= min(limit, self._allowed(term)):
+                    found[term] = (distance, self._rank[term])
+        terms = sorted(found, key=found.__getitem__)
+        if len(self._memo) >= 4096:
+            self._memo.clear()
+        self._memo[word] = terms
+        return terms
+
+    def correct(self, word: str) -> Optional[str]:
+        """Closest vocabulary term within the allowed distance, or None"""
+        terms = self.candidates(word)
+        return terms[0] if terms else None
+
+
+_SOUND_FOLDS = (("ph", "f"), ("ck", "k"), ("z", "s"))
+
+
+def _sound(text: str) -> str:
+    """Fold spellings that sound alike ("typhoid" / "tyfoid")"""
+    for spelling, sound in _SOUND_FOLDS:
+        text = text.replace(spelling, sound)
+    return text
+
+
+class TopicIndex:
+    """
+    Load-once lookup over a {topic: answer} table.
+    Matching order: exact key, alias, then a token inverted index over topic and
+    alias phrases. Ties go to the topic listed first, as the old linear scan did.
+    With partial=True a single-word question may also match a topic word by prefix.
+    With fuzzy=True a question that is itself a misspelled topic or alias
+    ("diabetis", "high blod pressure") is corrected as a whole (see FuzzyIndex).
+    Only questions with a word outside the topic vocabulary and outside
+    `known_words` (stopwords, the answer texts and the given real words) are
+    corrected, and only when a single topic is within reach: "hypotension",
+    "cancel my appointment" or "canker sores" are left alone. When several are
+    within reach, a question spelled the way exactly one of them sounds
+    ("tyfoid" for typhoid, not thyroid) still resolves.
+    """
+
+    def __init__(
+        self,
+        topics: Dict[Text, Text],
+        aliases: Optional[Dict[Text, Text]] = None,
+        known_words: Iterable[Text] = (),
+    ):
+        self.topics = topics
+        self.aliases = {alias: topic for alias, topic in (aliases or {}).items() if topic in topics}
+        self._rank = {topic: i for i, topic in enumerate(topics)}
+        # first token of a phrase -> [(phrase tokens, topic)]
+        self._postings: Dict[Text, List[Tuple[Tuple[Text, ...], Text]]] = {}
+        # word prefix (3+ chars) -> best-ranked topic containing that word
+        self._prefixes: Dict[Text, Text] = {}
+        
+        phrases = [(topic, topic) for topic in topics] + list(self.aliases.items())
+        for phrase, topic in phrases:
+            tokens = tuple(tokenize(phrase))
+            if not tokens:
+                continue
+            self._postings.setdefault(tokens[0], []).append((tokens, topic))
+            for token in tokens:
+                for n in range(3, len(token) + 1):
+                    self._prefixes.setdefault(token[:n], topic)
+        
+        # whole phrase ("high blood pressure") -> topic, for correcting whole questions
+        self._phrase_topics: Dict[Text, Text] = {}
+        for phrase, topic in phrases:
+            self._phrase_topics.setdefault(" ".join(tokenize(phrase)), topic)
+        self._fuzzy = FuzzyIndex(list(self._phrase_topics))
+        self._vocabulary = {token for phrase in self._phrase_topics for token in phrase.split()}
+        self._known_words = set(STOPWORDS) | set(known_words)
+        for answer in topics.values():
+            self._known_words.update(tokenize(answer))
+        self._known_words -= self._vocabulary
+
+    def _phrase_match(self, tokens: List[str]) -> Optional[Text]:
+        best = None
+        for i, token in enumerate(tokens):
+            for phrase, topic in self._postings.get(token, ()):
+                if tuple(tokens[i:i + len(phrase)]) != phrase:
+                    continue
+                if best is None or self._rank[topic] < self._rank[best]:
+                    best = topic
+        return best
+
+    def match(self, question: Text, partial: bool = True, fuzzy: bool = True) -> Optional[Text]:
+        """Return the topic key matching the question, or None"""
+        normalized = normalize(question)
+        question = normalized.text
+        if question in self.topics:
+            return question
+        if question in self.aliases:
+            return self.aliases[question]
+        
+        tokens = list(normalized.tokens)
+        best = self._phrase_match(tokens)
+        if best is not None:
+            return best
+        
+        if partial and len(tokens) == 1 and tokens[0] in self._prefixes:
+            return self._prefixes[tokens[0]]
+        
+        if fuzzy:
+            return self._fuzzy_match(tokenize(normalized.query))
+        return None
+
+    def _fuzzy_match(self, tokens: List[str]) -> Optional[Text]:
+        # Real words are not misspellings ("cancel" is not "cancer")
+        if all(token in self._vocabulary or token in self._known_words for token in tokens):
+            return None
+        question = " ".join(tokens)
+        phrases = self._fuzzy.candidates(question)
+        topics = {self._phrase_topics[phrase] for phrase in phrases}
+        if len(topics) == 1:
+            return topics.pop()
+        # Within reach of two topics the question is ambiguous, unless it is
+        # spelled the way exactly one of them sounds
+        sounds_like = {self._phrase_topics[phrase] for phrase in phrases if _sound(phrase) == _sound(question)}
+        return sounds_like.pop() if len(sounds_like) == 1 else None
+
+    def lookup(self, question: Text, partial: bool = True, fuzzy: bool = True) -> Optional[Tuple[Text, Text]]:
+        """Return (topic, answer) for the question, or None"""
+        topic = self.match(question, partial=partial, fuzzy=fuzzy)
+        if topic is None:
+            return None
+        return topic, self.topics[topic]
+
+
+QUICK_TOPICS = {
+    'water': "💧 **Water Intake:** Adults should drink 8-10 glasses (2-3 liters) daily. More if exercising or hot weather. 📞 1075",
+    'sleep': "😴 **Sleep:** Adults need 7-9 hours. Tips: fixed schedule, dark room, no screens before bed. 📞 1075",
+    'exercise': "🏃 **Exercise:** 30 minutes moderate activity daily, 5 days/week. Walking, jogging, yoga, cycling. 📞 1075",
+    'diet': "🥗 **Healthy Diet:** Eat variety: fruits, vegetables, whole grains, lean proteins. Limit sugar, salt, processed foods. 📞 1075",
+}
+
+HEALTH_TOPIC_ALIASES = {
+    'tb': 'tuberculosis',
+    'sugar': 'diabetes',
+    'high blood sugar': 'diabetes',
+    'high blood pressure': 'hypertension',
+    'high bp': 'hypertension',
+    'bp': 'blood pressure',
+    'pcos': 'pcod',
+    'corona': 'covid',
+    'coronavirus': 'covid',
+    'hep a': 'hepatitis a',
+    'hep b': 'hepatitis b',
+    'chicken pox': 'chickenpox',
+    'varicella': 'chickenpox',
+    'head ache': 'headache',
+    'backache': 'back pain',
+    'heart attack': 'heart',
+    'cardiac': 'heart',
+    'pregnant': 'pregnancy',
+    'dementia': 'alzheimer',
+    'alzheimers': 'alzheimer',
+    'stress': 'anxiety',
+}
+
+HEALTH_TOPICS = {
+    'fever': """🌡️ **Fever Management:**
 
 **What is Fever?**
 Body temperature above 100.4°F (38°C). It's a symptom, not a disease.
@@ -606,7 +1306,7 @@ Body temperature above 100.4°F (38°C). It's a symptom, not a disease.
 📞 Helpline: 1075
 🚨 Emergency: 102/108""",
 
-            'typhoid': """🦠 **Typhoid Fever:**
+    'typhoid': """🦠 **Typhoid Fever:**
 
 **What is it?**
 Bacterial infection from contaminated food/water.
@@ -630,7 +1330,7 @@ Bacterial infection from contaminated food/water.
 🏥 Free treatment at PHCs
 📞 Helpline: 1075""",
 
-            'cholera': """💧 **Cholera - EMERGENCY:**
+    'cholera': """💧 **Cholera - EMERGENCY:**
 
 **Symptoms:**
 - Severe watery diarrhea ("rice water")
@@ -651,7 +1351,7 @@ Bacterial infection from contaminated food/water.
 🏥 Free treatment at all hospitals
 📞 Helpline: 1075""",
 
-            'malaria': """🦟 **Malaria:**
+    'malaria': """🦟 **Malaria:**
 
 **Symptoms:**
 - High fever (comes in cycles)
@@ -674,7 +1374,7 @@ Bacterial infection from contaminated food/water.
 🏥 Free diagnosis & treatment
 📞 Helpline: 1075""",
 
-            'dengue': """🦟 **Dengue:**
+    'dengue': """🦟 **Dengue:**
 
 **Symptoms:**
 - High fever
@@ -697,7 +1397,7 @@ Bacterial infection from contaminated food/water.
 🏥 Free treatment at Government hospitals
 📞 Helpline: 1075""",
 
-            'jaundice': """🟡 **Jaundice:**
+    'jaundice': """🟡 **Jaundice:**
 
 **Symptoms:**
 - Yellow skin and eyes
@@ -719,7 +1419,7 @@ Bacterial infection from contaminated food/water.
 💉 Free hepatitis vaccines
 📞 Helpline: 1075""",
 
-            'tuberculosis': """🫁 **Tuberculosis (TB):**
+    'tuberculosis': """🫁 **Tuberculosis (TB):**
 
 **Symptoms:**
 - Cough >2 weeks
@@ -741,7 +1441,7 @@ Bacterial infection from contaminated food/water.
 💊 Free medicines at all PHCs
 📞 TB Helpline: 1800-11-6666""",
 
-            'diabetes': """🩸 **Diabetes:**
+    'diabetes': """🩸 **Diabetes:**
 
 **Symptoms:**
 - Excessive thirst
@@ -762,7 +1462,7 @@ Bacterial infection from contaminated food/water.
 🏥 Free screening at PHCs
 📞 Helpline: 1075""",
 
-            'hypertension': """🩺 **High Blood Pressure:**
+    'hypertension': """🩺 **High Blood Pressure:**
 
 **Normal:** <120/80 mmHg
 **High:** >140/90 mmHg
@@ -778,7 +1478,7 @@ Bacterial infection from contaminated food/water.
 🏥 Free screening at all PHCs
 📞 Helpline: 1075""",
 
-            'asthma': """🫁 **Asthma:**
+    'asthma': """🫁 **Asthma:**
 
 **Symptoms:**
 - Wheezing
@@ -796,7 +1496,7 @@ Bacterial infection from contaminated food/water.
 🏥 Free inhalers at Government hospitals
 🚨 Emergency: 102/108""",
 
-            'pcod': """🩺 **PCOD/PCOS:**
+    'pcod': """🩺 **PCOD/PCOS:**
 
 **Symptoms:**
 - Irregular periods
@@ -851,7 +1551,7 @@ Viral liver infection. Spreads through contaminated food/water.
 📞 Helpline: 1075
 ⚠️ Unlike Hep B/C, Hep A does NOT become chronic!""",
 
-            'hepatitis b': """🟡 **Hepatitis B:**
+    'hepatitis b': """🟡 **Hepatitis B:**
 
 **What is it?**
 Viral liver infection. Can be acute or chronic (long-term).
@@ -889,9 +1589,9 @@ Viral liver infection. Can be acute or chronic (long-term).
 ⚠️ Pregnant women MUST get tested!
 ⚠️ Baby needs vaccine within 24 hours of birth!""",
 
-            'hepatitis': """🟡 **Hepatitis:** Liver inflammation. Types: A, B, C, E. Prevention: vaccination (A, B - FREE), clean food/water. 📞 1075""",
+    'hepatitis': """🟡 **Hepatitis:** Liver inflammation. Types: A, B, C, E. Prevention: vaccination (A, B - FREE), clean food/water. 📞 1075""",
 
-            'chickenpox': """🔴 **Chickenpox (Varicella):**
+    'chickenpox': """🔴 **Chickenpox (Varicella):**
 
 **What is it?**
 Highly contagious viral infection. Common in children.
@@ -936,7 +1636,7 @@ Highly contagious viral infection. Common in children.
 📞 Helpline: 1075
 ⚠️ Adults: More severe - see doctor!""",
 
-            'measles': """🔴 **Measles:**
+    'measles': """🔴 **Measles:**
 
 **What is it?**
 Highly contagious viral disease. Preventable by vaccination.
@@ -975,7 +1675,7 @@ Highly contagious viral disease. Preventable by vaccination.
 ⚠️ Measles is SERIOUS - can cause death!
 ⚠️ Get vaccinated - vaccine is safe and effective!""",
 
-            'mumps': """😷 **Mumps:**
+    'mumps': """😷 **Mumps:**
 
 **What is it?**
 Viral infection affecting salivary glands. Causes swelling of cheeks/jaw.
@@ -1013,7 +1713,7 @@ Viral infection affecting salivary glands. Causes swelling of cheeks/jaw.
 📞 Helpline: 1075
 ⚠️ Can cause infertility in males (rare)!""",
 
-            'migraine': """🤕 **Migraine Headache:**
+    'migraine': """🤕 **Migraine Headache:**
 
 **What is it?**
 Intense, throbbing headache, usually on one side.
@@ -1059,7 +1759,7 @@ Prevention:
 📞 Helpline: 1075
 ⚠️ Migraines are manageable with proper treatment!""",
 
-            'headache': """🤕 **Headache:**
+    'headache': """🤕 **Headache:**
 
 **Types:**
 - Tension Headache (most common): dull, aching pain
@@ -1101,7 +1801,7 @@ Prevention:
 📞 Helpline: 1075
 🚨 Severe sudden headache? Call 108!""",
 
-            'back pain': """🔙 **Back Pain:**
+    'back pain': """🔙 **Back Pain:**
 
 **Symptoms:**
 - Dull, aching pain
@@ -1149,7 +1849,7 @@ Prevention:
 💊 Physiotherapy at district hospitals
 📞 Helpline: 1075""",
 
-            'knee pain': """🦵 **Knee Pain:**
+    'knee pain': """🦵 **Knee Pain:**
 
 **Causes:**
 - Injury (ligament, cartilage)
@@ -1173,7 +1873,7 @@ Prevention:
 📞 Helpline: 1075
 🚨 Emergency: 102/108""",
 
-            'leg pain': """🦵 **Leg Pain:**
+    'leg pain': """🦵 **Leg Pain:**
 
 **Immediate Relief:**
 - Rest and elevate legs
@@ -1192,9 +1892,9 @@ Prevention:
 🏥 Free consultation at PHC
 📞 Helpline: 1075""",
 
-            'joint pain': """🦴 **Joint Pain:** Common causes: arthritis, injury, overuse. Management: R.I.C.E (Rest, Ice, Compression, Elevation), pain relievers. See doctor if persistent. 📞 1075""",
+    'joint pain': """🦴 **Joint Pain:** Common causes: arthritis, injury, overuse. Management: R.I.C.E (Rest, Ice, Compression, Elevation), pain relievers. See doctor if persistent. 📞 1075""",
 
-            'diabetes': """🩸 **Diabetes:**
+    'diabetes': """🩸 **Diabetes:**
 
 **What is it?**
 High blood sugar. Body can't produce/use insulin properly.
@@ -1227,7 +1927,7 @@ High blood sugar. Body can't produce/use insulin properly.
 💊 Free medications available
 📞 Helpline: 1075""",
 
-            'hypertension': """🩺 **High Blood Pressure (Hypertension):**
+    'hypertension': """🩺 **High Blood Pressure (Hypertension):**
 
 **Normal:** <120/80 mmHg
 **High:** >140/90 mmHg
@@ -1250,9 +1950,9 @@ High blood sugar. Body can't produce/use insulin properly.
 💊 Free medications available
 📞 Helpline: 1075""",
 
-            'blood pressure': """🩺 **Blood Pressure:** Normal: <120/80 mmHg. High BP (hypertension): >140/90. Often no symptoms. Prevention: low salt, exercise, healthy weight. Free check at PHC. 📞 1075""",
+    'blood pressure': """🩺 **Blood Pressure:** Normal: <120/80 mmHg. High BP (hypertension): >140/90. Often no symptoms. Prevention: low salt, exercise, healthy weight. Free check at PHC. 📞 1075""",
 
-            'thyroid': """🦋 **Thyroid:**
+    'thyroid': """🦋 **Thyroid:**
 
 **Problems:**
 - Hypothyroid (slow metabolism)
@@ -1269,7 +1969,7 @@ High blood sugar. Body can't produce/use insulin properly.
 🏥 Free treatment available
 📞 Helpline: 1075""",
 
-            'cancer': """🎗️ **Cancer:**
+    'cancer': """🎗️ **Cancer:**
 
 **Warning Signs:**
 - Unexplained lumps
@@ -1282,7 +1982,7 @@ High blood sugar. Body can't produce/use insulin properly.
 🏥 Free screening at Government hospitals
 📞 Cancer Helpline: 1800-11-2000""",
 
-            'heart': """❤️ **Heart Disease:**
+    'heart': """❤️ **Heart Disease:**
 
 **Warning Signs:**
 - Chest pain
@@ -1298,7 +1998,7 @@ High blood sugar. Body can't produce/use insulin properly.
 🏥 Free cardiac care under Ayushman Bharat
 🚨 Chest pain? Call 108!""",
 
-            'stroke': """🧠 **Stroke - EMERGENCY:**
+    'stroke': """🧠 **Stroke - EMERGENCY:**
 
 **F.A.S.T:**
 - Face drooping
@@ -1309,7 +2009,7 @@ High blood sugar. Body can't produce/use insulin properly.
 Every minute counts!
 🚨 Call 108 immediately!""",
 
-            'covid': """😷 **COVID-19:**
+    'covid': """😷 **COVID-19:**
 
 **Symptoms:**
 - Fever, cough
@@ -1325,7 +2025,7 @@ Every minute counts!
 
 📞 COVID Helpline: 1800-11-4377""",
 
-            'mental health': """🧠 **Mental Health:**
+    'mental health': """🧠 **Mental Health:**
 
 As important as physical health!
 
@@ -1364,7 +2064,7 @@ As important as physical health!
 📞 Helpline: 1075
 📱 Download: PMSMA App""",
 
-            'pneumonia': """🫁 **Pneumonia:**
+    'pneumonia': """🫁 **Pneumonia:**
 
 **What is it?**
 Lung infection. Can be serious!
@@ -1421,7 +2121,7 @@ Abnormal cell growth.
 💊 Free treatment under various schemes
 📞 National Cancer Helpline: 1800-11-2000""",
 
-            'heart': """❤️ **Heart Disease:**
+    'heart': """❤️ **Heart Disease:**
 
 **Warning Signs:**
 - Chest pain/discomfort
@@ -1442,7 +2142,7 @@ Abnormal cell growth.
 📞 Helpline: 1075
 🚨 Chest pain? Call 108 immediately!""",
 
-            'stroke': """🧠 **Stroke - MEDICAL EMERGENCY:**
+    'stroke': """🧠 **Stroke - MEDICAL EMERGENCY:**
 
 **F.A.S.T Recognition:**
 - **F**ace drooping (one side)
@@ -1467,7 +2167,7 @@ Prevention:
 - Exercise
 - Healthy diet""",
 
-            'arthritis': """🦴 **Arthritis:**
+    'arthritis': """🦴 **Arthritis:**
 
 **What is it?**
 Joint inflammation. Pain and stiffness.
@@ -1493,7 +2193,7 @@ Joint inflammation. Pain and stiffness.
 💊 Rheumatologist at district hospitals
 📞 Helpline: 1075""",
 
-            'alzheimer': """🧠 **Alzheimer's Disease:**
+    'alzheimer': """🧠 **Alzheimer's Disease:**
 
 **What is it?**
 Progressive brain disorder affecting memory.
@@ -1518,7 +2218,7 @@ Progressive brain disorder affecting memory.
 
 ⚠️ Not all memory loss is Alzheimer's!""",
 
-            'depression': """😔 **Depression:**
+    'depression': """😔 **Depression:**
 
 **Symptoms:**
 - Persistent sadness
@@ -1546,7 +2246,7 @@ Progressive brain disorder affecting memory.
 
 🚨 Thoughts of self-harm? Call immediately!""",
 
-            'anxiety': """😰 **Anxiety:**
+    'anxiety': """😰 **Anxiety:**
 
 **Symptoms:**
 - Excessive worry
@@ -1569,16 +2269,173 @@ Progressive brain disorder affecting memory.
 📞 Mental Health Helpline: 1800-599-0019
 📞 General Helpline: 1075""",
 
-        }
+}
+
+# Real words within spelling-correction reach of a topic word; never "corrected"
+# into the topic (the answer texts' own vocabulary is added automatically)
+TOPIC_NEAR_MISS_WORDS = frozenset("""
+    never lever fewer sever seven river cancel canker dancer lancer candor canter
+    heard hearth hearty hears heat start bumps lumps jumps dumps pumps humps
+    hypotension stoke strike strode stroll smoke paint pail gain rain main paid
+    black pack bank buck bark knew kneel heal read dead lead bread sigh thigh
+    flood bloom brood cigar point metal rental dental menial wealth heath
+    coronary coronal acne acre acme measures tongue league chorea choler pros
+    repression gout
+""".split())
+
+QUICK_TOPIC_INDEX = TopicIndex(QUICK_TOPICS)
+HEALTH_TOPIC_INDEX = TopicIndex(HEALTH_TOPICS, HEALTH_TOPIC_ALIASES, TOPIC_NEAR_MISS_WORDS)
+
+
+_local_passage_index: Optional[Any] = None
+_local_index_warming = False
+
+
+def _local_index() -> Any:
+    """The passage index, loaded or built (with its passages) on first use"""
+    global _local_passage_index
+    if _local_passage_index is None:
+        # scikit-learn is only imported on the first question that needs it
+        import passage_index
+        from passage_index import Passage, get_index
+
+        passages = [Passage("topic", topic, text) for topic, text in HEALTH_TOPICS.items()]
+        passages += [Passage("symptom", symptom, text) for symptom, text in SYMPTOM_ADVICE.items()]
+        passages += [Passage("preventive", condition, text) for condition, text in PREVENTIVE_ADVICE.items()]
+        _local_passage_index = get_index("health", passages, passage_index.LOCAL_INDEX_PATH)
+    return _local_passage_index
+
+
+def _retrieve_passage(question: Text, min_score: Optional[float] = None) -> Optional[Any]:
+    keywords = normalize(question).keywords
+    # A lone word names a condition; if it is no topic and upstream missed it,
+    # a passage that merely mentions it ("dehydration" in cholera) is the wrong answer
+    if len(keywords) < 2:
+        return None
+    min_score = LOCAL_RETRIEVAL_MIN_SCORE if min_score is None else min_score
+    hits = _local_index().search(" ".join(keywords), k=1, min_score=min_score)
+    # Character n-grams alone make "cholesterol" look like "cholera": require a shared word
+    return hits[0] if hits and hits[0].shared else None
+
+
+def warm_local_index() -> None:
+    """Load or build the passage index once, in a daemon thread off the answer's path"""
+    global _local_index_warming
+    if _local_index_warming or not LOCAL_RETRIEVAL_ENABLED:
+        return
+    _local_index_warming = True
+
+    def warm() -> None:
+        try:
+            _local_index()
+        except Exception as e:
+            logger.warning("Passage index not prepared: %s", e)
+
+    threading.Thread(target=warm, name="passage-index-warmup", daemon=True).start()
+
+
+async def retrieve_local_passage(question: Text) -> Optional[Any]:
+    """Best local passage for a free-form question, or None below LOCAL_RETRIEVAL_MIN_SCORE"""
+    if not LOCAL_RETRIEVAL_ENABLED or not question:
+        return None
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(None, _retrieve_passage, question)
+    except Exception as e:
+        logger.warning("Local retrieval failed: %s", e)
+        return None
+
+
+# ========================================
+# ⭐ SINGLE UNIFIED HEALTH QUESTION HANDLER ⭐
+# THIS IS THE ONLY ActionAnswerHealthQuestion CLASS
+# ========================================
+# ========================================
+# ⭐ SINGLE UNIFIED HEALTH QUESTION HANDLER ⭐
+# THIS IS THE ONLY ActionAnswerHealthQuestion CLASS
+# ========================================
+class ActionAnswerHealthQuestion(Action):
+    def name(self) -> Text:
+        return "action_answer_health_question"
+
+    async def run(
+        self,
+        dispatcher: CollectingDispatcher,
+        tracker: Tracker,
+        domain: Dict[Text, Any],
+    ) -> List[Dict[Text, Any]]:
+        
+        bind_request_id(tracker.sender_id)
+        
+        # Load the passage index in the background on the first health question
+        warm_local_index()
+        
+        # Lower-cased, with the question framing ("what is ...", "... symptoms") stripped
+        question = normalize(tracker.latest_message.get('text', '')).query
+        
+        logger.debug("Cleaned question %r", question)
         
-        # Check local knowledge base with partial matching
-        for topic, answer in health_topics.items():
-            if topic in question or question in topic:
-                print(f"[DEBUG] Matched topic: {topic}")
+        # Check quick topics first
+        quick = QUICK_TOPIC_INDEX.lookup(question, partial=False, fuzzy=False)
+        if quick:
+            ANSWER_SOURCE.inc("quick")
+            dispatcher.utter_message(text=quick[1])
+            return []
+        
+        # Local-first: answer curated topics without waiting on the network
+        if HEALTH_ANSWER_MODE == "local_first":
+            local = HEALTH_TOPIC_INDEX.lookup(question, fuzzy=False)
+            if local:
+                topic, answer = local
+                logger.debug("Matched topic %s (local first)", topic)
+                link = cached_read_more_link(topic)
+                if link:
+                    answer += f"\n\n🔗 Read more: {link}"
+                elif HEALTH_REMOTE_ENRICHMENT:
+                    warm_health_info(topic)
+                ANSWER_SOURCE.inc("local")
+                dispatcher.utter_message(text=answer)
+                return []
+        
+        # A misspelled topic ("diabetis") would miss upstream too; answer it locally.
+        # Real words and questions within reach of two topics are not corrected.
+        if HEALTH_TOPIC_INDEX.match(question, fuzzy=False) is None:
+            corrected = HEALTH_TOPIC_INDEX.lookup(question)
+            if corrected:
+                topic, answer = corrected
+                logger.debug("Matched topic %s (spelling corrected)", topic)
+                ANSWER_SOURCE.inc("fuzzy")
                 dispatcher.utter_message(text=answer)
                 return []
+            
+            # No topic named at all: rank the local passages by similarity
+            hit = await retrieve_local_passage(question)
+            if hit:
+                logger.debug("Retrieved %s passage %s (score %.2f)", hit.passage.source, hit.passage.key, hit.score)
+                ANSWER_SOURCE.inc("retrieval")
+                dispatcher.utter_message(text=hit.passage.text)
+                return []
+        
+        # Try external API
+        logger.debug("Trying API search for %r", question)
+        result = await search_health_info(question)
+        
+        if result:
+            ANSWER_SOURCE.inc("remote")
+            dispatcher.utter_message(text=result)
+            return []
+        
+        # Check local knowledge base
+        local = HEALTH_TOPIC_INDEX.lookup(question, fuzzy=False)
+        if local:
+            topic, answer = local
+            logger.debug("Matched topic %s", topic)
+            ANSWER_SOURCE.inc("local")
+            dispatcher.utter_message(text=answer)
+            return []
         
         # Ultimate fallback
+        ANSWER_SOURCE.inc("fallback")
         dispatcher.utter_message(
             text="I don't have specific information about that condition.\n\n"
                  "**I can help with:**\n"
@@ -1610,7 +2467,7 @@ class ActionSuggestRemedyFinal(Action):
         symptom = tracker.get_slot("symptom_name")
         
         if not symptom:
-            message = tracker.latest_message.get('text', '').lower()
+            message = normalize(tracker.latest_message.get('text', '')).text
             if 'fever' in message:
                 symptom = 'fever'
             elif 'cough' in message:
@@ -1652,6 +2509,8 @@ class ActionOutbreakAlerts(Action):
         domain: Dict[Text, Any],
     ) -> List[Dict[Text, Any]]:
         
+        bind_request_id(tracker.sender_id)
+        
         location = tracker.get_slot("location") or "India"
         
         try:
@@ -1670,7 +2529,7 @@ class ActionOutbreakAlerts(Action):
                      "🌐 Visit: mohfw.gov.in\n"
                      "📞 Call: 1075"
             )
-            print(f"Alert error: {e}")
+            logger.exception("Outbreak alerts failed: %s", e)
         
         return []
     
@@ -1834,6 +2693,8 @@ class ActionCalculateBMI(Action):
         domain: Dict[Text, Any],
     ) -> List[Dict[Text, Any]]:
         
+        bind_request_id(tracker.sender_id)
+        
         try:
             weight = tracker.get_slot("weight")
             height = tracker.get_slot("height")
@@ -1894,7 +2755,7 @@ class ActionCalculateBMI(Action):
             ]
             
         except Exception as e:
-            print(f"[ERROR] BMI calculation failed: {e}")
+            logger.exception("BMI calculation failed: %s", e)
             dispatcher.utter_message(text="⚠ Unable to calculate BMI. Please try again.\n📞 Helpline: 1075")
             
             return [
@@ -1980,25 +2841,8 @@ Weekly Target: Lose 0.5-1 kg
 # ========================================
 # PREVENTIVE HEALTHCARE
 # ========================================
-class ActionPreventiveHealthcare(Action):
-    def name(self) -> Text:
-        return "action_preventive_healthcare"
-
-    def run(
-        self,
-        dispatcher: CollectingDispatcher,
-        tracker: Tracker,
-        domain: Dict[Text, Any],
-    ) -> List[Dict[Text, Any]]:
-        
-        message_text = tracker.latest_message.get('text', '').lower()
-        advice = self._get_preventive_advice(message_text)
-        dispatcher.utter_message(text=advice)
-        return []
-    
-    def _get_preventive_advice(self, query):
-        preventive_measures = {
-            'diabetes': """🍎 **Prevent Diabetes:**
+PREVENTIVE_ADVICE = {
+    'diabetes': """🍎 **Prevent Diabetes:**
 
 **Diet:**
 • Reduce sugar and refined carbs
@@ -2016,7 +2860,7 @@ class ActionPreventiveHealthcare(Action):
 
 📞 Helpline: 1075""",
 
-            'hypertension': """❤️ **Prevent High Blood Pressure:**
+    'hypertension': """❤️ **Prevent High Blood Pressure:**
 
 **Diet:**
 • Reduce salt intake (< 5g/day)
@@ -2034,9 +2878,27 @@ class ActionPreventiveHealthcare(Action):
 • Free screening at Government hospitals
 
 📞 Helpline: 1075""",
-        }
+}
+
+
+class ActionPreventiveHealthcare(Action):
+    def name(self) -> Text:
+        return "action_preventive_healthcare"
+
+    def run(
+        self,
+        dispatcher: CollectingDispatcher,
+        tracker: Tracker,
+        domain: Dict[Text, Any],
+    ) -> List[Dict[Text, Any]]:
         
-        for disease, advice in preventive_measures.items():
+        message_text = normalize(tracker.latest_message.get('text', '')).text
+        advice = self._get_preventive_advice(message_text)
+        dispatcher.utter_message(text=advice)
+        return []
+    
+    def _get_preventive_advice(self, query):
+        for disease, advice in PREVENTIVE_ADVICE.items():
             if disease in query:
                 return advice
         
@@ -2220,57 +3082,8 @@ class ActionSubmitCheckup(Action):
 # ========================================
 # SYMPTOM RESPONSE
 # ========================================
-class ActionRespondSymptom(Action):
-    def name(self) -> Text:
-        return "action_respond_symptom"
-
-    def run(
-        self,
-        dispatcher: CollectingDispatcher,
-        tracker: Tracker,
-        domain: Dict[Text, Any],
-    ) -> List[Dict[Text, Any]]:
-        
-        message = tracker.latest_message.get('text', '').lower()
-        symptom_name = self._extract_symptom(message)
-        advice = self._get_symptom_advice(symptom_name, message)
-        
-        dispatcher.utter_message(text=advice)
-        return []
-    
-    def _extract_symptom(self, message):
-        """Extract symptom from message"""
-        symptoms = [
-            ('knee pain', ['knee pain', 'knees hurt', 'knee hurting', 'pain in knee', 'my knee', 'knee ache']),
-            ('leg pain', ['leg pain', 'legs hurt', 'leg hurting', 'pain in leg', 'my leg', 'leg ache']),
-            ('joint pain', ['joint pain', 'joints hurt', 'joint ache']),
-            ('migraine', ['migraine']),
-            ('headache', ['headache', 'head pain', 'head ache']),
-            ('chest pain', ['chest pain', 'chest ache']),
-            ('back pain', ['back pain', 'back ache']),
-            ('stomach pain', ['stomach pain', 'stomach ache', 'belly pain']),
-            ('body pain', ['body pain', 'body ache', 'muscle pain']),
-            ('fever', ['fever', 'temperature', 'feverish']),
-            ('cough', ['cough', 'coughing']),
-            ('cold', ['cold', 'runny nose', 'sneezing']),
-            ('sore throat', ['sore throat', 'throat pain']),
-            ('diarrhea', ['diarrhea', 'loose motion']),
-            ('vomiting', ['vomit', 'vomiting', 'nausea']),
-            ('breathlessness', ['breathless', 'breathing problem']),
-        ]
-        
-        for symptom, keywords in symptoms:
-            for keyword in keywords:
-                if keyword in message:
-                    return symptom
-        
-        return "general"
-    
-    def _get_symptom_advice(self, symptom, message=""):
-        """Provide advice for symptoms"""
-        
-        symptom_advice = {
-            'knee pain': """🦵 **Knee Pain Relief:**
+SYMPTOM_ADVICE = {
+    'knee pain': """🦵 **Knee Pain Relief:**
 
 **Immediate Care:**
 • R.I.C.E: Rest, Ice, Compression, Elevation
@@ -2289,7 +3102,7 @@ class ActionRespondSymptom(Action):
 📞 Helpline: 1075
 🚨 Emergency: 102/108""",
 
-            'leg pain': """🦵 **Leg Pain Relief:**
+    'leg pain': """🦵 **Leg Pain Relief:**
 
 **Immediate Relief:**
 • Rest and elevate legs above heart level
@@ -2308,41 +3121,67 @@ class ActionRespondSymptom(Action):
 🏥 Free consultation at PHC
 📞 Helpline: 1075""",
 
-            'fever': """🌡️ **Fever Management:**
+    'fever': """🌡️ **Fever Management:**
 Rest, drink fluids, take paracetamol. 
 See doctor if > 102°F or lasts > 3 days.
 📞 Emergency: 102/108""",
 
-            'headache': """🤕 **Headache Relief:**
+    'headache': """🤕 **Headache Relief:**
 Rest in dark room, drink water, cold compress. 
 See doctor if severe or persistent.
 📞 Helpline: 1075""",
 
-            'cough': """🤧 **Cough Relief:**
+    'cough': """🤧 **Cough Relief:**
 Warm water with honey, steam inhalation, stay hydrated.
 See doctor if lasts > 2 weeks or blood in sputum.
 📞 Helpline: 1075""",
 
-            'stomach pain': """🤢 **Stomach Pain:**
+    'stomach pain': """🤢 **Stomach Pain:**
 Rest, avoid solid food temporarily, drink clear liquids.
 URGENT if: severe pain, vomiting blood, black stools.
 📞 Emergency: 102/108""",
 
-            'chest pain': """🚨 **CHEST PAIN - EMERGENCY:**
+    'chest pain': """🚨 **CHEST PAIN - EMERGENCY:**
 Could be heart attack!
 Call 108 IMMEDIATELY!
 Don't drive yourself - wait for ambulance.
 🚨 Every second counts!""",
 
-            'breathlessness': """🚨 **BREATHLESSNESS - EMERGENCY:**
+    'breathlessness': """🚨 **BREATHLESSNESS - EMERGENCY:**
 Difficulty breathing is serious!
 Call 108 IMMEDIATELY!
 Sit upright, stay calm.
 🚨 Don't delay!""",
-        }
+}
+
+
+class ActionRespondSymptom(Action):
+    def name(self) -> Text:
+        return "action_respond_symptom"
+
+    def run(
+        self,
+        dispatcher: CollectingDispatcher,
+        tracker: Tracker,
+        domain: Dict[Text, Any],
+    ) -> List[Dict[Text, Any]]:
         
-        if symptom in symptom_advice:
-            return symptom_advice[symptom]
+        message = normalize(tracker.latest_message.get('text', '')).text
+        symptom_name = self._extract_symptom(message)
+        advice = self._get_symptom_advice(symptom_name, message)
+        
+        dispatcher.utter_message(text=advice)
+        return []
+    
+    def _extract_symptom(self, message):
+        """Extract the highest-priority symptom from message"""
+        symptoms = SYMPTOM_EXTRACTOR.symptoms(message, 'response')
+        return symptoms[0] if symptoms else "general"
+    
+    def _get_symptom_advice(self, symptom, message=""):
+        """Provide advice for symptoms"""
+        if symptom in SYMPTOM_ADVICE:
+            return SYMPTOM_ADVICE[symptom]
         else:
             return f"""🩺 **Health Concern: {symptom.title()}**
 
@@ -2364,24 +3203,27 @@ class ActionFetchHealthData(Action):
     def name(self) -> Text:
         return "action_fetch_health_data"
 
-    def run(
+    async def run(
         self,
         dispatcher: CollectingDispatcher,
         tracker: Tracker,
         domain: Dict[Text, Any],
     ) -> List[Dict[Text, Any]]:
         
+        bind_request_id(tracker.sender_id)
+        
         try:
-            response = requests.get("https://disease.sh/v3/covid-19/all", timeout=5)
+            snapshot = await DISEASE_SNAPSHOTS.get('global')
             
-            if response.status_code == 200:
-                data = response.json()
+            if snapshot:
+                data, updated_at = snapshot
                 message = "🌍 **Global COVID-19 Data:**\n\n"
                 message += f"• Total Cases: {data.get('cases', 'N/A'):,}\n"
                 message += f"• Deaths: {data.get('deaths', 'N/A'):,}\n"
                 message += f"• Recovered: {data.get('recovered', 'N/A'):,}\n"
                 message += f"• Active: {data.get('active', 'N/A'):,}\n\n"
-                message += "📊 Source: Disease.sh (Live Data)"
+                message += "📊 Source: Disease.sh\n"
+                message += format_last_updated(updated_at)
                 
                 dispatcher.utter_message(text=message)
             else:
@@ -2389,7 +3231,7 @@ class ActionFetchHealthData(Action):
         
         except Exception as e:
             dispatcher.utter_message(text="Error fetching data. Please try: mohfw.gov.in")
-            print(f"Error: {e}")
+            logger.exception("Global health data fetch failed: %s", e)
         
         return []
 
@@ -2398,20 +3240,22 @@ class ActionFetchDiseaseInfo(Action):
     def name(self) -> Text:
         return "action_fetch_disease_info"
 
-    def run(
+    async def run(
         self,
         dispatcher: CollectingDispatcher,
         tracker: Tracker,
         domain: Dict[Text, Any],
     ) -> List[Dict[Text, Any]]:
         
-        message_text = tracker.latest_message.get('text', '').lower()
+        bind_request_id(tracker.sender_id)
+        
+        message_text = normalize(tracker.latest_message.get('text', '')).text
         
         if 'covid' in message_text or 'coronavirus' in message_text:
             action = ActionFetchHealthData()
-            return action.run(dispatcher, tracker, domain)
+            return await action.run(dispatcher, tracker, domain)
         else:
-            wiki_answer = search_health_info(message_text)
+            wiki_answer = await search_health_info(message_text)
             if wiki_answer:
                 dispatcher.utter_message(text=wiki_answer)
             else:
@@ -2450,29 +3294,28 @@ class ActionFetchVaccinationData(Action):
     def name(self) -> Text:
         return "action_fetch_vaccination_data"
 
-    def run(
+    async def run(
         self,
         dispatcher: CollectingDispatcher,
         tracker: Tracker,
         domain: Dict[Text, Any],
     ) -> List[Dict[Text, Any]]:
         
+        bind_request_id(tracker.sender_id)
+        
         try:
-            response = requests.get(
-                "https://disease.sh/v3/covid-19/vaccine/coverage/countries/india?lastdays=1",
-                timeout=5
-            )
+            snapshot = await DISEASE_SNAPSHOTS.get('vaccine_india')
             
-            if response.status_code == 200:
-                data = response.json()
-                
+            if snapshot:
+                data, updated_at = snapshot
                 message = "💉 **COVID-19 Vaccination Data (India):**\n\n"
                 
                 if data.get('timeline'):
                     latest_date = list(data['timeline'].keys())[0]
                     doses = data['timeline'][latest_date]
                     message += f"• Total Doses: {doses:,}\n"
-                    message += f"• Date: {latest_date}\n\n"
+                    message += f"• Date: {latest_date}\n"
+                    message += f"{format_last_updated(updated_at)}\n\n"
                 
                 message += "📱 Register: CoWIN Portal\n"
                 message += "🆓 FREE for all citizens\n"
@@ -2484,6 +3327,18 @@ class ActionFetchVaccinationData(Action):
         
         except Exception as e:
             dispatcher.utter_message(text="For vaccination data, visit: cowin.gov.in")
-            print(f"Vaccination error: {e}")
+            logger.exception("Vaccination data fetch failed: %s", e)
         
-        return []
\ No newline at end of file
+        return []
+
+
+# ========================================
+# METRICS
+# ========================================
+def _instrument_actions() -> None:
+    for action_cls in list(globals().values()):
+        if isinstance(action_cls, type) and issubclass(action_cls, Action) and action_cls.__module__ == __name__:
+            instrument_action(action_cls)
+
+
+_instrument_actions()
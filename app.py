@@ -1,25 +1,166 @@
-import requests
-import gradio as gr
-
-API_URL = "http://localhost:5005/webhooks/rest/webhook"
-
-def chat_with_bot(message, sender="Renuka"):
-    if not message:
-        return "Please type a message."
-    payload = {"sender": sender, "message": message}
-    response = requests.post(API_URL, json=payload)
-    if response.status_code == 200:
-        data = response.json()
-        if data:
-            return " ".join([m.get("text", "") for m in data])
-        else:
-            return "🤖 (No reply)"
-    else:
-        return f"Error: {response.status_code}"
-
-with gr.Blocks(title="AI Health Chatbot") as demo:
-    gr.Markdown("## 🩺 AI Health Chatbot\nTalk to your assistant about health and wellness tips.")
-    chatbox = gr.ChatInterface(fn=chat_with_bot, title="AI Health Chatbot")
-
-if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=7860, debug=False)
\ No newline at end of file
+import asyncio
+import os
+import uuid
+from collections import OrderedDict
+
+import aiohttp
+import gradio as gr
+
+# Optional: python-socketio (installed with rasa) for streaming replies
+try:
+    import socketio
+    SOCKETIO_AVAILABLE = True
+except ImportError:
+    SOCKETIO_AVAILABLE = False
+    socketio = None
+
+API_URL = os.getenv("RASA_API_URL", "http://localhost:5005/webhooks/rest/webhook")
+
+# "rest" waits for the whole reply; "stream" shows each bot_uttered message as it arrives
+CHAT_MODE = os.getenv("CHAT_MODE", "rest")
+RASA_SOCKET_URL = os.getenv("RASA_SOCKET_URL", "http://localhost:5005")
+STREAM_IDLE_TIMEOUT = float(os.getenv("STREAM_IDLE_TIMEOUT", "1.5"))
+MAX_SOCKET_SESSIONS = int(os.getenv("MAX_SOCKET_SESSIONS", "500"))
+
+# Requests allowed in flight to Rasa at once, and how many chat turns Gradio runs concurrently
+RASA_MAX_CONCURRENCY = int(os.getenv("RASA_MAX_CONCURRENCY", "32"))
+UI_CONCURRENCY = int(os.getenv("UI_CONCURRENCY", "64"))
+RASA_TIMEOUT = float(os.getenv("RASA_TIMEOUT", "30"))
+
+_session = None
+_session_loop = None
+_semaphore = None
+
+
+async def get_session():
+    """Pooled keep-alive client shared by every browser session (one per event loop)"""
+    global _session, _session_loop, _semaphore
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=RASA_MAX_CONCURRENCY, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=RASA_TIMEOUT, connect=5),
+        )
+        _session_loop = loop
+        _semaphore = asyncio.Semaphore(RASA_MAX_CONCURRENCY)
+    return _session
+
+
+def sender_id(request):
+    """Each browser session gets its own Rasa conversation tracker"""
+    session_hash = getattr(request, "session_hash", None) if request else None
+    return f"web-{session_hash or uuid.uuid4().hex}"
+
+
+async def chat_with_bot(message, history, request: gr.Request = None):
+    if not message:
+        return "Please type a message."
+    payload = {"sender": sender_id(request), "message": message}
+    session = await get_session()
+    try:
+        async with _semaphore:
+            async with session.post(API_URL, json=payload) as response:
+                if response.status != 200:
+                    return f"Error: {response.status}"
+                data = await response.json(content_type=None)
+    except asyncio.TimeoutError:
+        return "⏳ The assistant is taking too long to respond. Please try again."
+    except aiohttp.ClientError as e:
+        return f"Error: {e}"
+    if data:
+        return " ".join([m.get("text", "") for m in data])
+    else:
+        return "🤖 (No reply)"
+
+
+class SocketConversation:
+    """One socket.io connection to Rasa's socketio channel per browser session"""
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.queue = asyncio.Queue()
+        self.confirmed = asyncio.Event()
+        self.client = socketio.AsyncClient(reconnection=True)
+        self.client.on("bot_uttered", self._on_bot_uttered)
+        self.client.on("session_confirm", self._on_session_confirm)
+
+    async def _on_bot_uttered(self, data):
+        await self.queue.put(data)
+
+    async def _on_session_confirm(self, *args):
+        self.confirmed.set()
+
+    async def ensure_connected(self):
+        if self.client.connected:
+            return
+        self.confirmed.clear()
+        await self.client.connect(RASA_SOCKET_URL, transports=["websocket"])
+        await self.client.emit("session_request", {"session_id": self.session_id})
+        await asyncio.wait_for(self.confirmed.wait(), RASA_TIMEOUT)
+
+    async def send(self, text):
+        # Drop late replies left over from the previous turn
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        await self.client.emit("user_uttered", {"message": text, "session_id": self.session_id})
+
+    async def replies(self):
+        """Yield bot messages until none arrives for STREAM_IDLE_TIMEOUT seconds"""
+        timeout = RASA_TIMEOUT
+        while True:
+            try:
+                data = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                return
+            yield data
+            timeout = STREAM_IDLE_TIMEOUT
+
+    async def close(self):
+        if self.client.connected:
+            await self.client.disconnect()
+
+
+_conversations = OrderedDict()
+
+
+async def get_conversation(session_id):
+    conversation = _conversations.get(session_id)
+    if conversation is None:
+        conversation = _conversations[session_id] = SocketConversation(session_id)
+        while len(_conversations) > MAX_SOCKET_SESSIONS:
+            _, oldest = _conversations.popitem(last=False)
+            await oldest.close()
+    _conversations.move_to_end(session_id)
+    return conversation
+
+
+async def stream_chat_with_bot(message, history, request: gr.Request = None):
+    if not message:
+        yield "Please type a message."
+        return
+    conversation = await get_conversation(sender_id(request))
+    try:
+        await conversation.ensure_connected()
+        await conversation.send(message)
+    except Exception as e:
+        yield f"Error: {e}"
+        return
+    parts = []
+    async for data in conversation.replies():
+        text = data.get("text") if isinstance(data, dict) else None
+        if text:
+            parts.append(text)
+            yield "\n\n".join(parts)
+    if not parts:
+        yield "🤖 (No reply)"
+
+
+with gr.Blocks(title="AI Health Chatbot") as demo:
+    gr.Markdown("## 🩺 AI Health Chatbot\nTalk to your assistant about health and wellness tips.")
+    streaming = CHAT_MODE == "stream" and SOCKETIO_AVAILABLE
+    chatbox = gr.ChatInterface(fn=stream_chat_with_bot if streaming else chat_with_bot, title="AI Health Chatbot")
+
+demo.queue(default_concurrency_limit=UI_CONCURRENCY)
+
+if __name__ == '__main__':
+    demo.launch(server_name='0.0.0.0', server_port=7860)
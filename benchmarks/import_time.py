@@ -0,0 +1,72 @@
+"""
+Cold-start benchmark for the action server's actions module.
+
+Imports the module in fresh interpreters (as each rasa_sdk worker does) and
+reports wall-clock import time plus the slowest imports from `-X importtime`.
+
+Usage:
+    python benchmarks/import_time.py [--module actions] [--runs 10] [--top 15]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Text, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def time_import(module: Text) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], cwd=ROOT, check=True)
+    return time.perf_counter() - start
+
+
+def baseline() -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], cwd=ROOT, check=True)
+    return time.perf_counter() - start
+
+
+def slowest_imports(module: Text, top: int) -> List[Tuple[int, Text]]:
+    """(cumulative microseconds, package) for the heaviest top-level imports"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, check=True, capture_output=True, text=True,
+    )
+    cumulative: Dict[Text, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cum_us, name = line.split("|", 2)
+        # Only count top-level entries (no extra indentation in the tree)
+        if name.startswith("  "):
+            continue
+        cumulative[name.strip()] = int(cum_us)
+    return sorted(((us, name) for name, us in cumulative.items()), reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import-time benchmark")
+    parser.add_argument("--module", default="actions")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    interpreter = statistics.median(baseline() for _ in range(args.runs))
+    samples = [time_import(args.module) for _ in range(args.runs)]
+
+    print(f"Module: {args.module} ({args.runs} runs)")
+    print(f"  interpreter start: {interpreter * 1000:8.1f} ms")
+    print(f"  median import:     {(statistics.median(samples) - interpreter) * 1000:8.1f} ms")
+    print(f"  min import:        {(min(samples) - interpreter) * 1000:8.1f} ms")
+    print(f"  max import:        {(max(samples) - interpreter) * 1000:8.1f} ms")
+    print("\nSlowest top-level imports:")
+    for us, name in slowest_imports(args.module, args.top):
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
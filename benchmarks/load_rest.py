@@ -0,0 +1,241 @@
+"""
+Open-loop load generator for the Rasa REST channel (/webhooks/rest/webhook).
+
+Synthetic senders start conversations at Poisson arrivals (--rate per second)
+regardless of how fast the server answers, so queueing delay shows up in the
+numbers instead of silently lowering the offered load. Conversations are either
+single nlu.yml examples or multi-turn stories.yml flows, including the BMI and
+health-checkup forms.
+
+End-to-end latency is split into:
+  - NLU: /model/parse on a sample of the same messages (needs `rasa run --enable-api`)
+  - action server: healthbot_action_duration_seconds deltas scraped from the
+    action server's /metrics endpoint (see metrics.py; start the action server
+    with METRICS_ENABLED=true)
+  - policy + overhead: the remainder
+
+Usage:
+    python benchmarks/load_rest.py --url http://localhost:5005 --rate 20 --duration 60
+        [--story-ratio 0.5] [--nlu-sample 0.1] [--metrics-url http://localhost:9102/metrics]
+"""
+import argparse
+import asyncio
+import os
+import random
+import re
+import statistics
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Text, Tuple
+
+import aiohttp
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_ENTITY_RE = re.compile(r"\[([^\]]+)\]\([^)]*\)|\[([^\]]+)\]\{[^}]*\}")
+_METRIC_RE = re.compile(r'^healthbot_action_duration_seconds_(sum|count)\{action="([^"]+)",outcome="[^"]+"\} ([0-9.eE+-]+)$')
+
+# Answers fed to each form's required slots, in order
+FORM_ANSWERS: Dict[Text, List[List[Text]]] = {
+    "bmi_form": [["70", "82", "55"], ["170", "165", "158"], ["30", "45", "22"], ["male", "female"]],
+    "health_checkup_form": [["99", "101.2", "normal"], ["happy", "neutral", "anxious"], ["3", "0", "7"], ["headache", "fever", "cough"]],
+}
+
+
+def load_yaml(name: Text) -> Dict[Text, Any]:
+    with open(os.path.join(ROOT, name), encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def load_examples() -> Dict[Text, List[Text]]:
+    examples: Dict[Text, List[Text]] = {}
+    for block in load_yaml("nlu.yml").get("nlu", []):
+        intent = block.get("intent")
+        if not intent:
+            continue
+        for line in (block.get("examples") or "").splitlines():
+            text = line.strip().lstrip("-").strip()
+            if text:
+                examples.setdefault(intent, []).append(_ENTITY_RE.sub(lambda m: m.group(1) or m.group(2), text))
+    return examples
+
+
+def load_flows() -> List[List[Tuple[Text, Any]]]:
+    """Each story becomes a list of ("intent", name) and ("form", name) steps"""
+    forms = set(load_yaml("domain.yml").get("forms", {}) or {})
+    flows = []
+    for story in load_yaml("stories.yml").get("stories", []):
+        steps = []
+        for step in story.get("steps", []):
+            if "intent" in step:
+                steps.append(("intent", step["intent"]))
+            elif step.get("action") in forms:
+                steps.append(("form", step["action"]))
+        if steps:
+            flows.append(steps)
+    return flows
+
+
+class Stats:
+    def __init__(self):
+        self.e2e: List[float] = []
+        self.nlu: List[float] = []
+        self.errors = 0
+        self.dropped = 0
+        self.conversations = 0
+
+
+def render_messages(flow: List[Tuple[Text, Any]], examples: Dict[Text, List[Text]]) -> List[Text]:
+    messages = []
+    for kind, name in flow:
+        if kind == "intent" and examples.get(name):
+            messages.append(random.choice(examples[name]))
+        elif kind == "form":
+            messages.extend(random.choice(choices) for choices in FORM_ANSWERS.get(name, []))
+    return messages
+
+
+async def send(session: aiohttp.ClientSession, url: Text, sender: Text, text: Text, stats: Stats) -> None:
+    start = time.perf_counter()
+    try:
+        async with session.post(f"{url}/webhooks/rest/webhook", json={"sender": sender, "message": text}) as response:
+            await response.read()
+            if response.status != 200:
+                stats.errors += 1
+                return
+    except Exception:
+        stats.errors += 1
+        return
+    stats.e2e.append(time.perf_counter() - start)
+
+
+async def probe_nlu(session: aiohttp.ClientSession, url: Text, text: Text, stats: Stats) -> None:
+    start = time.perf_counter()
+    try:
+        async with session.post(f"{url}/model/parse", json={"text": text}) as response:
+            await response.read()
+            if response.status == 200:
+                stats.nlu.append(time.perf_counter() - start)
+    except Exception:
+        pass
+
+
+async def conversation(session: aiohttp.ClientSession, args: argparse.Namespace, messages: List[Text], stats: Stats) -> None:
+    sender = f"load-{uuid.uuid4().hex[:12]}"
+    stats.conversations += 1
+    for text in messages:
+        if random.random() < args.nlu_sample:
+            asyncio.ensure_future(probe_nlu(session, args.url, text, stats))
+        await send(session, args.url, sender, text, stats)
+        if args.think_time:
+            await asyncio.sleep(random.expovariate(1 / args.think_time))
+
+
+async def scrape_action_time(session: aiohttp.ClientSession, metrics_url: Optional[Text]) -> Dict[Text, Tuple[float, float]]:
+    """action -> (sum seconds, count) from the action server's /metrics"""
+    totals: Dict[Text, List[float]] = {}
+    if not metrics_url:
+        return {}
+    try:
+        async with session.get(metrics_url) as response:
+            body = await response.text()
+    except Exception:
+        return {}
+    for line in body.splitlines():
+        match = _METRIC_RE.match(line)
+        if match:
+            kind, action, value = match.groups()
+            pair = totals.setdefault(action, [0.0, 0.0])
+            pair[0 if kind == "sum" else 1] += float(value)
+    return {action: (pair[0], pair[1]) for action, pair in totals.items()}
+
+
+def pct(samples: List[float], p: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+
+
+async def run(args: argparse.Namespace) -> None:
+    examples = load_examples()
+    flows = load_flows()
+    singles = [[("intent", intent)] for intent in examples]
+    stats = Stats()
+
+    connector = aiohttp.TCPConnector(limit=args.max_inflight, keepalive_timeout=30)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        actions_before = await scrape_action_time(session, args.metrics_url)
+
+        tasks: set = set()
+        start = time.perf_counter()
+        next_arrival = start
+        while True:
+            next_arrival += random.expovariate(args.rate)
+            if next_arrival - start > args.duration:
+                break
+            await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+            if len(tasks) >= args.max_inflight:
+                stats.dropped += 1
+                continue
+            flow = random.choice(flows) if flows and random.random() < args.story_ratio else random.choice(singles)
+            task = asyncio.ensure_future(conversation(session, args, render_messages(flow, examples), stats))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.wait(tasks, timeout=args.timeout)
+        elapsed = time.perf_counter() - start
+        actions_after = await scrape_action_time(session, args.metrics_url)
+
+    messages = len(stats.e2e)
+    print(f"Offered rate:     {args.rate:.1f} conversations/s for {args.duration:.0f}s")
+    print(f"Conversations:    {stats.conversations} started, {stats.dropped} dropped (max in-flight {args.max_inflight})")
+    print(f"Messages:         {messages} ok, {stats.errors} errors, {messages / elapsed:.1f} msg/s")
+    print(f"End-to-end:       p50 {pct(stats.e2e, 50) * 1000:.1f} ms  p95 {pct(stats.e2e, 95) * 1000:.1f} ms  p99 {pct(stats.e2e, 99) * 1000:.1f} ms")
+
+    mean_e2e = statistics.mean(stats.e2e) if stats.e2e else 0.0
+    mean_nlu = statistics.mean(stats.nlu) if stats.nlu else 0.0
+    if stats.nlu:
+        print(f"NLU (/model/parse, n={len(stats.nlu)}): p50 {pct(stats.nlu, 50) * 1000:.1f} ms  p95 {pct(stats.nlu, 95) * 1000:.1f} ms")
+
+    action_total = 0.0
+    if actions_after:
+        print("Action server:")
+        for action, (total, count) in sorted(actions_after.items()):
+            before_total, before_count = actions_before.get(action, (0.0, 0.0))
+            calls = count - before_count
+            if calls > 0:
+                action_total += total - before_total
+                print(f"  {action:34} {int(calls):6} calls  mean {(total - before_total) / calls * 1000:8.2f} ms")
+    mean_action = action_total / messages if messages else 0.0
+
+    print("Mean per message:")
+    print(f"  end-to-end         {mean_e2e * 1000:8.2f} ms")
+    print(f"  NLU                {mean_nlu * 1000:8.2f} ms" + ("" if stats.nlu else "  (no samples; run rasa with --enable-api)"))
+    print(f"  action server      {mean_action * 1000:8.2f} ms" + ("" if actions_after else "  (no metrics; pass --metrics-url)"))
+    print(f"  policy + overhead  {max(0.0, mean_e2e - mean_nlu - mean_action) * 1000:8.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Open-loop load generator for the Rasa REST webhook")
+    parser.add_argument("--url", default="http://localhost:5005")
+    parser.add_argument("--rate", type=float, default=10.0, help="new conversations per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of arrivals")
+    parser.add_argument("--story-ratio", type=float, default=0.5, help="share of multi-turn stories.yml flows")
+    parser.add_argument("--think-time", type=float, default=0.0, help="mean seconds between turns")
+    parser.add_argument("--nlu-sample", type=float, default=0.1, help="share of messages also sent to /model/parse")
+    parser.add_argument("--metrics-url", default="http://localhost:9102/metrics")
+    parser.add_argument("--max-inflight", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    if args.seed is not None:
+        random.seed(args.seed)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
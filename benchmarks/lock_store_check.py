@@ -0,0 +1,130 @@
+"""
+Multi-replica check for the conversation lock store.
+
+Runs --replicas simulated Rasa servers, each a thread with its own event loop
+and its own lock store client, all pointed at one Redis-protocol server (an
+in-process fakeredis server by default, or a real Redis via --url). Every
+replica handles messages for the same small set of conversations under
+`LockStore.lock()`, the way rasa.core.agent does, and the script counts how
+often two replicas were inside the lock for one conversation at the same time.
+
+    python benchmarks/lock_store_check.py [--store replica_safe|redis] [--replicas 4]
+        [--conversations 20] [--messages 50] [--url localhost --port 6379]
+
+`--store redis` runs Rasa's stock RedisLockStore for comparison. The exit code
+is 1 if any overlap was seen. tests/test_lock_store.py runs the same check
+with fakeredis as part of the test suite; both need requirements-dev.txt.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from rasa.core.lock_store import RedisLockStore  # noqa: E402
+
+from lock_store import ReplicaSafeLockStore, create_client  # noqa: E402
+
+
+class Monitor:
+    """Tracks who is inside the lock for each conversation"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.active: Dict[str, int] = {}
+        self.overlaps = 0
+        self.handled = 0
+        self.waits: List[float] = []
+
+    def enter(self, conversation_id: str, waited: float) -> None:
+        with self._lock:
+            self.active[conversation_id] = self.active.get(conversation_id, 0) + 1
+            if self.active[conversation_id] > 1:
+                self.overlaps += 1
+            self.waits.append(waited)
+
+    def leave(self, conversation_id: str) -> None:
+        with self._lock:
+            self.active[conversation_id] -= 1
+            self.handled += 1
+
+
+def build_store(args: argparse.Namespace) -> Any:
+    client = create_client(args.url, args.port, args.db)
+    if args.store == "redis":
+        store = RedisLockStore(host=args.url if args.url != "fakeredis" else "localhost", port=args.port, db=args.db)
+        store.red = client
+        return store
+    return ReplicaSafeLockStore(client=client)
+
+
+async def replica(store: Any, args: argparse.Namespace, monitor: Monitor) -> None:
+    async def handle(conversation_id: str) -> None:
+        start = time.perf_counter()
+        async with store.lock(conversation_id, lock_lifetime=args.lifetime, wait_time_in_seconds=args.poll):
+            monitor.enter(conversation_id, time.perf_counter() - start)
+            # Yield inside the critical section, like a real message handler awaiting the action server
+            await asyncio.sleep(random.uniform(0, args.work))
+            monitor.leave(conversation_id)
+
+    conversations = [f"conversation-{i}" for i in range(args.conversations)]
+    await asyncio.gather(*(handle(random.choice(conversations)) for _ in range(args.messages)))
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Check that the lock store serialises conversations across replicas")
+    parser.add_argument("--store", choices=["replica_safe", "redis"], default="replica_safe")
+    parser.add_argument("--replicas", type=int, default=4)
+    parser.add_argument("--conversations", type=int, default=20)
+    parser.add_argument("--messages", type=int, default=50, help="messages per replica")
+    parser.add_argument("--work", type=float, default=0.005, help="max seconds spent inside the lock")
+    parser.add_argument("--poll", type=float, default=0.01, help="lock wait_time_in_seconds")
+    parser.add_argument("--lifetime", type=float, default=5.0, help="ticket lifetime; lost tickets block others this long")
+    parser.add_argument("--url", default="fakeredis", help='Redis host, or "fakeredis" for the in-process stand-in')
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--db", type=int, default=1)
+    return parser.parse_args(argv)
+
+
+def run_check(args: argparse.Namespace) -> Tuple[Monitor, List[BaseException], float]:
+    """Run every replica to completion; returns the monitor, replica errors and elapsed seconds"""
+    monitor = Monitor()
+    errors: List[BaseException] = []
+
+    def run_replica() -> None:
+        try:
+            asyncio.run(replica(build_store(args), args, monitor))
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run_replica, name=f"replica-{i}") for i in range(args.replicas)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return monitor, errors, time.perf_counter() - start
+
+
+def main() -> None:
+    args = parse_args()
+    monitor, errors, elapsed = run_check(args)
+
+    waits = sorted(monitor.waits) or [0.0]
+    print(f"Store:        {args.store} on {args.url}")
+    print(f"Replicas:     {args.replicas} x {args.messages} messages over {args.conversations} conversations")
+    print(f"Handled:      {monitor.handled} in {elapsed:.2f}s ({monitor.handled / elapsed:.0f} msg/s), {len(errors)} errors")
+    print(f"Lock wait:    p50 {waits[len(waits) // 2] * 1000:.1f} ms  max {waits[-1] * 1000:.1f} ms")
+    print(f"Overlaps:     {monitor.overlaps}")
+    for error in errors[:3]:
+        print(f"  {type(error).__name__}: {error}")
+    sys.exit(1 if monitor.overlaps or errors else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Cold-start benchmark for loading the trained model.
+
+Loads the model with rasa.core.agent.Agent.load in fresh interpreters, once
+through Rasa's stock loader (unpack to a temporary directory every time) and
+once through model_cache.py (unpacked once, then loaded in place), and reports
+the median load time of each. Interpreter start and `import rasa` are timed
+separately and excluded.
+
+Usage:
+    python benchmarks/model_load.py [--model 20251102-230658-associative-control.tar.gz] [--runs 5]
+"""
+import argparse
+import glob
+import os
+import statistics
+import subprocess
+import sys
+from typing import List, Text
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LOAD_SCRIPT = """
+import sys, time
+from rasa.core.agent import Agent
+if sys.argv[2] == "cached":
+    import model_cache
+    model_cache.install()
+start = time.perf_counter()
+Agent.load(sys.argv[1])
+print(time.perf_counter() - start)
+"""
+
+
+def load_time(model: Text, mode: Text, cache_dir: Text) -> float:
+    env = dict(os.environ, MODEL_CACHE_DIR=cache_dir)
+    proc = subprocess.run(
+        [sys.executable, "-c", LOAD_SCRIPT, model, mode],
+        cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+    )
+    return float(proc.stdout.strip().splitlines()[-1])
+
+
+def summary(samples: List[float]) -> Text:
+    return f"median {statistics.median(samples):6.2f}s  min {min(samples):6.2f}s  max {max(samples):6.2f}s"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Model load benchmark: stock loader vs unpacked cache")
+    parser.add_argument("--model", help="model archive (default: newest .tar.gz in the project root)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--cache-dir", default=os.path.join(ROOT, ".model_cache"))
+    args = parser.parse_args()
+
+    model = args.model or max(glob.glob(os.path.join(ROOT, "*.tar.gz")), key=os.path.getmtime)
+    print(f"Model: {os.path.basename(model)} ({os.path.getsize(model) / 1e6:.1f} MB), {args.runs} runs each")
+
+    # First cached load pays for unpacking; report it separately
+    first = load_time(model, "cached", args.cache_dir)
+    stock = [load_time(model, "stock", args.cache_dir) for _ in range(args.runs)]
+    cached = [load_time(model, "cached", args.cache_dir) for _ in range(args.runs)]
+
+    print(f"stock loader:        {summary(stock)}")
+    print(f"cache, first start:  {first:6.2f}s")
+    print(f"cache, warm start:   {summary(cached)}")
+    print(f"saved per start:     {statistics.median(stock) - statistics.median(cached):6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark for the keyword pre-router (keyword_router.py).
+
+Offline, from nlu.yml and domain.yml:
+  - k-fold cross-validation: the table is built on k-1 folds and applied to the
+    held-out fold, giving coverage (share of messages routed), precision, and a
+    calibration table of predicted confidence vs observed accuracy
+  - matching cost per message
+
+Online, with --url pointing at `rasa run --enable-api` serving a model trained
+with the router: /model/parse latency for routed vs DIET messages, and the
+NLU time saved per message at the measured coverage.
+
+Usage:
+    python benchmarks/nlu_router.py [--folds 5] [--url http://localhost:5005 --repeat 5]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Text, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from keyword_router import KeywordRouteTable, load_domain_intents, load_nlu_examples  # noqa: E402
+
+BUCKETS = (0.75, 0.8, 0.85, 0.9, 0.95, 1.01)
+
+
+def cross_validate(examples: List[Tuple[Text, Text]], excluded: set, allowed: set, folds: int, min_confidence: float) -> None:
+    shuffled = examples[:]
+    random.shuffle(shuffled)
+    routed = correct = 0
+    calibration: Dict[float, List[int]] = defaultdict(lambda: [0, 0])
+    for k in range(folds):
+        held_out = shuffled[k::folds]
+        train = [example for i, example in enumerate(shuffled) if i % folds != k]
+        table = KeywordRouteTable.build(train, excluded, allowed, min_confidence=min_confidence)
+        for text, intent in held_out:
+            match = table.match(text)
+            if match is None:
+                continue
+            routed += 1
+            hit = int(match[0] == intent)
+            correct += hit
+            bucket = next(b for b in BUCKETS if match[1] < b)
+            calibration[bucket][0] += hit
+            calibration[bucket][1] += 1
+
+    total = len(examples)
+    print(f"{folds}-fold cross-validation on {total} examples (min_confidence {min_confidence}):")
+    print(f"  coverage   {routed / total * 100:5.1f}% routed, the rest falls through to DIET")
+    print(f"  precision  {correct / routed * 100 if routed else 0.0:5.1f}% of routed messages get the labelled intent")
+    print("  confidence bucket   routed   accuracy")
+    lower = min_confidence
+    for bucket in BUCKETS:
+        hits, count = calibration.get(bucket, [0, 0])
+        if count:
+            print(f"  [{lower:.2f}, {min(bucket, 1.0):.2f})      {count:6}   {hits / count * 100:7.1f}%")
+        lower = bucket
+
+
+def time_matching(table: KeywordRouteTable, messages: List[Text], repeat: int = 200) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for message in messages:
+            table.match(message)
+    return (time.perf_counter() - start) / (repeat * len(messages))
+
+
+async def time_parse(url: Text, messages: List[Text], repeat: int) -> Tuple[List[float], List[float]]:
+    import aiohttp
+
+    routed: List[float] = []
+    diet: List[float] = []
+    async with aiohttp.ClientSession() as session:
+        for _ in range(repeat):
+            for text in messages:
+                start = time.perf_counter()
+                async with session.post(f"{url}/model/parse", json={"text": text}) as response:
+                    data = await response.json()
+                elapsed = time.perf_counter() - start
+                (routed if data.get("keyword_route") else diet).append(elapsed)
+    return routed, diet
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Keyword pre-router benchmark")
+    parser.add_argument("--nlu", default=os.path.join(ROOT, "nlu.yml"))
+    parser.add_argument("--domain", default=os.path.join(ROOT, "domain.yml"))
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--min-confidence", type=float, default=0.75)
+    parser.add_argument("--url", help="Rasa server started with --enable-api")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    examples, with_entities = load_nlu_examples(args.nlu)
+    allowed = load_domain_intents(args.domain)
+    cross_validate(examples, with_entities, allowed, args.folds, args.min_confidence)
+
+    table = KeywordRouteTable.build(examples, with_entities, allowed, min_confidence=args.min_confidence)
+    messages = [text for text, _ in examples]
+    print(f"\nFull table: {len(table.routes)} routes, match {time_matching(table, messages) * 1e6:.1f} us/message")
+
+    if not args.url:
+        return
+    routed, diet = asyncio.run(time_parse(args.url, messages, args.repeat))
+    if not routed or not diet:
+        print("Server did not report keyword_route on any message; is the model trained with the router?")
+        return
+    coverage = len(routed) / (len(routed) + len(diet))
+    saved = statistics.mean(diet) - statistics.mean(routed)
+    print(f"/model/parse routed:  n={len(routed):5}  mean {statistics.mean(routed) * 1000:6.2f} ms  p50 {statistics.median(routed) * 1000:6.2f} ms")
+    print(f"/model/parse DIET:    n={len(diet):5}  mean {statistics.mean(diet) * 1000:6.2f} ms  p50 {statistics.median(diet) * 1000:6.2f} ms")
+    print(f"Saved: {saved * 1000:.2f} ms per routed message, {saved * coverage * 1000:.2f} ms per message at {coverage * 100:.0f}% coverage")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+Replay benchmark for the custom actions in actions.py.
+
+Builds a Tracker and CollectingDispatcher for every recorded message, runs the
+matching action class in-process and reports throughput, p50/p95/p99 latency
+and peak allocation per call. MedlinePlus and disease.sh are replaced by a
+local stub HTTP server, so numbers measure our code rather than the internet.
+
+Messages come from a JSONL file (one {"text", "action"?, "intent"?, "slots"?}
+object per line) or, by default, from the nlu.yml examples mapped to actions
+through rules.yml and stories.yml.
+
+Usage:
+    python benchmarks/replay_actions.py [--messages recorded.jsonl] [--iterations 200]
+        [--upstream-delay-ms 0] [--no-cache] [--json out.json]
+        [--compare baseline.json --max-regression 1.25]
+"""
+import argparse
+import asyncio
+import importlib
+import inspect
+import json
+import os
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Text, Tuple
+
+import yaml
+from aiohttp import web
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_ENTITY_RE = re.compile(r"\[([^\]]+)\]\([^)]*\)|\[([^\]]+)\]\{[^}]*\}")
+
+# Slots and events for actions that are reached through forms rather than intents
+ACTION_FIXTURES: Dict[Text, Dict[Text, Any]] = {
+    "action_calculate_bmi": {"slots": {"weight": 70, "height": 170, "age": 30, "gender": "male"}},
+    "action_submit_checkup": {"slots": {"temperature": 99.5, "mood_level": "neutral", "pain_score": 3, "symptom_name": "headache"}},
+    "action_suggest_remedy_final": {"slots": {"symptom_name": "fever"}},
+    "validate_bmi_form": {
+        "active_loop": {"name": "bmi_form"},
+        "set_slots": {"weight": "70", "height": "170", "age": "30", "gender": "female"},
+    },
+    "validate_health_checkup_form": {
+        "active_loop": {"name": "health_checkup_form"},
+        "set_slots": {"temperature": "99", "mood_level": "happy", "pain_score": "4", "symptom_name": "cough"},
+    },
+}
+
+
+# ========================================
+# STUB UPSTREAMS
+# ========================================
+def build_stub_app(delay: float) -> web.Application:
+    async def medlineplus(request: web.Request) -> web.Response:
+        await asyncio.sleep(delay)
+        query = request.query.get("mainSearchCriteria.v.c", "")
+        summary = f"{query.title()} is a health condition. " * 8
+        return web.json_response({"feed": {"entry": [{
+            "title": {"_value": query.title()},
+            "summary": {"_value": summary},
+            "link": [{"rel": "alternate", "href": f"https://medlineplus.gov/{query.replace(' ', '')}.html"}],
+        }]}})
+
+    async def covid(request: web.Request) -> web.Response:
+        await asyncio.sleep(delay)
+        return web.json_response({"cases": 45035393, "active": 1200, "recovered": 44500000, "deaths": 533570, "todayCases": 12})
+
+    async def vaccine(request: web.Request) -> web.Response:
+        await asyncio.sleep(delay)
+        return web.json_response({"country": "India", "timeline": {"1/1/25": 2206868000}})
+
+    app = web.Application()
+    app.router.add_get("/service", medlineplus)
+    app.router.add_get("/v3/covid-19/countries/india", covid)
+    app.router.add_get("/v3/covid-19/all", covid)
+    app.router.add_get("/v3/covid-19/vaccine/coverage/countries/india", vaccine)
+    return app
+
+
+async def start_stub(delay: float) -> Tuple[web.AppRunner, Text]:
+    runner = web.AppRunner(build_stub_app(delay))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    return runner, f"http://{host}:{port}"
+
+
+# ========================================
+# MESSAGE CORPUS
+# ========================================
+def load_yaml(name: Text) -> Dict[Text, Any]:
+    with open(os.path.join(ROOT, name), encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def intent_actions() -> Dict[Text, Text]:
+    """intent -> first custom action that follows it in rules.yml / stories.yml"""
+    mapping: Dict[Text, Text] = {}
+    flows = load_yaml("rules.yml").get("rules", []) + load_yaml("stories.yml").get("stories", [])
+    for flow in flows:
+        steps = flow.get("steps", [])
+        for step, nxt in zip(steps, steps[1:]):
+            action = nxt.get("action", "")
+            if "intent" in step and action.startswith(("action_", "validate_")):
+                mapping.setdefault(step["intent"], action)
+    return mapping
+
+
+def nlu_messages() -> List[Dict[Text, Any]]:
+    mapping = intent_actions()
+    rows = []
+    for block in load_yaml("nlu.yml").get("nlu", []):
+        intent = block.get("intent")
+        if intent not in mapping:
+            continue
+        for line in (block.get("examples") or "").splitlines():
+            text = line.strip().lstrip("-").strip()
+            if text:
+                text = _ENTITY_RE.sub(lambda m: m.group(1) or m.group(2), text)
+                rows.append({"text": text, "intent": intent, "action": mapping[intent]})
+    return rows
+
+
+def load_messages(path: Optional[Text]) -> List[Dict[Text, Any]]:
+    if not path:
+        return nlu_messages()
+    mapping = intent_actions()
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            row.setdefault("action", mapping.get(row.get("intent", "")))
+            if row.get("text") is not None and row.get("action"):
+                rows.append(row)
+    return rows
+
+
+def tracker_state(action_name: Text, row: Dict[Text, Any], sender_id: Text) -> Dict[Text, Any]:
+    fixture = ACTION_FIXTURES.get(action_name, {})
+    text = row.get("text", "")
+    latest_message = {"text": text, "intent": {"name": row.get("intent"), "confidence": 1.0}, "entities": []}
+    events: List[Dict[Text, Any]] = [{"event": "user", "text": text, "parse_data": latest_message}]
+    slots = dict(fixture.get("slots", {}))
+    slots.update(row.get("slots", {}))
+    for name, value in fixture.get("set_slots", {}).items():
+        events.append({"event": "slot", "name": name, "value": value})
+        slots[name] = value
+    return {
+        "sender_id": sender_id,
+        "slots": slots,
+        "latest_message": latest_message,
+        "events": events,
+        "paused": False,
+        "followup_action": None,
+        "active_loop": fixture.get("active_loop", {}),
+        "latest_action_name": "action_listen",
+    }
+
+
+# ========================================
+# BENCHMARK
+# ========================================
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def call_action(action: Any, tracker: Any, domain: Dict[Text, Any]) -> None:
+    from rasa_sdk.executor import CollectingDispatcher
+
+    result = action.run(CollectingDispatcher(), tracker, domain)
+    if inspect.isawaitable(result):
+        await result
+
+
+async def bench_action(actions_module: Any, action: Any, rows: List[Dict[Text, Any]], domain: Dict[Text, Any], args: argparse.Namespace) -> Dict[Text, Any]:
+    from rasa_sdk import Tracker
+
+    name = action.name()
+    trackers = [Tracker.from_dict(tracker_state(name, row, f"bench-{i}")) for i, row in enumerate(rows)]
+
+    for i in range(args.warmup):
+        await call_action(action, trackers[i % len(trackers)], domain)
+
+    latencies = []
+    start = time.perf_counter()
+    for i in range(args.iterations):
+        if args.no_cache:
+            actions_module.HEALTH_INFO_CACHE.clear()
+        t0 = time.perf_counter()
+        await call_action(action, trackers[i % len(trackers)], domain)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+
+    # Separate pass so tracing overhead does not skew latency
+    peaks = []
+    tracemalloc.start()
+    for i in range(min(args.iterations, 50)):
+        if args.no_cache:
+            actions_module.HEALTH_INFO_CACHE.clear()
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        await call_action(action, trackers[i % len(trackers)], domain)
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+
+    return {
+        "action": name,
+        "messages": len(rows),
+        "calls": args.iterations,
+        "throughput": args.iterations / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "peak_alloc_kib": statistics.median(peaks) / 1024,
+    }
+
+
+def print_report(results: List[Dict[Text, Any]]) -> None:
+    header = f"{'action':34} {'msgs':>5} {'calls/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'alloc KiB':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['action']:34} {r['messages']:>5} {r['throughput']:>10.1f} {r['p50_ms']:>9.3f} "
+              f"{r['p95_ms']:>9.3f} {r['p99_ms']:>9.3f} {r['peak_alloc_kib']:>10.1f}")
+
+
+def compare(results: List[Dict[Text, Any]], baseline_path: Text, max_regression: float) -> List[Text]:
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {r["action"]: r for r in json.load(f)}
+    regressions = []
+    for r in results:
+        old = baseline.get(r["action"])
+        if old and old["p95_ms"] > 0 and r["p95_ms"] > old["p95_ms"] * max_regression:
+            regressions.append(f"{r['action']}: p95 {old['p95_ms']:.3f} ms -> {r['p95_ms']:.3f} ms")
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> int:
+    runner, stub_url = await start_stub(args.upstream_delay_ms / 1000)
+    # actions.py reads its upstream URLs and ports at import time
+    os.environ["MEDLINEPLUS_URL"] = f"{stub_url}/service"
+    os.environ["DISEASE_SH_URL"] = stub_url
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    actions_module = importlib.import_module("actions")
+
+    from rasa_sdk import Action
+
+    domain = load_yaml("domain.yml")
+    rows = load_messages(args.messages)
+    by_action: Dict[Text, List[Dict[Text, Any]]] = {}
+    for row in rows:
+        by_action.setdefault(row["action"], []).append(row)
+
+    # One entry per action name; as in the SDK's registry, a later class with the same name wins
+    actions: Dict[Text, Any] = {}
+    for cls in vars(actions_module).values():
+        if isinstance(cls, type) and issubclass(cls, Action) and cls.__module__ == actions_module.__name__:
+            action = cls()
+            actions[action.name()] = action
+
+    results = []
+    for name, action in actions.items():
+        if args.action and name not in args.action:
+            continue
+        action_rows = by_action.get(name) or [{"text": "", "action": name}]
+        results.append(await bench_action(actions_module, action, action_rows, domain, args))
+
+    await actions_module.close_http_session()
+    actions_module.DISEASE_SNAPSHOTS.shutdown()
+    await runner.cleanup()
+
+    results.sort(key=lambda r: r["p95_ms"], reverse=True)
+    print_report(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.max_regression)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay recorded messages against every custom action")
+    parser.add_argument("--messages", help="JSONL of recorded messages (default: nlu.yml examples)")
+    parser.add_argument("--action", action="append", help="only benchmark this action (repeatable)")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--upstream-delay-ms", type=float, default=0.0)
+    parser.add_argument("--no-cache", action="store_true", help="clear the health-info cache before every call")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="baseline JSON from a previous --json run")
+    parser.add_argument("--max-regression", type=float, default=1.25, help="allowed p95 ratio against the baseline")
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Calibration of LOCAL_RETRIEVAL_MIN_SCORE on a labelled question set.
+
+benchmarks/retrieval_labels.jsonl holds questions that name no topic, each
+with the passage keys that would be a correct answer; an empty list means the
+local passages have no right answer and the bot should fall back instead. For
+every threshold the script runs the same retrieval as the action
+(actions._retrieve_passage) and reports how many questions get a passage,
+precision (share of those that got a correct one) and recall (share of the
+answerable questions answered correctly), plus the wrong answers.
+
+Usage:
+    python benchmarks/retrieval_threshold.py [--labels benchmarks/retrieval_labels.jsonl]
+        [--thresholds 0.1 0.12 0.15 0.18 0.2 0.25]
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List, Text
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import actions  # noqa: E402
+
+LABELS_PATH = os.path.join(ROOT, "benchmarks", "retrieval_labels.jsonl")
+
+
+def load_labels(path: Text) -> List[Dict[Text, object]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def evaluate(labels: List[Dict[Text, object]], min_score: float) -> Dict[Text, object]:
+    answered = correct = 0
+    wrong = []
+    for label in labels:
+        hit = actions._retrieve_passage(label["question"], min_score)
+        if hit is None:
+            continue
+        answered += 1
+        if hit.passage.key in label["passages"]:
+            correct += 1
+        else:
+            wrong.append(f"{label['question']!r} -> {hit.passage.key} ({hit.score:.3f})")
+    answerable = sum(1 for label in labels if label["passages"])
+    return {
+        "answered": answered,
+        "precision": correct / answered if answered else 1.0,
+        "recall": correct / answerable if answerable else 0.0,
+        "wrong": wrong,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Precision and recall of local retrieval per score threshold")
+    parser.add_argument("--labels", default=LABELS_PATH)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.1, 0.12, 0.15, 0.18, 0.2, 0.25])
+    args = parser.parse_args()
+
+    labels = load_labels(args.labels)
+    answerable = sum(1 for label in labels if label["passages"])
+    print(f"{len(labels)} questions, {answerable} answerable from the local passages")
+    print(f"current LOCAL_RETRIEVAL_MIN_SCORE: {actions.LOCAL_RETRIEVAL_MIN_SCORE}")
+    print("threshold  answered  precision  recall")
+    for threshold in args.thresholds:
+        result = evaluate(labels, threshold)
+        print(f"{threshold:9.2f}  {result['answered']:8d}  {result['precision']:8.1%}  {result['recall']:6.1%}")
+        for line in result["wrong"]:
+            print(f"             wrong: {line}")
+
+
+if __name__ == "__main__":
+    main()
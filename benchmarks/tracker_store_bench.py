@@ -0,0 +1,120 @@
+"""
+Tracker store benchmark: PooledSQLTrackerStore vs Rasa's SQLTrackerStore.
+
+Simulates --conversations concurrent senders, each doing --turns turns of
+retrieve -> append UserUttered/ActionExecuted/BotUttered -> save, the same
+pattern the Rasa server follows per message, and reports events/s and save
+latency percentiles for each store.
+
+Usage:
+    python benchmarks/tracker_store_bench.py [--conversations 200] [--turns 10]
+        [--store pooled|sql|both] [--dialect sqlite --db bench_tracker.db]
+        [--dialect postgresql --host localhost --port 5432 --username rasa --password rasa --db rasa]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from typing import Any, Dict, List, Text
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from rasa.core.tracker_store import SQLTrackerStore  # noqa: E402
+from rasa.shared.core.domain import Domain  # noqa: E402
+from rasa.shared.core.events import ActionExecuted, BotUttered, SessionStarted, UserUttered  # noqa: E402
+from rasa.shared.core.trackers import DialogueStateTracker  # noqa: E402
+
+from tracker_store import PooledSQLTrackerStore  # noqa: E402
+
+
+def build_store(kind: Text, domain: Domain, args: argparse.Namespace) -> Any:
+    options: Dict[Text, Any] = {"dialect": args.dialect, "db": args.db}
+    if args.dialect != "sqlite":
+        options.update(host=args.host, port=args.port, username=args.username, password=args.password)
+    if kind == "pooled":
+        return PooledSQLTrackerStore(domain, pool_size=args.pool_size, batch_size=args.batch_size,
+                                     flush_interval=args.flush_interval, **options)
+    if "host" in options:
+        options["url"] = options.pop("host")
+    return SQLTrackerStore(domain, **options)
+
+
+async def conversation(store: Any, domain: Domain, turns: int, save_times: List[float]) -> int:
+    sender = f"bench-{uuid.uuid4().hex[:12]}"
+    events = 0
+    for turn in range(turns):
+        tracker = await store.retrieve(sender)
+        if tracker is None:
+            tracker = DialogueStateTracker(sender, domain.slots)
+            tracker.update(ActionExecuted("action_session_start"))
+            tracker.update(SessionStarted())
+            tracker.update(ActionExecuted("action_listen"))
+            events += 3
+        tracker.update(UserUttered(f"message {turn}", {"name": "greet", "confidence": 0.98}))
+        tracker.update(ActionExecuted("utter_greet"))
+        tracker.update(BotUttered(f"reply {turn}"))
+        tracker.update(ActionExecuted("action_listen"))
+        events += 4
+
+        start = time.perf_counter()
+        await store.save(tracker)
+        save_times.append(time.perf_counter() - start)
+    return events
+
+
+def pct(samples: List[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+
+
+async def run_store(kind: Text, domain: Domain, args: argparse.Namespace) -> None:
+    if args.dialect == "sqlite" and os.path.exists(args.db):
+        os.remove(args.db)
+    store = build_store(kind, domain, args)
+    save_times: List[float] = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited() -> int:
+        async with semaphore:
+            return await conversation(store, domain, args.turns, save_times)
+
+    start = time.perf_counter()
+    counts = await asyncio.gather(*(limited() for _ in range(args.conversations)))
+    elapsed = time.perf_counter() - start
+
+    events = sum(counts)
+    print(f"{kind:7} {events:7} events in {elapsed:6.2f}s  {events / elapsed:9.0f} events/s  "
+          f"save p50 {pct(save_times, 50) * 1000:6.2f} ms  p95 {pct(save_times, 95) * 1000:6.2f} ms  "
+          f"mean {statistics.mean(save_times) * 1000:6.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the SQL tracker stores")
+    parser.add_argument("--store", choices=["pooled", "sql", "both"], default="both")
+    parser.add_argument("--conversations", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=50, help="conversations in flight at once")
+    parser.add_argument("--dialect", default="sqlite")
+    parser.add_argument("--db", default="bench_tracker.db")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--username")
+    parser.add_argument("--password")
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--flush-interval", type=float, default=0.005)
+    args = parser.parse_args()
+
+    domain = Domain.load(os.path.join(ROOT, "domain.yml"))
+    kinds = ["pooled", "sql"] if args.store == "both" else [args.store]
+    print(f"{args.conversations} conversations x {args.turns} turns, {args.concurrency} concurrent, {args.dialect}")
+    for kind in kinds:
+        asyncio.run(run_store(kind, domain, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Offline conversation analytics over the JSONL segments written by event_broker.py.
+
+Reads sealed segments only (pass --include-open to also read the .part files
+being written). Each writer process appends its segments in time order, and
+several replicas write side by side, so the writers' segments are merged on
+the event timestamp rather than read one file after another. Reports:
+
+- intent frequencies and mean NLU confidence
+- per-action latency: time from the previous user message or action of the
+  same conversation to the action's event (action_listen is skipped)
+- fallback rate: share of user turns classified as nlu_fallback or answered by
+  a fallback action
+
+Usage:
+    python event_analytics.py events/ [--include-open] [--since 2025-11-01] [--json report.json]
+"""
+import argparse
+import glob
+import heapq
+import json
+import os
+import re
+import statistics
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Text
+
+FALLBACK_INTENTS = {"nlu_fallback"}
+FALLBACK_ACTIONS = {"action_default_fallback", "utter_default", "action_two_stage_fallback"}
+
+# events-<UTC open time>-<host>-<pid>-<counter>.jsonl[.part], as named by event_broker.py
+_SEGMENT_RE = re.compile(r"^events-\d{8}T\d{6}-(.+-\d+)-\d+\.jsonl(?:\.part)?$")
+
+
+def _read_segments(files: List[Text]) -> Iterator[Dict[Text, Any]]:
+    for name in files:
+        with open(name, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave a torn last line in a .part segment
+                    continue
+
+
+def _timestamp(event: Dict[Text, Any]) -> float:
+    return event.get("timestamp") or 0.0
+
+
+def iter_events(path: Text, include_open: bool = False) -> Iterator[Dict[Text, Any]]:
+    """Events of all segments under path, in timestamp order across writers"""
+    patterns = ["events-*.jsonl"] + (["events-*.jsonl.part"] if include_open else [])
+    files = sorted(f for pattern in patterns for f in glob.glob(os.path.join(path, pattern)))
+    # Segment names start with their UTC open time, so name order is time order per writer
+    writers: Dict[Text, List[Text]] = defaultdict(list)
+    for name in files:
+        match = _SEGMENT_RE.match(os.path.basename(name))
+        writers[match.group(1) if match else name].append(name)
+    # One open file per writer, however many segments each has rotated through
+    return heapq.merge(*(_read_segments(segments) for segments in writers.values()), key=_timestamp)
+
+
+def pct(samples: List[float], p: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+
+
+def aggregate(events: Iterator[Dict[Text, Any]], since: Optional[float] = None) -> Dict[Text, Any]:
+    intents: Counter = Counter()
+    confidence: Dict[Text, float] = defaultdict(float)
+    latencies: Dict[Text, List[float]] = defaultdict(list)
+    last_seen: Dict[Text, float] = {}
+    # sender -> whether the current user turn has hit a fallback
+    open_turn: Dict[Text, bool] = {}
+    turns = 0
+    fallbacks = 0
+    senders = set()
+
+    for event in events:
+        timestamp = event.get("timestamp") or 0.0
+        if since is not None and timestamp < since:
+            continue
+        sender = event.get("sender_id", "")
+        kind = event.get("event")
+
+        if kind == "user":
+            senders.add(sender)
+            intent = ((event.get("parse_data") or {}).get("intent") or {})
+            name = intent.get("name") or "None"
+            intents[name] += 1
+            confidence[name] += intent.get("confidence") or 0.0
+            if open_turn.get(sender):
+                fallbacks += 1
+            open_turn[sender] = name in FALLBACK_INTENTS
+            turns += 1
+            last_seen[sender] = timestamp
+        elif kind == "action":
+            name = event.get("name") or "None"
+            previous = last_seen.get(sender)
+            if name != "action_listen" and previous is not None and timestamp >= previous:
+                latencies[name].append(timestamp - previous)
+            if name in FALLBACK_ACTIONS and sender in open_turn:
+                open_turn[sender] = True
+            last_seen[sender] = timestamp
+
+    fallbacks += sum(1 for hit in open_turn.values() if hit)
+
+    return {
+        "conversations": len(senders),
+        "user_turns": turns,
+        "fallback_turns": fallbacks,
+        "fallback_rate": fallbacks / turns if turns else 0.0,
+        "intents": [
+            {"intent": name, "count": count, "mean_confidence": confidence[name] / count}
+            for name, count in intents.most_common()
+        ],
+        "actions": [
+            {
+                "action": name,
+                "count": len(samples),
+                "mean_ms": statistics.mean(samples) * 1000,
+                "p50_ms": pct(samples, 50) * 1000,
+                "p95_ms": pct(samples, 95) * 1000,
+            }
+            for name, samples in sorted(latencies.items(), key=lambda item: -len(item[1]))
+        ],
+    }
+
+
+def print_report(report: Dict[Text, Any]) -> None:
+    print(f"Conversations: {report['conversations']}")
+    print(f"User turns:    {report['user_turns']}")
+    print(f"Fallbacks:     {report['fallback_turns']} ({report['fallback_rate'] * 100:.1f}%)")
+    print()
+    print(f"{'intent':32} {'count':>8} {'share':>7} {'conf':>6}")
+    for row in report["intents"]:
+        share = row["count"] / report["user_turns"] * 100 if report["user_turns"] else 0.0
+        print(f"{row['intent']:32} {row['count']:8} {share:6.1f}% {row['mean_confidence']:6.2f}")
+    print()
+    print(f"{'action':36} {'count':>8} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    for row in report["actions"]:
+        print(f"{row['action']:36} {row['count']:8} {row['mean_ms']:9.1f} {row['p50_ms']:9.1f} {row['p95_ms']:9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Aggregate Rasa events written by event_broker.JsonlEventBroker")
+    parser.add_argument("path", nargs="?", default="events")
+    parser.add_argument("--include-open", action="store_true", help="also read segments still being written")
+    parser.add_argument("--since", help="only events from this UTC date or time (ISO format)")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    since = None
+    if args.since:
+        since = datetime.fromisoformat(args.since).replace(tzinfo=timezone.utc).timestamp()
+
+    report = aggregate(iter_events(args.path, args.include_open), since)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Batched event broker that streams Rasa events to local JSONL segments.
+
+publish() only appends the event to an in-memory queue; a background writer
+thread drains it in batches (up to `batch_size` events or every
+`flush_interval` seconds) and writes each batch with a single write() call.
+Segments rotate on size or age:
+
+    events/events-20251102T230658-rasa-1-001.jsonl.part   <- being written
+    events/events-20251102T230658-rasa-1-001.jsonl        <- closed, safe to read
+
+Each process writes its own segments (host and pid are in the name), so
+several Rasa replicas can share one directory. A live writer seals its segment
+within max_segment_age, so any .part file not written to for longer than
+`stale_part_age` (default twice max_segment_age) belongs to a replica that
+died; such files are sealed on start and on every rotation, whoever wrote them.
+event_analytics.py aggregates the closed segments offline, without touching
+the tracker store.
+
+Segments hold raw user messages and are never deleted here, so the broker is
+off in the shipped endpoints.yml; enable it together with a retention policy.
+
+endpoints.yml:
+
+    event_broker:
+      type: event_broker.JsonlEventBroker
+      path: "events"
+      batch_size: 500
+      flush_interval: 1.0
+      max_segment_mb: 64
+      max_segment_age: 3600
+      stale_part_age: 7200
+"""
+import asyncio
+import json
+import logging
+import os
+import queue
+import re
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional, Text, Tuple
+
+from rasa.core.brokers.broker import EventBroker
+from rasa.utils.endpoints import EndpointConfig
+
+logger = logging.getLogger(__name__)
+
+PART_SUFFIX = ".part"
+_SEGMENT_RE = re.compile(r"^events-\d{8}T\d{6}-(.+)-(\d+)-\d+\.jsonl\.part$")
+
+_STOP = object()
+
+
+class JsonlEventBroker(EventBroker):
+    """Append-only, rotating JSONL event log written from a background thread"""
+
+    def __init__(
+        self,
+        path: Text = "events",
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_segment_mb: float = 64,
+        max_segment_age: float = 3600,
+        max_queue: int = 100000,
+        stale_part_age: Optional[float] = None,
+    ) -> None:
+        self.path = path
+        self.batch_size = int(batch_size)
+        self.flush_interval = float(flush_interval)
+        self.max_segment_bytes = int(float(max_segment_mb) * 1024 * 1024)
+        self.max_segment_age = float(max_segment_age)
+        self.stale_part_age = float(stale_part_age) if stale_part_age else 2 * self.max_segment_age
+        self.dropped = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(int(max_queue))
+        self._file: Optional[Any] = None
+        self._segment: Optional[Text] = None
+        self._segment_bytes = 0
+        self._segment_opened = 0.0
+        # Host and pid, so replicas sharing a volume never write the same segment
+        self._writer_id = f"{socket.gethostname()}-{os.getpid()}"
+        os.makedirs(self.path, exist_ok=True)
+        self._seal_leftovers()
+        self._writer = threading.Thread(target=self._run, name="event-broker-writer", daemon=True)
+        self._writer.start()
+
+    @classmethod
+    async def from_endpoint_config(
+        cls, broker_config: EndpointConfig, event_loop: Optional[asyncio.AbstractEventLoop] = None
+    ) -> "JsonlEventBroker":
+        return cls(**broker_config.kwargs)
+
+    def publish(self, event: Dict[Text, Any]) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            # Never slow down a conversation for analytics
+            self.dropped += 1
+
+    def is_ready(self) -> bool:
+        return self._writer.is_alive()
+
+    async def close(self) -> None:
+        self._queue.put(_STOP)
+        await asyncio.get_running_loop().run_in_executor(None, self._writer.join)
+
+    # ----------------------------------------
+    # Writer thread
+    # ----------------------------------------
+    def _run(self) -> None:
+        while True:
+            batch, stop = self._next_batch()
+            if batch:
+                try:
+                    self._write(batch)
+                except Exception:
+                    logger.exception("Failed to write %d events to %s", len(batch), self.path)
+            elif self._file is not None and time.time() - self._segment_opened >= self.max_segment_age:
+                self._seal()
+            if stop:
+                self._seal()
+                return
+
+    def _next_batch(self) -> Tuple[List[Dict[Text, Any]], bool]:
+        batch: List[Dict[Text, Any]] = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=max(timeout, 0)) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _write(self, batch: List[Dict[Text, Any]]) -> None:
+        data = "".join(json.dumps(event, ensure_ascii=False, default=str) + "\n" for event in batch).encode("utf-8")
+        if self._file is not None and (
+            self._segment_bytes + len(data) > self.max_segment_bytes
+            or time.time() - self._segment_opened >= self.max_segment_age
+        ):
+            self._seal()
+        if self._file is None:
+            self._open()
+        self._file.write(data)
+        self._file.flush()
+        self._segment_bytes += len(data)
+
+    def _open(self) -> None:
+        self._seal_leftovers()
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+        counter = 0
+        while True:
+            counter += 1
+            name = f"events-{stamp}-{self._writer_id}-{counter:03d}.jsonl"
+            if not os.path.exists(os.path.join(self.path, name)) and not os.path.exists(os.path.join(self.path, name + PART_SUFFIX)):
+                break
+        self._segment = os.path.join(self.path, name)
+        self._file = open(self._segment + PART_SUFFIX, "ab")
+        self._segment_bytes = 0
+        self._segment_opened = time.time()
+
+    def _seal(self) -> None:
+        """Close the current segment and publish it for readers"""
+        if self._file is None:
+            return
+        self._file.close()
+        os.replace(self._segment + PART_SUFFIX, self._segment)
+        self._file = None
+        self._segment = None
+
+    def _seal_leftovers(self) -> None:
+        """Seal .part segments no live writer owns: an earlier run of this host and
+        pid, or any writer that has not touched its segment for stale_part_age"""
+        now = time.time()
+        for name in os.listdir(self.path):
+            match = _SEGMENT_RE.match(name)
+            if not match:
+                continue
+            part = os.path.join(self.path, name)
+            try:
+                stale = now - os.path.getmtime(part) >= self.stale_part_age
+                if stale or f"{match.group(1)}-{match.group(2)}" == self._writer_id:
+                    os.replace(part, part[: -len(PART_SUFFIX)])
+            except FileNotFoundError:
+                # Sealed meanwhile by its writer or another replica
+                pass
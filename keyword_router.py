@@ -0,0 +1,233 @@
+"""
+Keyword route table for short-circuiting obvious intents before DIET.
+
+The table is learned from the NLU training examples: every word n-gram (1-3
+tokens, not made only of function words) that occurs in examples of exactly
+one intent, often enough, becomes a route to that intent. Its raw score is the
+smoothed in-sample precision
+
+    raw = examples of the intent containing it / (examples containing it + prior)
+
+which is optimistic on small data. The score is therefore calibrated: the
+table is rebuilt on k-1 folds, applied to the held-out fold, and an isotonic
+(pool-adjacent-violators) fit of held-out accuracy against raw score maps each
+route to the accuracy its score bracket actually achieved. `min_confidence`
+applies to that calibrated value. Intents with entity annotations are never
+routed, since skipping DIET would also skip entity extraction; domain.yml
+restricts the candidates to known intents.
+
+A message is routed when all of its matching n-grams agree on one intent;
+anything ambiguous, long, or unmatched falls through to DIET.
+
+This module is stdlib + PyYAML only; router_components.py wraps it as a Rasa
+graph component.
+
+    python keyword_router.py "calculate my bmi" "what is dengue"
+"""
+import argparse
+import re
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Text, Tuple
+
+import yaml
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_ENTITY_RE = re.compile(r"\[([^\]]+)\](?:\([^)]*\)|\{[^}]*\})")
+
+NEVER_ROUTE = {"nlu_fallback"}
+
+# n-grams made only of these never route ("i am", "who", "good" span many intents)
+STOPWORDS = set("""
+a about am an and are be can could did do does feel feeling for get give got had has have he how i
+in is it know me my need no not of on or please she should show so tell that the there they this
+to very want was we what when where which who why will with would yes you your
+""".split())
+
+
+def tokenize(text: Text) -> List[Text]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def ngrams(tokens: List[Text], max_n: int) -> Set[Text]:
+    grams = set()
+    for n in range(1, max_n + 1):
+        for i in range(len(tokens) - n + 1):
+            grams.add(" ".join(tokens[i:i + n]))
+    return grams
+
+
+class KeywordRouteTable:
+    """n-gram -> (intent, calibrated confidence)"""
+
+    def __init__(self, routes: Dict[Text, Tuple[Text, float]], max_n: int = 3, max_tokens: int = 12):
+        self.routes = routes
+        self.max_n = max_n
+        self.max_tokens = max_tokens
+
+    @classmethod
+    def build(
+        cls,
+        examples: Iterable[Tuple[Text, Text]],
+        exclude_intents: Iterable[Text] = (),
+        allowed_intents: Optional[Iterable[Text]] = None,
+        max_n: int = 3,
+        min_support: int = 3,
+        min_confidence: float = 0.75,
+        prior: float = 1.0,
+        max_tokens: int = 12,
+        calibration_folds: int = 5,
+    ) -> "KeywordRouteTable":
+        examples = list(examples)
+        excluded = set(exclude_intents) | NEVER_ROUTE
+        allowed = set(allowed_intents) if allowed_intents is not None else None
+        options = dict(max_n=max_n, min_support=min_support, prior=prior, max_tokens=max_tokens)
+
+        counts: Dict[Text, Dict[Text, int]] = defaultdict(lambda: defaultdict(int))
+        for text, intent in examples:
+            for gram in ngrams(tokenize(text), max_n):
+                counts[gram][intent] += 1
+
+        candidates: Dict[Text, Tuple[Text, float]] = {}
+        for gram, by_intent in counts.items():
+            if len(by_intent) != 1:
+                continue
+            (intent, support), = by_intent.items()
+            if intent in excluded or (allowed is not None and intent not in allowed):
+                continue
+            if support < min_support or all(word in STOPWORDS for word in gram.split()):
+                continue
+            candidates[gram] = (intent, support / (support + prior))
+
+        if calibration_folds > 1:
+            calibrate = cls._calibration(examples, excluded, allowed, calibration_folds, options)
+            candidates = {gram: (intent, calibrate(raw)) for gram, (intent, raw) in candidates.items()}
+        candidates = {gram: route for gram, route in candidates.items() if route[1] >= min_confidence}
+
+        # Drop n-grams already implied by a shorter route to the same intent
+        routes = {}
+        for gram, (intent, confidence) in candidates.items():
+            words = gram.split()
+            shorter = ngrams(words, len(words) - 1) if len(words) > 1 else set()
+            if any(candidates.get(sub, ("", 0.0))[0] == intent and candidates[sub][1] >= confidence for sub in shorter):
+                continue
+            routes[gram] = (intent, confidence)
+        return cls(routes, max_n, max_tokens)
+
+    @classmethod
+    def _calibration(
+        cls, examples: List[Tuple[Text, Text]], excluded: Set[Text], allowed: Optional[Set[Text]], folds: int, options: Dict[Text, Any]
+    ) -> Callable[[float], float]:
+        """Map raw route scores to held-out accuracy (isotonic fit over k folds)"""
+        outcomes: List[Tuple[float, int]] = []
+        for k in range(folds):
+            train = [example for i, example in enumerate(examples) if i % folds != k]
+            table = cls.build(train, excluded, allowed, min_confidence=0.0, calibration_folds=0, **options)
+            for text, intent in examples[k::folds]:
+                routed = table.match(text)
+                if routed is not None:
+                    outcomes.append((routed[1], int(routed[0] == intent)))
+
+        # Pool adjacent violators: blocks of [lowest raw score, hits, count] with non-decreasing accuracy
+        blocks: List[List[float]] = []
+        for raw, hit in sorted(outcomes):
+            blocks.append([raw, hit, 1])
+            while len(blocks) > 1 and blocks[-2][1] / blocks[-2][2] >= blocks[-1][1] / blocks[-1][2]:
+                raw_low, hits, count = blocks.pop(-2)
+                blocks[-1] = [raw_low, hits + blocks[-1][1], count + blocks[-1][2]]
+        # Laplace-smoothed accuracy per block, so a bracket with 3/3 hits is not reported as certain
+        steps = [(raw_low, (hits + 1) / (count + 2)) for raw_low, hits, count in blocks]
+
+        def calibrate(raw: float) -> float:
+            value = steps[0][1] if steps else 0.5
+            for raw_low, accuracy in steps:
+                if raw >= raw_low:
+                    value = accuracy
+            return value
+
+        return calibrate
+
+    def match(self, text: Text) -> Optional[Tuple[Text, float, Text]]:
+        """(intent, confidence, matched n-gram) when the message routes unambiguously"""
+        tokens = tokenize(text)
+        if not tokens or len(tokens) > self.max_tokens:
+            return None
+        best: Optional[Tuple[Text, float, Text]] = None
+        for gram in ngrams(tokens, self.max_n):
+            route = self.routes.get(gram)
+            if route is None:
+                continue
+            intent, confidence = route
+            if best is not None and best[0] != intent:
+                return None
+            if best is None or confidence > best[1]:
+                best = (intent, confidence, gram)
+        return best
+
+    def as_dict(self) -> Dict[Text, Any]:
+        return {
+            "max_n": self.max_n,
+            "max_tokens": self.max_tokens,
+            "routes": {gram: [intent, confidence] for gram, (intent, confidence) in sorted(self.routes.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[Text, Any]) -> "KeywordRouteTable":
+        routes = {gram: (intent, float(confidence)) for gram, (intent, confidence) in data["routes"].items()}
+        return cls(routes, int(data.get("max_n", 3)), int(data.get("max_tokens", 12)))
+
+
+def load_nlu_examples(path: Text = "nlu.yml") -> Tuple[List[Tuple[Text, Text]], Set[Text]]:
+    """(text, intent) pairs with entity markup stripped, and the intents that carry entities"""
+    with open(path, encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    examples, with_entities = [], set()
+    for block in data.get("nlu", []):
+        intent = block.get("intent")
+        if not intent:
+            continue
+        for line in (block.get("examples") or "").splitlines():
+            text = line.strip().lstrip("-").strip()
+            if not text:
+                continue
+            if _ENTITY_RE.search(text):
+                with_entities.add(intent)
+                text = _ENTITY_RE.sub(lambda m: m.group(1), text)
+            examples.append((text, intent))
+    return examples, with_entities
+
+
+def load_domain_intents(path: Text = "domain.yml") -> Set[Text]:
+    with open(path, encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    intents = set()
+    for intent in data.get("intents", []):
+        intents.add(next(iter(intent)) if isinstance(intent, dict) else intent)
+    return intents
+
+
+def build_from_files(nlu_path: Text = "nlu.yml", domain_path: Optional[Text] = "domain.yml", **options: Any) -> KeywordRouteTable:
+    examples, with_entities = load_nlu_examples(nlu_path)
+    allowed = load_domain_intents(domain_path) if domain_path else None
+    return KeywordRouteTable.build(examples, with_entities, allowed, **options)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the keyword route table and route sample messages")
+    parser.add_argument("messages", nargs="*")
+    parser.add_argument("--nlu", default="nlu.yml")
+    parser.add_argument("--domain", default="domain.yml")
+    parser.add_argument("--show-table", action="store_true")
+    args = parser.parse_args()
+
+    table = build_from_files(args.nlu, args.domain)
+    if args.show_table or not args.messages:
+        for gram, (intent, confidence) in sorted(table.routes.items(), key=lambda item: (item[1][0], -item[1][1])):
+            print(f"{intent:28} {confidence:5.2f}  {gram}")
+        print(f"{len(table.routes)} routes")
+    for message in args.messages:
+        routed = table.match(message)
+        print(f"{message!r}: " + (f"{routed[0]} ({routed[1]:.2f}, '{routed[2]}')" if routed else "-> DIET"))
+
+
+if __name__ == "__main__":
+    main()
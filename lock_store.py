@@ -0,0 +1,158 @@
+"""
+Replica-safe lock store for Rasa.
+
+Rasa serialises messages of one conversation with a ticket lock. The stock
+RedisLockStore updates that lock with a plain get -> modify -> set, so two
+server replicas handling the same conversation can both read the lock, both
+issue ticket N and both process their message at once. This store performs
+every read-modify-write (issuing a ticket, finishing one, cleaning up) inside a
+WATCH/MULTI transaction, retried on conflict, so tickets stay unique across any
+number of replicas. Lock keys also get a TTL so a crashed replica cannot leave a
+conversation locked forever.
+
+The backend is any Redis-protocol server. `url: "fakeredis"` swaps in an
+in-process fakeredis server, which is useful for local runs and for
+benchmarks/lock_store_check.py but obviously only locks within one process.
+
+endpoints.yml:
+
+    lock_store:
+      type: lock_store.ReplicaSafeLockStore
+      url: "localhost"
+      port: 6379
+      db: 1
+      # password: "your_redis_password"
+      # key_ttl: 600
+"""
+import json
+import logging
+import threading
+from typing import Any, Callable, Optional, Text
+
+import redis
+
+from rasa.core.lock import TicketLock
+from rasa.core.lock_store import LOCK_LIFETIME, LockStore
+from rasa.utils.endpoints import EndpointConfig
+
+# Optional: in-process Redis stand-in for local runs and the replica check
+try:
+    import fakeredis
+    FAKEREDIS_AVAILABLE = True
+except ImportError:
+    FAKEREDIS_AVAILABLE = False
+    fakeredis = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEY_PREFIX = "lock:"
+
+# One shared fake server per process, so every store using `url: fakeredis` sees the same keys
+_fake_server = None
+_fake_server_lock = threading.Lock()
+
+
+def create_client(
+    url: Optional[Text] = "localhost",
+    port: int = 6379,
+    db: int = 1,
+    username: Optional[Text] = None,
+    password: Optional[Text] = None,
+    use_ssl: bool = False,
+    socket_timeout: float = 10,
+) -> "redis.Redis":
+    global _fake_server
+    if url == "fakeredis":
+        if not FAKEREDIS_AVAILABLE:
+            raise ImportError("url: fakeredis needs the fakeredis package (pip install fakeredis)")
+        with _fake_server_lock:
+            if _fake_server is None:
+                _fake_server = fakeredis.FakeServer()
+        return fakeredis.FakeStrictRedis(server=_fake_server, db=db)
+    return redis.StrictRedis(
+        host=url or "localhost",
+        port=port,
+        db=db,
+        username=username,
+        password=password,
+        ssl=use_ssl,
+        socket_timeout=socket_timeout,
+    )
+
+
+class ReplicaSafeLockStore(LockStore):
+    """Redis-backed ticket lock store whose updates are atomic across replicas"""
+
+    def __init__(
+        self,
+        endpoint_config: Optional[EndpointConfig] = None,
+        client: Optional["redis.Redis"] = None,
+        key_prefix: Optional[Text] = None,
+        key_ttl: Optional[int] = None,
+        **kwargs: Any,
+    ) -> None:
+        if endpoint_config is not None:
+            kwargs = {**endpoint_config.kwargs, **kwargs}
+            kwargs.setdefault("url", endpoint_config.url)
+            key_prefix = key_prefix or kwargs.pop("key_prefix", None)
+            key_ttl = key_ttl or kwargs.pop("key_ttl", None)
+        if client is None:
+            client = create_client(
+                kwargs.get("url") or kwargs.get("host") or "localhost",
+                int(kwargs.get("port", 6379)),
+                int(kwargs.get("db", 1)),
+                kwargs.get("username"),
+                kwargs.get("password"),
+                bool(kwargs.get("use_ssl", False)),
+                float(kwargs.get("socket_timeout", 10)),
+            )
+        self.red = client
+        self.key_prefix = f"{key_prefix}:lock:" if key_prefix else DEFAULT_KEY_PREFIX
+        self.key_ttl = int(key_ttl) if key_ttl else 10 * LOCK_LIFETIME
+        super().__init__()
+
+    def _key(self, conversation_id: Text) -> Text:
+        return self.key_prefix + conversation_id
+
+    @staticmethod
+    def _load(serialised: Optional[bytes]) -> Optional[TicketLock]:
+        return TicketLock.from_dict(json.loads(serialised)) if serialised else None
+
+    def get_lock(self, conversation_id: Text) -> Optional[TicketLock]:
+        return self._load(self.red.get(self._key(conversation_id)))
+
+    def delete_lock(self, conversation_id: Text) -> None:
+        self.red.delete(self._key(conversation_id))
+
+    def save_lock(self, lock: TicketLock) -> None:
+        self.red.set(self._key(lock.conversation_id), lock.dumps(), ex=self.key_ttl)
+
+    def _update(self, conversation_id: Text, change: Callable[[TicketLock], Any], create: bool = True) -> Any:
+        """Apply `change` to the stored lock atomically; drop the key once nobody holds a ticket"""
+        key = self._key(conversation_id)
+
+        def transaction(pipe: "redis.client.Pipeline") -> Any:
+            lock = self._load(pipe.get(key))
+            if lock is None:
+                if not create:
+                    return None
+                lock = self.create_lock(conversation_id)
+            result = change(lock)
+            pipe.multi()
+            if lock.is_someone_waiting():
+                pipe.set(key, lock.dumps(), ex=self.key_ttl)
+            else:
+                pipe.delete(key)
+            return result
+
+        return self.red.transaction(transaction, key, value_from_callable=True)
+
+    def issue_ticket(self, conversation_id: Text, lock_lifetime: float = LOCK_LIFETIME) -> int:
+        return self._update(conversation_id, lambda lock: lock.issue_ticket(lock_lifetime))
+
+    def finish_serving(self, conversation_id: Text, ticket_number: int) -> None:
+        self._update(conversation_id, lambda lock: lock.remove_ticket_for(ticket_number), create=False)
+
+    def cleanup(self, conversation_id: Text, ticket_number: int) -> None:
+        # finish_serving already deletes the key when no other ticket is waiting
+        self.finish_serving(conversation_id, ticket_number)
@@ -0,0 +1,156 @@
+"""
+Offline mirror of the MedlinePlus health-topics catalogue.
+
+Bulk-imports the XML export published at
+https://medlineplus.gov/xml.html (mplus_topics_YYYY-MM-DD.xml) into a SQLite
+FTS5 index, so search_health_info can answer without calling the live API.
+
+Usage:
+    python medlineplus_mirror.py import mplus_topics_2025-11-01.xml --db medlineplus.db
+    python medlineplus_mirror.py search "high blood pressure" --db medlineplus.db
+"""
+import argparse
+import html
+import os
+import re
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ET
+from typing import Iterator, List, Optional, Text, Tuple
+
+DEFAULT_DB = "medlineplus.db"
+
+SCHEMA = """
+CREATE VIRTUAL TABLE topics USING fts5(
+    title,
+    also_called,
+    summary,
+    url UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+"""
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def strip_html(text: Text) -> Text:
+    """full-summary holds escaped HTML; reduce it to plain text"""
+    text = _TAG_RE.sub(" ", html.unescape(text or ""))
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def iter_topics(xml_path: Text, language: Text = "English") -> Iterator[Tuple[Text, Text, Text, Text]]:
+    """Stream (title, also_called, summary, url) rows without loading the whole file"""
+    for _, elem in ET.iterparse(xml_path, events=("end",)):
+        if elem.tag != "health-topic":
+            continue
+        if elem.get("language", language) == language:
+            also_called = "; ".join(a.text.strip() for a in elem.findall("also-called") if a.text)
+            yield (
+                elem.get("title", "").strip(),
+                also_called,
+                strip_html(elem.findtext("full-summary", "")),
+                elem.get("url", "").strip(),
+            )
+        elem.clear()
+
+
+def import_topics(xml_path: Text, db_path: Text = DEFAULT_DB, language: Text = "English", batch_size: int = 500) -> int:
+    """
+    Build a fresh index next to db_path and atomically swap it in.
+    Returns the number of topics imported.
+    """
+    tmp_path = db_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    count = 0
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(SCHEMA)
+        batch: List[Tuple[Text, Text, Text, Text]] = []
+        for row in iter_topics(xml_path, language):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                conn.executemany("INSERT INTO topics VALUES (?, ?, ?, ?)", batch)
+                count += len(batch)
+                batch.clear()
+        if batch:
+            conn.executemany("INSERT INTO topics VALUES (?, ?, ?, ?)", batch)
+            count += len(batch)
+        conn.execute("INSERT INTO topics(topics) VALUES ('optimize')")
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, db_path)
+    return count
+
+
+class MedlinePlusMirror:
+    """Read-only lookups against an index built by import_topics"""
+
+    def __init__(self, db_path: Text = DEFAULT_DB):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+
+    def lookup(self, query: Text) -> Optional[Tuple[Text, Text, Text]]:
+        """Best (title, summary, url) for the query, or None"""
+        tokens = _TOKEN_RE.findall(query.lower())
+        if not tokens:
+            return None
+        phrase = '"' + " ".join(tokens) + '"'
+        all_terms = " ".join(f'"{t}"' for t in tokens)
+
+        with self._lock:
+            # Exact title / also-called phrase first, then ranked full-text match
+            for match in (f"{{title also_called}}: {phrase}", all_terms):
+                row = self._conn.execute(
+                    "SELECT title, summary, url FROM topics WHERE topics MATCH ? "
+                    "ORDER BY bm25(topics, 10.0, 5.0, 1.0) LIMIT 1",
+                    (match,),
+                ).fetchone()
+                if row:
+                    return row
+        return None
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MedlinePlus offline mirror")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    import_cmd = sub.add_parser("import", help="bulk-import a health-topics XML export")
+    import_cmd.add_argument("xml_path")
+    import_cmd.add_argument("--db", default=DEFAULT_DB)
+    import_cmd.add_argument("--language", default="English")
+
+    search_cmd = sub.add_parser("search", help="query an imported mirror")
+    search_cmd.add_argument("query")
+    search_cmd.add_argument("--db", default=DEFAULT_DB)
+
+    args = parser.parse_args()
+
+    if args.command == "import":
+        start = time.perf_counter()
+        count = import_topics(args.xml_path, args.db, args.language)
+        print(f"Imported {count} topics into {args.db} in {time.perf_counter() - start:.2f}s")
+    else:
+        row = MedlinePlusMirror(args.db).lookup(args.query)
+        if row:
+            title, summary, url = row
+            print(f"{title}\n{url}\n\n{summary[:500]}")
+        else:
+            print("No match")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Minimal Prometheus metrics for the action server.
+
+Counters, histograms and callback gauges with labels, rendered in the Prometheus
+text exposition format and served from a background HTTP thread. The server is
+opt-in (METRICS_ENABLED=true) and starts with the first action run, never at
+import time:
+
+    METRICS_ENABLED=true rasa run actions
+    curl http://localhost:9102/metrics
+"""
+import functools
+import inspect
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Text, Tuple
+
+from structured_logging import get_logger
+
+logger = get_logger("healthbot.metrics")
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9102"))
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape_label_value(value: Any) -> Text:
+    """Label values may not contain raw backslashes, double quotes or newlines"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[Text], values: Sequence[Text], extra: Text = "") -> Text:
+    pairs = [f'{n}="{_escape_label_value(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: Text, documentation: Text, labelnames: Sequence[Text] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def render(self) -> List[Text]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[Text]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: Text, documentation: Text, labelnames: Sequence[Text] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[Text, ...], float] = {}
+
+    def inc(self, *labels: Text, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def _samples(self) -> List[Text]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {v}" for k, v in items]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: Text, documentation: Text, labelnames: Sequence[Text] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[Text, ...], List[float]] = {}
+
+    def observe(self, value: float, *labels: Text) -> None:
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def _samples(self) -> List[Text]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        lines = []
+        for labels, series in items:
+            for bound, count in zip(self.buckets, series):
+                le = 'le="%s"' % bound
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {count}")
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {series[-2]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {series[-2]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {series[-1]}")
+        return lines
+
+
+class CallbackGauge(Metric):
+    """Gauge whose samples are read from a callback at scrape time"""
+
+    kind = "gauge"
+
+    def __init__(self, name: Text, documentation: Text, callback: Callable[[], Iterable[Tuple[Tuple[Text, ...], float]]], labelnames: Sequence[Text] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def _samples(self) -> List[Text]:
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {v}" for k, v in self.callback()]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[Text, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: Text, documentation: Text, labelnames: Sequence[Text] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: Text, documentation: Text, labelnames: Sequence[Text] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name: Text, documentation: Text, callback: Callable, labelnames: Sequence[Text] = ()) -> CallbackGauge:
+        return self.register(CallbackGauge(name, documentation, callback, labelnames))
+
+    def render(self) -> Text:
+        lines: List[Text] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+ACTION_LATENCY = REGISTRY.histogram(
+    "healthbot_action_duration_seconds", "Custom action run() latency", ("action", "outcome"))
+UPSTREAM_LATENCY = REGISTRY.histogram(
+    "healthbot_upstream_request_duration_seconds", "Outbound HTTP request latency", ("host", "outcome"))
+ANSWER_SOURCE = REGISTRY.counter(
+    "healthbot_answer_source_total", "Which path answered a health question", ("source",))
+
+
+def instrument_action(cls: type) -> type:
+    """Wrap cls.run (sync or async) to record latency and outcome per action"""
+    run = cls.run
+    if getattr(run, "_instrumented", False):
+        return cls
+
+    if inspect.iscoroutinefunction(run):
+        @functools.wraps(run)
+        async def wrapped(self, *args: Any, **kwargs: Any) -> Any:
+            _ensure_server()
+            start = time.perf_counter()
+            outcome = "error"
+            try:
+                result = await run(self, *args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                ACTION_LATENCY.observe(time.perf_counter() - start, self.name(), outcome)
+    else:
+        @functools.wraps(run)
+        def wrapped(self, *args: Any, **kwargs: Any) -> Any:
+            _ensure_server()
+            start = time.perf_counter()
+            outcome = "error"
+            try:
+                result = run(self, *args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                ACTION_LATENCY.observe(time.perf_counter() - start, self.name(), outcome)
+
+    wrapped._instrumented = True
+    cls.run = wrapped
+    return cls
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: Text, *args: Any) -> None:
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_attempted = False
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int = METRICS_PORT, host: Text = "127.0.0.1") -> Optional[ThreadingHTTPServer]:
+    """Serve /metrics from a daemon thread; port 0 or an unavailable port disables it"""
+    global _server
+    if _server is not None or port <= 0:
+        return _server
+    try:
+        _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        logger.warning("Metrics server not started on port %s: %s", port, e)
+        return None
+    threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+    logger.info("Metrics served on http://%s:%s/metrics", host, port)
+    return _server
+
+
+def _ensure_server() -> None:
+    """Start the server on the first action run when METRICS_ENABLED; tried once per process"""
+    global _server_attempted
+    if _server_attempted or not METRICS_ENABLED:
+        return
+    with _server_lock:
+        if not _server_attempted:
+            _server_attempted = True
+            start_metrics_server(METRICS_PORT)
@@ -0,0 +1,177 @@
+"""
+Unpacked model cache for faster Rasa server starts.
+
+Rasa unpacks the model .tar.gz into a fresh temporary directory on every start
+and loads each component from there. This module unpacks an archive once into
+a content-addressed cache directory
+
+    .model_cache/<fingerprint>/metadata.json
+    .model_cache/<fingerprint>/components/...
+
+keyed by the model_id in metadata.json (a fresh id for every training run), or
+by a hash of the archive for models without one, and loads the predict graph straight from that
+directory. An index keyed on the archive's path, size and mtime means a warm
+start does not decompress anything; replicas and restarted containers that
+share the cache volume also share the files through the OS page cache.
+
+    python model_cache.py unpack 20251102-230658-associative-control.tar.gz
+    python model_cache.py run --model 20251102-230658-associative-control.tar.gz --enable-api
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Text, Tuple, Type
+
+MODEL_CACHE_DIR = os.getenv("MODEL_CACHE_DIR", ".model_cache")
+
+METADATA_FILE = "metadata.json"
+COMPONENTS_DIR = "components"
+INDEX_FILE = "index.json"
+
+_index_lock = threading.Lock()
+
+
+def _archive_key(archive: Path) -> Text:
+    stat = archive.stat()
+    return f"{archive.resolve()}|{stat.st_size}|{stat.st_mtime_ns}"
+
+
+def _read_index(cache_dir: Path) -> Dict[Text, Text]:
+    try:
+        with open(cache_dir / INDEX_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_index(cache_dir: Path, index: Dict[Text, Text]) -> None:
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix=".index-")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1)
+    os.replace(tmp, cache_dir / INDEX_FILE)
+
+
+def _safe_members(tar: tarfile.TarFile) -> Any:
+    """Regular files and directories only, with paths kept inside the target"""
+    for member in tar.getmembers():
+        name = member.name.lstrip("/")
+        if not name or ".." in Path(name).parts:
+            continue
+        if not (member.isfile() or member.isdir()):
+            continue
+        member.name = name
+        yield member
+
+
+def fingerprint(metadata: Dict[Text, Any], archive: Path) -> Text:
+    # Not project_fingerprint: Rasa derives it from the git remote, so every
+    # model trained in one clone shares it and a retrain would hit the old entry
+    key = metadata.get("model_id")
+    if not key:
+        digest = hashlib.sha256()
+        with open(archive, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        key = digest.hexdigest()
+    return str(key)
+
+
+def ensure_unpacked(archive: Text, cache_dir: Text = MODEL_CACHE_DIR) -> Path:
+    """Return the cache directory holding `archive` unpacked, unpacking it on first use"""
+    archive_path = Path(archive)
+    cache = Path(cache_dir)
+    cache.mkdir(parents=True, exist_ok=True)
+
+    archive_key = _archive_key(archive_path)
+    cached = _read_index(cache).get(archive_key)
+    if cached and (cache / cached / METADATA_FILE).exists():
+        return cache / cached
+
+    # Unpack next to the cache so the final rename is atomic; a concurrent
+    # replica unpacking the same model simply loses the race
+    staging = Path(tempfile.mkdtemp(dir=cache, prefix=".unpack-"))
+    try:
+        with tarfile.open(archive_path, "r:gz") as tar:
+            tar.extractall(staging, members=_safe_members(tar))
+        with open(staging / METADATA_FILE, encoding="utf-8") as f:
+            key = fingerprint(json.load(f), archive_path)
+        target = cache / key
+        if not (target / METADATA_FILE).exists():
+            try:
+                os.rename(staging, target)
+            except OSError:
+                if not (target / METADATA_FILE).exists():
+                    raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    with _index_lock:
+        index = _read_index(cache)
+        index[archive_key] = key
+        _write_index(cache, index)
+    return target
+
+
+def load_predict_graph_runner(
+    storage_path: Path,
+    model_archive_path: Path,
+    model_storage_class: Type[Any],
+    graph_runner_class: Type[Any],
+) -> Tuple[Any, Any]:
+    """Drop-in for rasa.engine.loader.load_predict_graph_runner that reads from the cache"""
+    from rasa.engine.graph import ExecutionContext
+    from rasa.engine.storage.storage import ModelMetadata
+
+    model_dir = ensure_unpacked(str(model_archive_path))
+    with open(model_dir / METADATA_FILE, encoding="utf-8") as f:
+        metadata = ModelMetadata.from_dict(json.load(f))
+    model_storage = model_storage_class(model_dir / COMPONENTS_DIR)
+    runner = graph_runner_class.create(
+        graph_schema=metadata.predict_schema,
+        model_storage=model_storage,
+        execution_context=ExecutionContext(graph_schema=metadata.predict_schema, model_id=metadata.model_id),
+    )
+    return metadata, runner
+
+
+def install() -> None:
+    """Make every model load in this process go through the cache"""
+    import rasa.engine.loader
+
+    rasa.engine.loader.load_predict_graph_runner = load_predict_graph_runner
+
+
+def main(argv: Optional[list] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "run":
+        # Everything after `run` is passed to `rasa run` unchanged
+        install()
+        from rasa.__main__ import main as rasa_main
+
+        sys.argv = ["rasa"] + argv
+        rasa_main()
+        return
+
+    parser = argparse.ArgumentParser(description="Unpacked, content-addressed Rasa model cache")
+    sub = parser.add_subparsers(dest="command", required=True)
+    unpack = sub.add_parser("unpack", help="unpack a model archive into the cache")
+    unpack.add_argument("archive")
+    unpack.add_argument("--cache-dir", default=MODEL_CACHE_DIR)
+    sub.add_parser("run", help="`rasa run` with model loading served from the cache")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    path = ensure_unpacked(args.archive, args.cache_dir)
+    print(f"{args.archive} -> {path} ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
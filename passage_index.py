@@ -0,0 +1,150 @@
+"""
+TF-IDF retrieval over the bot's local health passages.
+
+Passages are vectorised once with character n-grams inside word boundaries
+(char_wb, 3-5), which copes with inflections ("yellow" / "yellowing") and
+typos without a stemmer. Rows are L2-normalised, so ranking a batch of
+questions is one sparse matrix product, Q @ D.T, giving cosine scores.
+
+Character n-grams also make unrelated words look alike ("cholesterol" /
+"cholera"), so every hit carries `shared`: how many query words (crudely
+stemmed) occur in the passage itself. Callers can require both a minimum
+score and a shared word.
+
+The fitted index is pickled next to the code and reused on the next start as
+long as the passages (and the scikit-learn version) are unchanged; otherwise
+it is rebuilt and re-saved atomically.
+"""
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+import threading
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Text
+
+import numpy as np
+import sklearn
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+LOCAL_INDEX_PATH = os.getenv(
+    "LOCAL_INDEX_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "passage_index.pkl")
+)
+
+# Bumped when the pickled layout changes, so older index files are rebuilt
+INDEX_VERSION = 2
+
+_WORD_RE = re.compile(r"\w+")
+_SUFFIXES = ("ing", "ed", "es", "s")
+
+
+class Passage(NamedTuple):
+    source: Text
+    key: Text
+    text: Text
+
+
+class Hit(NamedTuple):
+    passage: Passage
+    score: float
+    shared: int  # query words that occur in the passage
+
+
+def _stem(word: Text) -> Text:
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+            return word[: -len(suffix)]
+    return word
+
+
+def words(text: Text) -> FrozenSet[Text]:
+    return frozenset(_stem(word) for word in _WORD_RE.findall(text.lower()))
+
+
+def fingerprint(passages: Sequence[Passage]) -> Text:
+    digest = hashlib.sha256(f"{INDEX_VERSION} {sklearn.__version__}".encode("utf-8"))
+    for passage in passages:
+        for field in passage:
+            digest.update(field.encode("utf-8"))
+            digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class PassageIndex:
+    def __init__(self, passages: Sequence[Passage], vectorizer: TfidfVectorizer, matrix, key: Text):
+        self.passages = list(passages)
+        self.vectorizer = vectorizer
+        self.matrix = matrix
+        self.fingerprint = key
+        self.words = [words(f"{p.key} {p.text}") for p in self.passages]
+
+    @classmethod
+    def build(cls, passages: Sequence[Passage]) -> "PassageIndex":
+        vectorizer = TfidfVectorizer(analyzer="char_wb", ngram_range=(3, 5), sublinear_tf=True, lowercase=True)
+        # The key is indexed with the body so topic names weigh in even when the body never repeats them
+        matrix = vectorizer.fit_transform([f"{p.key} {p.key} {p.text}" for p in passages])
+        return cls(passages, vectorizer, matrix.tocsr(), fingerprint(passages))
+
+    @classmethod
+    def load_or_build(cls, passages: Sequence[Passage], path: Optional[Text] = LOCAL_INDEX_PATH) -> "PassageIndex":
+        key = fingerprint(passages)
+        if path and os.path.exists(path):
+            try:
+                with open(path, "rb") as f:
+                    index = pickle.load(f)
+                if isinstance(index, cls) and index.fingerprint == key:
+                    return index
+            except Exception:
+                pass
+        index = cls.build(passages)
+        if path:
+            index.save(path)
+        return index
+
+    def save(self, path: Text) -> None:
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".passage_index-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError:
+            # A read-only deployment just rebuilds on every start
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def search_many(self, queries: Sequence[Text], k: int = 3, min_score: float = 0.0) -> List[List[Hit]]:
+        """Top-k passages per query, best first, from one sparse matrix product"""
+        if not queries or not self.passages:
+            return [[] for _ in queries]
+        scores = (self.vectorizer.transform(queries) @ self.matrix.T).toarray()
+        k = min(k, len(self.passages))
+        results = []
+        for query, row in zip(queries, scores):
+            top = np.argpartition(-row, k - 1)[:k]
+            top = top[np.argsort(-row[top])]
+            query_words = words(query)
+            results.append([
+                Hit(self.passages[i], float(row[i]), len(query_words & self.words[i]))
+                for i in top if row[i] > min_score
+            ])
+        return results
+
+    def search(self, query: Text, k: int = 3, min_score: float = 0.0) -> List[Hit]:
+        return self.search_many([query], k, min_score)[0]
+
+
+_lock = threading.Lock()
+_indexes: Dict[Text, PassageIndex] = {}
+
+
+def get_index(name: Text, passages: Sequence[Passage], path: Optional[Text] = LOCAL_INDEX_PATH) -> PassageIndex:
+    """Process-wide index, loaded or built on first use (thread-safe)"""
+    index = _indexes.get(name)
+    if index is None:
+        with _lock:
+            index = _indexes.get(name)
+            if index is None:
+                index = _indexes[name] = PassageIndex.load_or_build(passages, path)
+    return index
+
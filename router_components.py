@@ -0,0 +1,154 @@
+"""
+Rasa graph components for the keyword pre-router (see keyword_router.py).
+
+Not enabled in the shipped config.yml (see benchmarks/nlu_router.py for its
+coverage and precision on nlu.yml). To enable:
+
+    pipeline:
+      ...featurizers...
+      - name: router_components.KeywordIntentRouter
+        min_confidence: 0.9
+      - name: router_components.RoutedDIETClassifier
+        epochs: 50
+        ...
+
+KeywordIntentRouter sets the intent of obviously classifiable messages and
+marks them with `keyword_route` (also visible in /model/parse output).
+RoutedDIETClassifier is DIETClassifier with one change: it only runs its model
+on messages the router left unmarked. Training is unchanged, so DIET still
+learns from every example.
+"""
+import json
+from typing import Any, Dict, List, Optional, Text
+
+from rasa.engine.graph import ExecutionContext, GraphComponent
+from rasa.engine.recipes.default_recipe import DefaultV1Recipe
+from rasa.engine.storage.resource import Resource
+from rasa.engine.storage.storage import ModelStorage
+from rasa.nlu.classifiers.classifier import IntentClassifier
+from rasa.nlu.classifiers.diet_classifier import DIETClassifier
+from rasa.shared.nlu.constants import ENTITIES, INTENT, INTENT_NAME_KEY, INTENT_RANKING_KEY, TEXT
+from rasa.shared.nlu.training_data.message import Message
+from rasa.shared.nlu.training_data.training_data import TrainingData
+
+from keyword_router import KeywordRouteTable, load_domain_intents
+
+ROUTE_KEY = "keyword_route"
+TABLE_FILE = "keyword_routes.json"
+
+
+@DefaultV1Recipe.register([DefaultV1Recipe.ComponentType.INTENT_CLASSIFIER], is_trainable=True)
+class KeywordIntentRouter(GraphComponent, IntentClassifier):
+    """Routes messages that match an unambiguous keyword n-gram, bypassing DIET"""
+
+    @staticmethod
+    def get_default_config() -> Dict[Text, Any]:
+        return {
+            "max_ngram": 3,
+            "min_support": 3,
+            "min_confidence": 0.75,
+            "prior": 1.0,
+            "max_tokens": 12,
+            # Folds for calibrating route confidence against held-out accuracy (0: raw scores)
+            "calibration_folds": 5,
+            # Only intents listed in this domain file are routed (None: all)
+            "domain": "domain.yml",
+        }
+
+    def __init__(
+        self,
+        config: Dict[Text, Any],
+        model_storage: ModelStorage,
+        resource: Resource,
+        table: Optional[KeywordRouteTable] = None,
+    ) -> None:
+        self.component_config = config
+        self._model_storage = model_storage
+        self._resource = resource
+        self.table = table or KeywordRouteTable({})
+
+    @classmethod
+    def create(
+        cls,
+        config: Dict[Text, Any],
+        model_storage: ModelStorage,
+        resource: Resource,
+        execution_context: ExecutionContext,
+    ) -> "KeywordIntentRouter":
+        return cls(config, model_storage, resource)
+
+    def train(self, training_data: TrainingData) -> Resource:
+        examples, with_entities = [], set()
+        for message in training_data.intent_examples:
+            intent = message.get(INTENT)
+            examples.append((message.get(TEXT), intent))
+            if message.get(ENTITIES):
+                with_entities.add(intent)
+
+        domain = self.component_config.get("domain")
+        try:
+            allowed = load_domain_intents(domain) if domain else None
+        except OSError:
+            allowed = None
+
+        self.table = KeywordRouteTable.build(
+            examples,
+            exclude_intents=with_entities | set(training_data.retrieval_intents),
+            allowed_intents=allowed,
+            max_n=self.component_config["max_ngram"],
+            min_support=self.component_config["min_support"],
+            min_confidence=self.component_config["min_confidence"],
+            prior=self.component_config["prior"],
+            max_tokens=self.component_config["max_tokens"],
+            calibration_folds=self.component_config["calibration_folds"],
+        )
+        self.persist()
+        return self._resource
+
+    def process(self, messages: List[Message]) -> List[Message]:
+        for message in messages:
+            text = message.get(TEXT)
+            routed = self.table.match(text) if text else None
+            if routed is None:
+                continue
+            intent, confidence, gram = routed
+            message.set(INTENT, {INTENT_NAME_KEY: intent, "confidence": confidence}, add_to_output=True)
+            message.set(INTENT_RANKING_KEY, [{INTENT_NAME_KEY: intent, "confidence": confidence}], add_to_output=True)
+            message.set(ROUTE_KEY, gram, add_to_output=True)
+        return messages
+
+    def persist(self) -> None:
+        with self._model_storage.write_to(self._resource) as directory:
+            with open(directory / TABLE_FILE, "w", encoding="utf-8") as f:
+                json.dump(self.table.as_dict(), f, ensure_ascii=False)
+
+    @classmethod
+    def load(
+        cls,
+        config: Dict[Text, Any],
+        model_storage: ModelStorage,
+        resource: Resource,
+        execution_context: ExecutionContext,
+        **kwargs: Any,
+    ) -> "KeywordIntentRouter":
+        try:
+            with model_storage.read_from(resource) as directory:
+                with open(directory / TABLE_FILE, encoding="utf-8") as f:
+                    table = KeywordRouteTable.from_dict(json.load(f))
+        except (ValueError, OSError):
+            table = None
+        return cls(config, model_storage, resource, table)
+
+
+@DefaultV1Recipe.register(
+    [DefaultV1Recipe.ComponentType.INTENT_CLASSIFIER, DefaultV1Recipe.ComponentType.ENTITY_EXTRACTOR],
+    is_trainable=True,
+)
+class RoutedDIETClassifier(DIETClassifier):
+    """DIETClassifier that skips messages already routed by KeywordIntentRouter"""
+
+    def process(self, messages: List[Message]) -> List[Message]:
+        pending = [message for message in messages if not message.get(ROUTE_KEY)]
+        if pending:
+            super().process(pending)
+        return messages
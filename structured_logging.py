@@ -0,0 +1,110 @@
+"""
+Structured, low-overhead logging for the action server.
+
+- One JSON object per line (ts, level, logger, msg, request_id, extra fields)
+- Records are handed to a QueueHandler and written by a background
+  QueueListener thread, so actions never block on the output stream
+- DEBUG records are sampled (LOG_DEBUG_SAMPLE_RATE) before formatting
+- request_id is carried in a contextvar, so concurrent conversations on the
+  same event loop keep their own correlation ID
+"""
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import uuid
+from typing import Any, Dict, Optional, Text
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0"))
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # "json" or "text"
+
+request_id_var: contextvars.ContextVar[Text] = contextvars.ContextVar("request_id", default="-")
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RESERVED = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def bind_request_id(sender_id: Optional[Text] = None) -> Text:
+    """Start a new correlation ID for the current task and return it"""
+    request_id = uuid.uuid4().hex[:12]
+    if sender_id:
+        request_id = f"{sender_id}:{request_id}"
+    request_id_var.set(request_id)
+    return request_id
+
+
+class RequestContextFilter(logging.Filter):
+    """Attach the current request_id and sample DEBUG records"""
+
+    def __init__(self, debug_sample_rate: float = 1.0):
+        super().__init__()
+        self.debug_sample_rate = debug_sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno <= logging.DEBUG and self.debug_sample_rate < 1.0:
+            if random.random() >= self.debug_sample_rate:
+                return False
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> Text:
+        payload: Dict[Text, Any] = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+def get_logger(name: Text) -> logging.Logger:
+    """
+    Return a logger under the configured hierarchy.
+    Disabled levels are rejected by isEnabledFor before any formatting happens,
+    so callers should pass %-style arguments rather than f-strings.
+    """
+    configure_logging()
+    return logging.getLogger(name)
+
+
+def configure_logging(level: Text = LOG_LEVEL, debug_sample_rate: float = LOG_DEBUG_SAMPLE_RATE, fmt: Text = LOG_FORMAT) -> None:
+    """Install the queue-backed handler on the 'healthbot' logger (idempotent)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    if fmt == "json":
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"))
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # Filter before enqueueing so request_id is read in the caller's context
+    queue_handler.addFilter(RequestContextFilter(debug_sample_rate))
+
+    root = logging.getLogger("healthbot")
+    root.setLevel(level)
+    root.addHandler(queue_handler)
+    root.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -0,0 +1,140 @@
+"""
+Symptom extraction shared by the symptom actions and offline triage (triage.py).
+
+Each vocabulary maps a canonical symptom to the keywords that mention it. All
+keywords of all vocabularies go into one Aho-Corasick automaton, so a message
+is scanned once however many vocabularies and keywords there are. Messages
+are expected already normalised (text_normalizer.normalize(...).text).
+"""
+from collections import deque
+from typing import Dict, Iterator, List, NamedTuple, Text, Tuple
+
+# Symptom vocabulary used by ActionSymptomChecker (canonical symptom -> keywords)
+CHECKER_SYMPTOM_KEYWORDS = {
+    'fever': ['fever', 'temperature', 'feverish'],
+    'cough': ['cough', 'coughing'],
+    'headache': ['headache', 'head pain', 'migraine'],
+    'body ache': ['body ache', 'body pain', 'muscle pain'],
+    'fatigue': ['tired', 'fatigue', 'weakness', 'weak'],
+    'sore throat': ['sore throat', 'throat pain'],
+    'nausea': ['nausea', 'vomiting'],
+    'breathlessness': ['breathless', 'breathing problem', 'shortness of breath'],
+    'chest pain': ['chest pain'],
+    'stomach pain': ['stomach pain', 'stomach ache', 'abdominal pain'],
+    'diarrhea': ['diarrhea', 'loose motion'],
+    'rash': ['rash', 'skin rash'],
+    'leg pain': ['leg pain', 'leg hurt'],
+    'joint pain': ['joint pain', 'knee pain'],
+}
+
+# Symptom vocabulary used by ActionRespondSymptom, in priority order
+RESPONSE_SYMPTOM_KEYWORDS = {
+    'knee pain': ['knee pain', 'knees hurt', 'knee hurting', 'pain in knee', 'my knee', 'knee ache'],
+    'leg pain': ['leg pain', 'legs hurt', 'leg hurting', 'pain in leg', 'my leg', 'leg ache'],
+    'joint pain': ['joint pain', 'joints hurt', 'joint ache'],
+    'migraine': ['migraine'],
+    'headache': ['headache', 'head pain', 'head ache'],
+    'chest pain': ['chest pain', 'chest ache'],
+    'back pain': ['back pain', 'back ache'],
+    'stomach pain': ['stomach pain', 'stomach ache', 'belly pain'],
+    'body pain': ['body pain', 'body ache', 'muscle pain'],
+    'fever': ['fever', 'temperature', 'feverish'],
+    'cough': ['cough', 'coughing'],
+    'cold': ['cold', 'runny nose', 'sneezing'],
+    'sore throat': ['sore throat', 'throat pain'],
+    'diarrhea': ['diarrhea', 'loose motion'],
+    'vomiting': ['vomit', 'vomiting', 'nausea'],
+    'breathlessness': ['breathless', 'breathing problem'],
+}
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a fixed keyword set.
+    Finds every (possibly overlapping) keyword occurrence in one pass over the text,
+    so the cost is linear in message length regardless of vocabulary size.
+    """
+
+    def __init__(self, keywords: List[Text]):
+        self._goto: List[Dict[Text, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Text]] = [[]]
+        
+        for keyword in keywords:
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[state][ch] = nxt
+                state = nxt
+            if keyword not in self._out[state]:
+                self._out[state].append(keyword)
+        
+        # Breadth-first pass to build failure links
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt].extend(self._out[self._fail[nxt]])
+
+    def finditer(self, text: Text) -> Iterator[Tuple[int, int, Text]]:
+        """Yield (start, end, keyword) for every occurrence, ordered by end offset"""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for keyword in out[state]:
+                yield i + 1 - len(keyword), i + 1, keyword
+
+
+class SymptomMatch(NamedTuple):
+    symptom: Text
+    keyword: Text
+    start: int
+    end: int
+
+
+class SymptomExtractor:
+    """One shared automaton serving several symptom vocabularies"""
+
+    def __init__(self, vocabularies: Dict[Text, Dict[Text, List[Text]]]):
+        self.vocabularies = vocabularies
+        # keyword -> [(vocabulary, symptom)]
+        self._labels: Dict[Text, List[Tuple[Text, Text]]] = {}
+        for vocabulary, table in vocabularies.items():
+            for symptom, keywords in table.items():
+                for keyword in keywords:
+                    self._labels.setdefault(keyword, []).append((vocabulary, symptom))
+        self._automaton = KeywordAutomaton(list(self._labels))
+
+    def find(self, message: Text) -> Dict[Text, List[SymptomMatch]]:
+        """All symptom mentions in the message, grouped by vocabulary, in text order"""
+        found: Dict[Text, List[SymptomMatch]] = {vocabulary: [] for vocabulary in self.vocabularies}
+        for start, end, keyword in self._automaton.finditer(message):
+            for vocabulary, symptom in self._labels[keyword]:
+                found[vocabulary].append(SymptomMatch(symptom, keyword, start, end))
+        for matches in found.values():
+            matches.sort(key=lambda m: (m.start, m.end))
+        return found
+
+    def symptoms(self, message: Text, vocabulary: Text) -> List[Text]:
+        """Distinct symptoms mentioned, in the vocabulary's declared order"""
+        mentioned = {m.symptom for m in self.find(message)[vocabulary]}
+        return [symptom for symptom in self.vocabularies[vocabulary] if symptom in mentioned]
+
+
+SYMPTOM_EXTRACTOR = SymptomExtractor({
+    'checker': CHECKER_SYMPTOM_KEYWORDS,
+    'response': RESPONSE_SYMPTOM_KEYWORDS,
+})
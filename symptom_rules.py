@@ -0,0 +1,111 @@
+"""
+Condition rules for the symptom checker, loaded from symptom_rules.yml.
+
+Every symptom named by a rule is given one bit; a rule compiles to the mask of
+its symptoms, and a report of symptoms to the mask of those present. A rule
+fires when popcount(reported & rule) >= threshold, so evaluating the whole
+rule set is one integer AND and popcount per rule, with no per-rule set
+building. Adding a condition is a change to the YAML file only.
+
+    python symptom_rules.py fever cough "body ache"
+"""
+import argparse
+import os
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Text, Tuple
+
+import yaml
+
+SYMPTOM_RULES_PATH = os.getenv(
+    "SYMPTOM_RULES_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "symptom_rules.yml")
+)
+
+SEVERITIES = ("emergency", "high", "moderate", "low")
+
+try:
+    _popcount = int.bit_count  # Python 3.10+
+except AttributeError:
+    def _popcount(mask: int) -> int:
+        return bin(mask).count("1")
+
+
+class ConditionRule(NamedTuple):
+    condition: Text
+    symptoms: Tuple[Text, ...]
+    mask: int
+    threshold: int
+    severity: Text
+    message: Text
+
+
+class ConditionRules:
+    """Compiled rule set; rules keep their file order"""
+
+    def __init__(self, rules: Iterable[Dict[Text, Any]], fallback: Optional[Text] = None):
+        self.bits: Dict[Text, int] = {}
+        self.rules: List[ConditionRule] = []
+        self.fallback = fallback
+
+        for spec in rules:
+            condition = spec.get("condition")
+            symptoms = tuple(spec.get("symptoms") or ())
+            threshold = int(spec.get("threshold", 1))
+            severity = spec.get("severity", "moderate")
+            if not condition or not symptoms or not spec.get("message"):
+                raise ValueError(f"Rule {condition or spec!r} needs a condition, symptoms and a message")
+            if not 1 <= threshold <= len(set(symptoms)):
+                raise ValueError(f"Rule {condition!r}: threshold {threshold} outside 1..{len(set(symptoms))}")
+            if severity not in SEVERITIES:
+                raise ValueError(f"Rule {condition!r}: severity {severity!r} not one of {', '.join(SEVERITIES)}")
+            mask = 0
+            for symptom in symptoms:
+                mask |= 1 << self.bits.setdefault(symptom, len(self.bits))
+            self.rules.append(ConditionRule(condition, symptoms, mask, threshold, severity, spec["message"]))
+        # Flat (mask, threshold, rule) tuples keep attribute lookups out of the evaluation loop
+        self._compiled = [(rule.mask, rule.threshold, rule) for rule in self.rules]
+
+    @classmethod
+    def load(cls, path: Text = SYMPTOM_RULES_PATH) -> "ConditionRules":
+        with open(path, encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+        return cls(data.get("rules") or [], data.get("fallback"))
+
+    def mask(self, symptoms: Iterable[Text]) -> int:
+        """Bit mask of the reported symptoms; symptoms no rule mentions are ignored"""
+        bits = self.bits
+        mask = 0
+        for symptom in symptoms:
+            bit = bits.get(symptom)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def evaluate(self, symptoms: Iterable[Text]) -> List[ConditionRule]:
+        """Rules fired by the reported symptoms, in file order"""
+        reported = self.mask(symptoms)
+        if not reported:
+            return []
+        return [rule for mask, threshold, rule in self._compiled if _popcount(reported & mask) >= threshold]
+
+    def unknown_symptoms(self, vocabulary: Iterable[Text]) -> List[Text]:
+        """Rule symptoms outside the extractor's vocabulary (such rules can never see them)"""
+        known = set(vocabulary)
+        return [symptom for symptom in self.bits if symptom not in known]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Evaluate the symptom checker rules for a list of symptoms")
+    parser.add_argument("symptoms", nargs="*")
+    parser.add_argument("--rules", default=SYMPTOM_RULES_PATH)
+    args = parser.parse_args()
+
+    rules = ConditionRules.load(args.rules)
+    print(f"{len(rules.rules)} rules over {len(rules.bits)} symptoms")
+    fired = rules.evaluate(args.symptoms)
+    for rule in fired:
+        print(f"{rule.severity:10} {rule.condition}")
+    if not fired and rules.fallback:
+        print(f"{'-':10} {rules.fallback}")
+
+
+if __name__ == "__main__":
+    main()
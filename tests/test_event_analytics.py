@@ -0,0 +1,32 @@
+import json
+
+from event_analytics import iter_events
+
+
+def _segment(directory, name, events):
+    with open(directory / name, "w", encoding="utf-8") as f:
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+
+
+def _user(sender, timestamp):
+    return {"event": "user", "sender_id": sender, "timestamp": timestamp,
+            "parse_data": {"intent": {"name": "greet", "confidence": 0.9}}}
+
+
+def _action(sender, timestamp, name="utter_greet"):
+    return {"event": "action", "sender_id": sender, "timestamp": timestamp, "name": name}
+
+
+def test_replica_segments_are_merged_by_timestamp(tmp_path):
+    # rasa-2 opened its segment later but wrote the earliest events
+    _segment(tmp_path, "events-20251102T230658-rasa-1-7-001.jsonl", [_user("a", 10.0), _action("a", 10.5)])
+    _segment(tmp_path, "events-20251102T231000-rasa-1-7-001.jsonl", [_user("a", 30.0), _action("a", 30.2)])
+    _segment(tmp_path, "events-20251102T230700-rasa-2-9-001.jsonl", [_user("b", 5.0), _action("b", 20.0)])
+    _segment(tmp_path, "events-20251102T230700-rasa-2-9-002.jsonl.part", [_user("b", 25.0), _action("b", 25.1)])
+
+    timestamps = [event["timestamp"] for event in iter_events(str(tmp_path))]
+    assert timestamps == [5.0, 10.0, 10.5, 20.0, 30.0, 30.2]
+    timestamps = [event["timestamp"] for event in iter_events(str(tmp_path), include_open=True)]
+    assert timestamps == sorted(timestamps) and len(timestamps) == 8
+
@@ -0,0 +1,55 @@
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+pytest.importorskip("rasa")
+
+from event_broker import JsonlEventBroker  # noqa: E402
+
+
+def _part(directory, writer_id, age):
+    path = os.path.join(directory, f"events-20251102T230658-{writer_id}-001.jsonl.part")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"event": "user"}\n')
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def _close(broker):
+    asyncio.run(broker.close())
+
+
+def test_stale_segments_of_other_writers_are_sealed(tmp_path):
+    stale = _part(str(tmp_path), "rasa-2-41", age=7200)
+    live = _part(str(tmp_path), "rasa-3-42", age=5)
+
+    broker = JsonlEventBroker(path=str(tmp_path), max_segment_age=1800, flush_interval=0.01)
+    _close(broker)
+
+    assert not os.path.exists(stale)
+    assert os.path.exists(stale[: -len(".part")])
+    assert os.path.exists(live)
+
+
+def test_stale_part_age_is_configurable(tmp_path):
+    part = _part(str(tmp_path), "rasa-2-41", age=120)
+
+    broker = JsonlEventBroker(path=str(tmp_path), stale_part_age=60, flush_interval=0.01)
+    _close(broker)
+
+    assert not os.path.exists(part)
+
+
+def test_published_events_land_in_a_sealed_segment(tmp_path):
+    broker = JsonlEventBroker(path=str(tmp_path), flush_interval=0.01)
+    broker.publish({"event": "user", "text": "I have a fever"})
+    _close(broker)
+
+    (segment,) = os.listdir(str(tmp_path))
+    assert segment.endswith(".jsonl")
+    with open(os.path.join(str(tmp_path), segment), encoding="utf-8") as f:
+        assert [json.loads(line)["text"] for line in f] == ["I have a fever"]
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("rasa_sdk")
+pytest.importorskip("aiohttp")
+
+import actions  # noqa: E402
+from rasa_sdk import Tracker  # noqa: E402
+from rasa_sdk.executor import CollectingDispatcher  # noqa: E402
+
+
+def _topic(question):
+    return actions.HEALTH_TOPIC_INDEX.match(actions.normalize(question).query)
+
+
+@pytest.mark.parametrize("question, topic", [
+    ("diabetis", "diabetes"),
+    ("what is maleria", "malaria"),
+    ("high blod pressure", "hypertension"),
+    ("jaundis symptoms", "jaundice"),
+    ("chiken pox", "chickenpox"),
+    ("tyfoid", "typhoid"),  # as close to thyroid, but spelled the way typhoid sounds
+])
+def test_misspelled_topics_are_corrected(question, topic):
+    assert _topic(question) == topic
+
+
+@pytest.mark.parametrize("question", [
+    "hypotension",
+    "canker sores",
+    "bumps on my skin",
+    "i never feel hungry",
+    "cancel my appointment",
+    "heard about gout",
+    "dental health",
+    "tyroid",  # as close to thyroid as to typhoid
+])
+def test_real_words_and_ambiguous_words_are_not_corrected(question):
+    assert _topic(question) is None
+
+
+def _answer(monkeypatch, text, remote=None):
+    searched = []
+
+    async def search_health_info(query):
+        searched.append(query)
+        return remote
+
+    monkeypatch.setattr(actions, "search_health_info", search_health_info)
+    monkeypatch.setattr(actions, "LOCAL_RETRIEVAL_ENABLED", False)
+    tracker = Tracker("test", {}, {"text": text, "intent": {"name": "ask_health_question"}}, [], False, None, {}, None)
+    dispatcher = CollectingDispatcher()
+    asyncio.run(actions.ActionAnswerHealthQuestion().run(dispatcher, tracker, {}))
+    return searched, [message["text"] for message in dispatcher.messages]
+
+
+def test_misspelled_topic_is_answered_without_going_upstream(monkeypatch):
+    searched, messages = _answer(monkeypatch, "what is diabetis", remote="**Diabetes** from MedlinePlus")
+    assert searched == []
+    assert messages == [actions.HEALTH_TOPICS["diabetes"]]
+
+
+def test_real_word_near_a_topic_goes_upstream(monkeypatch):
+    searched, messages = _answer(monkeypatch, "what is hypotension", remote="**Hypotension** from MedlinePlus")
+    assert searched == ["hypotension"]
+    assert messages == ["**Hypotension** from MedlinePlus"]
+
+
+def test_near_miss_of_a_real_word_gets_the_fallback(monkeypatch):
+    _, messages = _answer(monkeypatch, "cancel my appointment")
+    assert messages != [actions.HEALTH_TOPICS["cancer"]]
+    assert "I don't have specific information" in messages[0]
@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("rasa")
+pytest.importorskip("fakeredis")
+
+from conftest import ROOT  # noqa: E402
+
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import lock_store_check  # noqa: E402
+from lock_store import ReplicaSafeLockStore, create_client  # noqa: E402
+
+
+def test_replicas_never_hold_one_conversation_at_once():
+    args = lock_store_check.parse_args(
+        ["--replicas", "4", "--conversations", "3", "--messages", "25", "--work", "0.002", "--poll", "0.002"]
+    )
+    monitor, errors, _ = lock_store_check.run_check(args)
+    assert errors == []
+    assert monitor.handled == 4 * 25
+    assert monitor.overlaps == 0
+
+
+def test_key_is_dropped_once_the_last_ticket_is_served():
+    store = ReplicaSafeLockStore(client=create_client("fakeredis", 6379, 2))
+    first = store.issue_ticket("conversation")
+    second = store.issue_ticket("conversation")
+    assert second > first
+    assert store.red.ttl(store._key("conversation")) > 0
+
+    store.cleanup("conversation", first)
+    assert store.get_lock("conversation") is not None
+    store.cleanup("conversation", second)
+    assert store.red.exists(store._key("conversation")) == 0
@@ -0,0 +1,80 @@
+import asyncio
+import os
+import socket
+
+import pytest
+
+from conftest import FIXTURES
+from medlineplus_mirror import MedlinePlusMirror, import_topics
+
+SAMPLE_XML = os.path.join(FIXTURES, "mplus_topics_sample.xml")
+
+
+@pytest.fixture
+def mirror_db(tmp_path):
+    db_path = str(tmp_path / "medlineplus.db")
+    assert import_topics(SAMPLE_XML, db_path) == 4  # the Spanish topic is skipped
+    return db_path
+
+
+@pytest.fixture
+def no_network(monkeypatch):
+    """Refuse all connections and record the attempts (callers may swallow the error)"""
+    attempts = []
+
+    def refuse(*args, **kwargs):
+        attempts.append(args)
+        raise OSError("network disabled in tests")
+
+    monkeypatch.setattr(socket.socket, "connect", refuse)
+    monkeypatch.setattr(socket, "getaddrinfo", refuse)
+    return attempts
+
+
+def test_lookup_prefers_title_and_also_called(mirror_db):
+    mirror = MedlinePlusMirror(mirror_db)
+    try:
+        assert mirror.lookup("diabetes")[0] == "Diabetes"
+        assert mirror.lookup("hypertension")[0] == "High Blood Pressure"
+        assert mirror.lookup("yellow skin")[0] == "Jaundice"
+        assert mirror.lookup("zzzz") is None
+    finally:
+        mirror.close()
+
+
+@pytest.fixture
+def actions_in_mirror_mode(monkeypatch, mirror_db, no_network):
+    pytest.importorskip("rasa_sdk")
+    pytest.importorskip("aiohttp")
+    import actions
+
+    monkeypatch.setattr(actions, "HEALTH_INFO_SOURCE", "mirror")
+    monkeypatch.setattr(actions, "MEDLINEPLUS_MIRROR_DB", mirror_db)
+    monkeypatch.setattr(actions, "_medlineplus_mirror", None)
+    actions.HEALTH_INFO_CACHE.clear()
+    yield actions
+    assert no_network == [], "offline mode touched the network"
+    actions.HEALTH_INFO_CACHE.clear()
+    if actions._medlineplus_mirror is not None:
+        actions._medlineplus_mirror.close()
+
+
+def test_search_health_info_answers_from_mirror(actions_in_mirror_mode):
+    answer = asyncio.run(actions_in_mirror_mode.search_health_info("What is diabetes?"))
+    assert "**Diabetes**" in answer
+    assert "https://medlineplus.gov/diabetes.html" in answer
+
+
+def test_covid_question_is_answered_by_mirror(actions_in_mirror_mode):
+    answer = asyncio.run(actions_in_mirror_mode.search_health_info("tell me about covid"))
+    assert "**COVID-19**" in answer
+
+
+def test_covid_miss_does_not_fall_back_to_disease_sh(actions_in_mirror_mode):
+    assert asyncio.run(actions_in_mirror_mode.search_health_info("covid booster schedule")) is None
+
+
+def test_unknown_topic_is_a_cached_miss(actions_in_mirror_mode):
+    actions = actions_in_mirror_mode
+    assert asyncio.run(actions.search_health_info("quantum entanglement")) is None
+    assert actions.HEALTH_INFO_CACHE.peek("quantum entanglement") == (True, None)
@@ -0,0 +1,85 @@
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import urllib.request
+
+import pytest
+
+import metrics
+from conftest import ROOT
+
+
+def test_label_values_are_escaped():
+    counter = metrics.Counter("demo_total", "Demo", ("source",))
+    counter.inc('a "quoted"\\path\nnext')
+    assert counter.render()[-1] == 'demo_total{source="a \\"quoted\\"\\\\path\\nnext"} 1.0'
+
+
+def test_histogram_le_label_is_kept_verbatim():
+    histogram = metrics.Histogram("demo_seconds", "Demo", ("host",), buckets=(0.5,))
+    histogram.observe(0.1, "x")
+    assert 'demo_seconds_bucket{host="x",le="0.5"} 1' in "\n".join(histogram.render())
+
+
+@pytest.fixture
+def fresh_server_state(monkeypatch):
+    monkeypatch.setattr(metrics, "_server", None)
+    monkeypatch.setattr(metrics, "_server_attempted", False)
+    yield
+    if metrics._server is not None:
+        metrics._server.shutdown()
+        metrics._server.server_close()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_server_is_off_by_default(fresh_server_state, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_ENABLED", False)
+
+    @metrics.instrument_action
+    class Demo:
+        def name(self):
+            return "demo"
+
+        def run(self):
+            return []
+
+    Demo().run()
+    assert metrics._server is None
+
+
+def test_server_starts_on_first_action_run(fresh_server_state, monkeypatch):
+    port = _free_port()
+    monkeypatch.setattr(metrics, "METRICS_ENABLED", True)
+    monkeypatch.setattr(metrics, "METRICS_PORT", port)
+
+    @metrics.instrument_action
+    class Demo:
+        def name(self):
+            return "demo_async"
+
+        async def run(self):
+            return []
+
+    assert metrics._server is None
+    asyncio.run(Demo().run())
+    body = urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5).read().decode()
+    assert 'healthbot_action_duration_seconds_count{action="demo_async",outcome="ok"}' in body
+
+
+def test_importing_actions_does_not_start_the_server():
+    pytest.importorskip("rasa_sdk")
+    pytest.importorskip("aiohttp")
+    env = dict(os.environ, METRICS_ENABLED="true")
+    # Fresh interpreter: a cached import of actions would prove nothing
+    out = subprocess.run(
+        [sys.executable, "-c", "import actions, metrics; print(metrics._server)"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    assert out.strip().splitlines()[-1] == "None"
@@ -0,0 +1,50 @@
+import io
+import json
+import os
+import tarfile
+
+from model_cache import METADATA_FILE, ensure_unpacked
+
+
+def _archive(path, model_id, weights, project_fingerprint="same-git-remote"):
+    metadata = {"model_id": model_id, "project_fingerprint": project_fingerprint}
+    with tarfile.open(path, "w:gz") as tar:
+        for name, data in (
+            (METADATA_FILE, json.dumps(metadata).encode("utf-8")),
+            ("components/train_DIETClassifier0/weights.bin", weights),
+        ):
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return str(path)
+
+
+def _weights(model_dir):
+    with open(os.path.join(model_dir, "components/train_DIETClassifier0/weights.bin"), "rb") as f:
+        return f.read()
+
+
+def test_retrained_model_with_same_project_fingerprint_is_unpacked_again(tmp_path):
+    cache = str(tmp_path / "cache")
+    first = ensure_unpacked(_archive(tmp_path / "first.tar.gz", "a" * 32, b"old"), cache)
+    second = ensure_unpacked(_archive(tmp_path / "second.tar.gz", "b" * 32, b"new"), cache)
+
+    assert first != second
+    assert _weights(first) == b"old"
+    assert _weights(second) == b"new"
+
+
+def test_warm_start_reuses_the_unpacked_model(tmp_path):
+    cache = str(tmp_path / "cache")
+    archive = _archive(tmp_path / "model.tar.gz", "c" * 32, b"weights")
+    assert ensure_unpacked(archive, cache) == ensure_unpacked(archive, cache)
+    assert ensure_unpacked(archive, cache).name == "c" * 32
+
+
+def test_archives_without_model_id_are_keyed_on_their_contents(tmp_path):
+    cache = str(tmp_path / "cache")
+    first = ensure_unpacked(_archive(tmp_path / "first.tar.gz", None, b"old"), cache)
+    second = ensure_unpacked(_archive(tmp_path / "second.tar.gz", None, b"new"), cache)
+
+    assert first != second
+    assert _weights(second) == b"new"
@@ -0,0 +1,109 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("sklearn")
+
+import passage_index  # noqa: E402
+from conftest import ROOT  # noqa: E402
+from passage_index import LOCAL_INDEX_PATH, Passage, PassageIndex  # noqa: E402
+
+PASSAGES = [
+    Passage("topic", "cholera", "Cholera causes watery diarrhea and severe dehydration."),
+    Passage("topic", "jaundice", "Jaundice is yellowing of the skin and eyes."),
+]
+
+
+def test_hits_count_the_query_words_the_passage_shares():
+    index = PassageIndex.build(PASSAGES)
+    (hit,) = index.search("yellow skin", k=1)
+    assert hit.passage.key == "jaundice"
+    assert hit.shared == 2  # "skin", and "yellow" for "yellowing"
+    (hit,) = index.search("cholesterol", k=1)
+    assert hit.passage.key == "cholera"
+    assert hit.shared == 0
+
+
+def test_index_is_saved_and_reloaded(tmp_path):
+    path = str(tmp_path / "index.pkl")
+    built = PassageIndex.load_or_build(PASSAGES, path)
+    loaded = PassageIndex.load_or_build(PASSAGES, path)
+    assert loaded is not built
+    assert loaded.fingerprint == built.fingerprint
+    assert loaded.search("watery diarrhea", k=1)[0].passage.key == "cholera"
+
+
+@pytest.mark.skipif("LOCAL_INDEX_PATH" in os.environ, reason="index path overridden")
+def test_default_index_path_does_not_depend_on_cwd():
+    assert LOCAL_INDEX_PATH == os.path.join(ROOT, "passage_index.pkl")
+
+
+@pytest.fixture
+def actions(monkeypatch, tmp_path):
+    pytest.importorskip("rasa_sdk")
+    pytest.importorskip("aiohttp")
+    import actions
+
+    # A fresh index, saved under tmp_path rather than next to the code
+    monkeypatch.setattr(passage_index, "LOCAL_INDEX_PATH", str(tmp_path / "passage_index.pkl"))
+    monkeypatch.setattr(passage_index, "_indexes", {})
+    monkeypatch.setattr(actions, "_local_passage_index", None)
+    # No background warmup that could outlive the test and its index path
+    monkeypatch.setattr(actions, "_local_index_warming", True)
+    return actions
+
+
+def test_index_is_saved_under_the_configured_path(actions, tmp_path):
+    actions._retrieve_passage("why is my skin yellow")
+    assert (tmp_path / "passage_index.pkl").exists()
+
+
+def test_topicless_question_is_answered_without_going_upstream(actions, monkeypatch):
+    from rasa_sdk import Tracker
+    from rasa_sdk.executor import CollectingDispatcher
+
+    searched = []
+
+    async def search_health_info(query):
+        searched.append(query)
+        return None
+
+    monkeypatch.setattr(actions, "search_health_info", search_health_info)
+    tracker = Tracker("test", {}, {"text": "why is my skin yellow"}, [], False, None, {}, None)
+    dispatcher = CollectingDispatcher()
+    asyncio.run(actions.ActionAnswerHealthQuestion().run(dispatcher, tracker, {}))
+    assert searched == []
+    assert [message["text"] for message in dispatcher.messages] == [actions.HEALTH_TOPICS["jaundice"]]
+
+
+@pytest.mark.parametrize("question", ["cholesterol", "dehydration", "constipation", "cancel my appointment"])
+def test_questions_without_a_local_answer_retrieve_nothing(actions, question):
+    assert actions._retrieve_passage(question) is None
+
+
+@pytest.mark.parametrize("question, key", [
+    ("why is my skin yellow", "jaundice"),
+    ("frequent urination and excessive thirst", "diabetes"),
+    ("loss of smell and taste", "covid"),
+])
+def test_symptom_descriptions_retrieve_their_condition(actions, question, key):
+    assert actions._retrieve_passage(question).passage.key == key
+
+
+def test_shipped_threshold_keeps_precision_on_the_labelled_set(actions):
+    sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+    import retrieval_threshold
+
+    labels = retrieval_threshold.load_labels(retrieval_threshold.LABELS_PATH)
+    result = retrieval_threshold.evaluate(labels, actions.LOCAL_RETRIEVAL_MIN_SCORE)
+    assert result["precision"] >= 0.9
+    assert result["recall"] >= 0.5
+
+
+def test_importing_actions_does_not_start_the_warmup(actions):
+    code = "import threading, actions; print([t.name for t in threading.enumerate()])"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    assert "passage-index-warmup" not in out
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("rasa_sdk")
+pytest.importorskip("aiohttp")
+pytest.importorskip("apscheduler")
+
+import actions  # noqa: E402
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    urls = []
+
+    async def fetch_json(url, params=None, timeout=None):
+        urls.append(url)
+        return 200, {"cases": len(urls)}
+
+    monkeypatch.setattr(actions, "fetch_json", fetch_json)
+    return urls
+
+
+@pytest.fixture
+def store():
+    store = actions.SnapshotStore({"all": ("https://example.invalid/all", None)}, refresh_interval=0.05)
+    yield store
+    store.shutdown()
+
+
+def test_reads_on_one_loop_set_the_scheduler_up_once(store, fetches):
+    async def read_twice():
+        await store.get("all")
+        scheduler = store._scheduler
+        await store.get("all")
+        return scheduler
+
+    scheduler = asyncio.run(read_twice())
+    assert scheduler is not None
+    assert store._scheduler is scheduler
+
+
+def test_a_second_loop_gets_a_working_scheduler(store, fetches):
+    asyncio.run(store.get("all"))
+
+    async def read_then_wait():
+        data, _ = await store.get("all")
+        fetched = len(fetches)
+        # Only the scheduler refreshes while nobody reads
+        await asyncio.sleep(0.3)
+        return data, len(fetches) - fetched
+
+    data, scheduled = asyncio.run(read_then_wait())
+    assert data["cases"] >= 1
+    assert scheduled >= 2
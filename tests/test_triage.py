@@ -0,0 +1,96 @@
+import io
+import json
+import os
+
+import pytest
+
+from conftest import FIXTURES
+from triage import main, read_rows, triage_file, triage_text
+
+SAMPLE_CSV = os.path.join(FIXTURES, "complaints_sample.csv")
+SAMPLE_JSONL = os.path.join(FIXTURES, "complaints_sample.jsonl")
+
+
+def test_triage_text_flags_emergencies_and_ranks_severity():
+    assert triage_text("chest pain and shortness of breath") == {
+        "symptoms": ["breathlessness", "chest pain"],
+        "conditions": ["emergency"],
+        "severity": "emergency",
+        "emergency": True,
+    }
+    result = triage_text("I have fever, cough and body ache")
+    assert result["conditions"] == ["flu", "covid-19"]
+    assert result["severity"] == "high"
+    assert not result["emergency"]
+    assert triage_text("") == {"symptoms": [], "conditions": [], "severity": None, "emergency": False}
+
+
+def _triage(path, in_format, out_format, workers):
+    sink = io.StringIO()
+    with open(path, encoding="utf-8", newline="") as source:
+        stats = triage_file(
+            source, sink, in_format, out_format, "complaint", "call_id", workers=workers, chunk_size=2
+        )
+    return sink.getvalue(), stats
+
+
+@pytest.mark.parametrize("path, in_format", [(SAMPLE_CSV, "csv"), (SAMPLE_JSONL, "jsonl")])
+@pytest.mark.parametrize("out_format", ["jsonl", "csv"])
+def test_pooled_output_matches_in_process_output(path, in_format, out_format):
+    serial, serial_stats = _triage(path, in_format, out_format, workers=1)
+    pooled, pooled_stats = _triage(path, in_format, out_format, workers=2)
+    assert pooled == serial
+    assert pooled_stats["rows"] == serial_stats["rows"] == 8
+    assert pooled_stats["emergencies"] == serial_stats["emergencies"] == 1
+
+
+def test_csv_and_jsonl_inputs_agree():
+    from_csv, _ = _triage(SAMPLE_CSV, "csv", "jsonl", workers=1)
+    from_jsonl, _ = _triage(SAMPLE_JSONL, "jsonl", "jsonl", workers=1)
+    assert from_csv == from_jsonl
+    assert [json.loads(line)["id"] for line in from_csv.splitlines()] == [f"c-00{i}" for i in range(1, 9)]
+
+
+@pytest.mark.parametrize("line", ['{"note": "no text"}', '"free text"', '["text"]', "42", "null"])
+def test_rows_without_a_text_field_are_reported_by_number(line):
+    source = io.StringIO('{"text": "fever"}\n' + line + "\n")
+    with pytest.raises(ValueError, match=r"Row 2 has no 'text' field"):
+        list(read_rows(source, "jsonl", "text", None))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_bad_rows_are_skipped_and_counted(workers):
+    lines = [
+        '{"text": "fever and cough"}',
+        "[1]",
+        '{"text": 42}',
+        '{"text": {"complaint": "fever"}}',
+        "not json",
+        '{"text": null}',
+        '{"text": "chest pain and breathlessness"}',
+    ]
+    sink = io.StringIO()
+    stats = triage_file(io.StringIO("\n".join(lines) + "\n"), sink, "jsonl", "jsonl", workers=workers, chunk_size=2)
+    assert [json.loads(line)["id"] for line in sink.getvalue().splitlines()] == ["1", "3", "6", "7"]
+    assert stats["rows"] == 4
+    assert stats["skipped"] == 3
+    assert stats["errors"] == [
+        "Row 2 has no 'text' field (use --text-column)",
+        "Row 4 has a dict in 'text', not text",
+        "Row 5 is not valid JSON",
+    ]
+
+
+def test_cli_reports_skipped_rows_on_stderr(tmp_path, capsys):
+    path = tmp_path / "complaints.jsonl"
+    path.write_text('{"text": "fever"}\n[1]\n', encoding="utf-8")
+    main([str(path), "--workers", "1"])
+    out, err = capsys.readouterr()
+    assert len(out.splitlines()) == 1
+    assert "1 rows skipped" in err
+    assert "Row 2 has no 'text' field" in err
+
+
+def test_missing_csv_column_stops_the_run():
+    with pytest.raises(ValueError, match="No 'text' column"):
+        list(read_rows(io.StringIO("complaint\nfever\n"), "csv", "text", None))
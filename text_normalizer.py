@@ -0,0 +1,59 @@
+"""
+One normalisation pass for user messages, shared by every action.
+
+    normalize("  What is  DIABETES symptoms ") ->
+        text     = "what is diabetes symptoms"   NFKC, lower-cased, whitespace collapsed
+        query    = "diabetes"                    question framing stripped: topic / API lookup key
+        tokens   = ("what", "is", "diabetes", "symptoms")
+        keywords = ("diabetes", "symptoms")      tokens without stopwords
+
+NFKC folds full-width and compatibility forms ("ＢＰ", ligatures) into plain
+characters; Devanagari digits become ASCII, dandas become full stops, and
+zero-width joiners (common in Hindi/Marathi keyboard input) are dropped.
+Results are memoised on the raw text, so the several lookups a message goes
+through cost one pass.
+"""
+import os
+import re
+import unicodedata
+from functools import lru_cache
+from typing import NamedTuple, Text, Tuple
+
+NORMALIZE_CACHE_SIZE = int(os.getenv("NORMALIZE_CACHE_SIZE", "4096"))
+
+_CHAR_MAP = {
+    **{0x0966 + digit: str(digit) for digit in range(10)},  # ० - ९
+    ord("।"): ".",  # danda
+    ord("॥"): ".",  # double danda
+    **dict.fromkeys(map(ord, "\u200b\u200c\u200d\u2060\ufeff")),
+}
+_WHITESPACE_RE = re.compile(r"\s+")
+# \w alone would split Devanagari words at their vowel signs (combining marks)
+_TOKEN_RE = re.compile(r"(?:[^\W_]|[\u0900-\u0963\u0971-\u097f])+")
+_QUERY_PREFIX_RE = re.compile(
+    r"^(?:(?:what is|tell me about|tell about|info about|information on|info on|about|i have|my)\s+)+"
+)
+_QUERY_SUFFIX_RE = re.compile(r"(?:\s+(?:info|information|symptoms|symptom|disease))+$")
+
+STOPWORDS = frozenset("""
+a about am an and are be been can could did do does for from get give got had has have he her his how
+i if in is it its me my of on or our please she should so tell than that the their them there these
+they this to us was we were what when where which who why will with would you your
+""".split())
+
+
+class NormalizedText(NamedTuple):
+    text: Text
+    query: Text
+    tokens: Tuple[Text, ...]
+    keywords: Tuple[Text, ...]
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize(raw: Text) -> NormalizedText:
+    text = unicodedata.normalize("NFKC", raw or "").translate(_CHAR_MAP).lower()
+    text = _WHITESPACE_RE.sub(" ", text).strip()
+    query = _QUERY_SUFFIX_RE.sub("", _QUERY_PREFIX_RE.sub("", text)).strip()
+    tokens = tuple(_TOKEN_RE.findall(text))
+    keywords = tuple(token for token in tokens if token not in STOPWORDS)
+    return NormalizedText(text, query, tokens, keywords)
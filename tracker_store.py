@@ -0,0 +1,259 @@
+"""
+Pooled, batching SQL tracker store for Rasa.
+
+Drop-in alternative to Rasa's SQLTrackerStore (same one-row-per-event layout):
+
+- one SQLAlchemy engine per process with a real connection pool
+  (QueuePool even for SQLite files, pre-ping, recycle)
+- SQLite runs in WAL mode with synchronous=NORMAL and a busy timeout, so
+  readers never block the writer
+- saves from concurrent conversations are group-committed: events queued
+  within `flush_interval` seconds (or up to `batch_size` rows) are written in a
+  single transaction, and each save() returns once its batch is durable
+- the per-conversation event count is remembered from retrieve(), so save()
+  does not need a COUNT query on the hot path; only the `known_counts_size`
+  most recently active conversations are remembered, the rest fall back to
+  the COUNT
+
+endpoints.yml:
+
+    tracker_store:
+      type: tracker_store.PooledSQLTrackerStore
+      dialect: "sqlite"
+      db: "tracker_store.db"
+      # dialect: "postgresql"
+      # url: "localhost"
+      # port: 5432
+      # username: "rasa"
+      # password: "rasa"
+      # db: "rasa"
+"""
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Text
+
+import sqlalchemy as sa
+from sqlalchemy.engine.url import URL
+from sqlalchemy.pool import QueuePool
+
+from rasa.core.brokers.broker import EventBroker
+from rasa.core.tracker_store import TrackerStore
+from rasa.shared.core.domain import Domain
+from rasa.shared.core.events import SessionStarted
+from rasa.shared.core.trackers import DialogueStateTracker
+
+logger = logging.getLogger(__name__)
+
+metadata = sa.MetaData()
+
+events_table = sa.Table(
+    "events",
+    metadata,
+    sa.Column("id", sa.Integer, sa.Sequence("events_seq"), primary_key=True),
+    sa.Column("sender_id", sa.String(255), nullable=False, index=True),
+    sa.Column("type_name", sa.String(255), nullable=False),
+    sa.Column("timestamp", sa.Float),
+    sa.Column("intent_name", sa.String(255)),
+    sa.Column("action_name", sa.String(255)),
+    sa.Column("data", sa.Text),
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection: Any, _: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=30000")
+    cursor.close()
+
+
+def create_engine(
+    dialect: Text = "sqlite",
+    host: Optional[Text] = None,
+    port: Optional[int] = None,
+    db: Text = "rasa.db",
+    username: Optional[Text] = None,
+    password: Optional[Text] = None,
+    pool_size: int = 10,
+    max_overflow: int = 20,
+    pool_recycle: int = 1800,
+) -> sa.engine.Engine:
+    if dialect == "sqlite":
+        engine = sa.create_engine(
+            f"sqlite:///{db}",
+            poolclass=QueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            connect_args={"check_same_thread": False, "timeout": 30},
+        )
+        sa.event.listen(engine, "connect", _set_sqlite_pragmas)
+        return engine
+
+    url = URL.create(dialect, username=username, password=password, host=host, port=port, database=db)
+    return sa.create_engine(
+        url,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=True,
+        pool_recycle=pool_recycle,
+    )
+
+
+class PooledSQLTrackerStore(TrackerStore):
+    """SQL tracker store with pooled connections and group-committed event appends"""
+
+    def __init__(
+        self,
+        domain: Optional[Domain] = None,
+        event_broker: Optional[EventBroker] = None,
+        dialect: Text = "sqlite",
+        host: Optional[Text] = None,
+        url: Optional[Text] = None,
+        port: Optional[int] = None,
+        db: Text = "rasa.db",
+        username: Optional[Text] = None,
+        password: Optional[Text] = None,
+        pool_size: int = 10,
+        max_overflow: int = 20,
+        batch_size: int = 500,
+        flush_interval: float = 0.005,
+        known_counts_size: int = 10000,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(domain, event_broker, **kwargs)
+        self.engine = create_engine(
+            dialect, host or url, int(port) if port else None, db, username, password,
+            int(pool_size), int(max_overflow),
+        )
+        metadata.create_all(self.engine)
+        self.batch_size = int(batch_size)
+        self.flush_interval = float(flush_interval)
+        # sender_id -> how many of the tracker's events (as last retrieved or
+        # saved by this process) are already stored; LRU-bounded
+        self._known_counts: "OrderedDict[Text, int]" = OrderedDict()
+        self.known_counts_size = int(known_counts_size)
+        self._pending: List[Dict[Text, Any]] = []
+        self._batch_future: Optional["asyncio.Future[None]"] = None
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    def _remember_count(self, sender_id: Text, count: int) -> None:
+        self._known_counts[sender_id] = count
+        self._known_counts.move_to_end(sender_id)
+        while len(self._known_counts) > self.known_counts_size:
+            self._known_counts.popitem(last=False)
+
+    # ----------------------------------------
+    # Reads
+    # ----------------------------------------
+    def _session_query(self, sender_id: Text, all_sessions: bool) -> Any:
+        query = sa.select(events_table.c.data).where(events_table.c.sender_id == sender_id)
+        if not all_sessions:
+            last_session = (
+                sa.select(sa.func.max(events_table.c.id))
+                .where(events_table.c.sender_id == sender_id)
+                .where(events_table.c.type_name == SessionStarted.type_name)
+                .scalar_subquery()
+            )
+            query = query.where(events_table.c.id >= sa.func.coalesce(last_session, 0))
+        return query.order_by(events_table.c.id)
+
+    def _load_events(self, sender_id: Text, all_sessions: bool) -> List[Dict[Text, Any]]:
+        with self.engine.connect() as conn:
+            rows = conn.execute(self._session_query(sender_id, all_sessions)).scalars().all()
+        return [json.loads(data) for data in rows]
+
+    async def _retrieve(self, sender_id: Text, all_sessions: bool) -> Optional[DialogueStateTracker]:
+        loop = asyncio.get_running_loop()
+        events = await loop.run_in_executor(None, self._load_events, sender_id, all_sessions)
+        if not all_sessions:
+            self._remember_count(sender_id, len(events))
+        if not events:
+            return None
+        return DialogueStateTracker.from_dict(sender_id, events, self.domain.slots)
+
+    async def retrieve(self, sender_id: Text) -> Optional[DialogueStateTracker]:
+        return await self._retrieve(sender_id, all_sessions=False)
+
+    async def retrieve_full_tracker(self, conversation_id: Text) -> Optional[DialogueStateTracker]:
+        return await self._retrieve(conversation_id, all_sessions=True)
+
+    async def keys(self) -> Iterable[Text]:
+        def _keys() -> List[Text]:
+            with self.engine.connect() as conn:
+                return conn.execute(sa.select(events_table.c.sender_id).distinct()).scalars().all()
+
+        return await asyncio.get_running_loop().run_in_executor(None, _keys)
+
+    # ----------------------------------------
+    # Writes
+    # ----------------------------------------
+    def _count_session_events(self, sender_id: Text) -> int:
+        query = sa.select(sa.func.count()).select_from(self._session_query(sender_id, False).subquery())
+        with self.engine.connect() as conn:
+            return conn.execute(query).scalar_one()
+
+    async def save(self, tracker: DialogueStateTracker) -> None:
+        await self.stream_events(tracker)
+
+        sender_id = tracker.sender_id
+        known = self._known_counts.get(sender_id)
+        if known is None:
+            loop = asyncio.get_running_loop()
+            known = await loop.run_in_executor(None, self._count_session_events, sender_id)
+
+        tracker_events = list(tracker.events)
+        new_events = tracker_events[known:]
+        if not new_events:
+            return
+
+        rows = [
+            {
+                "sender_id": sender_id,
+                "type_name": event.type_name,
+                "timestamp": event.timestamp,
+                "intent_name": getattr(event, "intent_name", None),
+                "action_name": getattr(event, "action_name", None),
+                "data": json.dumps(event.as_dict()),
+            }
+            for event in new_events
+        ]
+        self._remember_count(sender_id, len(tracker_events))
+        await self._enqueue(rows)
+
+    async def _enqueue(self, rows: List[Dict[Text, Any]]) -> None:
+        loop = asyncio.get_running_loop()
+        self._pending.extend(rows)
+        if self._batch_future is None:
+            self._batch_future = loop.create_future()
+            self._flush_handle = loop.call_later(self.flush_interval, self._start_flush)
+        batch = self._batch_future
+        if len(self._pending) >= self.batch_size:
+            self._start_flush()
+        await batch
+
+    def _start_flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        rows, self._pending = self._pending, []
+        batch, self._batch_future = self._batch_future, None
+        if batch is not None:
+            asyncio.ensure_future(self._write(rows, batch))
+
+    async def _write(self, rows: List[Dict[Text, Any]], batch: "asyncio.Future[None]") -> None:
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._insert, rows)
+        except Exception as e:
+            logger.exception("Failed to write %d tracker events", len(rows))
+            # Force a COUNT on the next save for the affected conversations
+            for row in rows:
+                self._known_counts.pop(row["sender_id"], None)
+            batch.set_exception(e)
+        else:
+            batch.set_result(None)
+
+    def _insert(self, rows: List[Dict[Text, Any]]) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(events_table.insert(), rows)
@@ -0,0 +1,271 @@
+"""
+Bulk offline triage of free-text complaints, without Rasa.
+
+Runs every row through the same steps as action_symptom_checker: message
+normalisation (text_normalizer), symptom extraction (symptom_extraction) and
+the condition rules (symptom_rules.yml). For each row it writes the symptoms,
+the matched conditions, the highest severity and an emergency flag. (The
+action's redirect of "what is ..." questions to the health answer is not
+applied: every row is triaged.)
+
+Input is CSV (one column holds the complaint) or JSONL (one field holds it),
+read as a stream. Rows are sent in chunks to a process pool with a bounded
+number of chunks in flight, so memory stays flat on large exports. Output
+keeps input order and is JSONL or CSV, chosen by file extension. Rows that
+cannot be triaged (not a JSON object, no text field, text that is not text)
+are skipped and counted rather than stopping the run; the count, the first
+few row errors and the throughput are reported on stderr.
+
+    python triage.py complaints_1075.csv -o triaged.csv --text-column complaint --id-column call_id
+    python triage.py complaints.jsonl --workers 8 > triaged.jsonl
+
+From Python: triage_text(text) for one complaint, triage_file(...) for a file.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Deque, Dict, IO, Iterator, List, Optional, Sequence, Text, Tuple
+
+from symptom_extraction import SYMPTOM_EXTRACTOR
+from symptom_rules import SEVERITIES, SYMPTOM_RULES_PATH, ConditionRules
+from text_normalizer import normalize
+
+OUTPUT_FIELDS = ("id", "symptoms", "conditions", "severity", "emergency")
+
+# Row errors kept for the report; the rest are only counted
+MAX_REPORTED_ERRORS = 20
+
+_rules: Optional[ConditionRules] = None
+
+
+def _init_worker(rules_path: Text) -> None:
+    global _rules
+    _rules = ConditionRules.load(rules_path)
+
+
+def triage_text(text: Text, rules: Optional[ConditionRules] = None) -> Dict[Text, Any]:
+    """Symptoms, fired conditions, highest severity and emergency flag for one complaint"""
+    global _rules
+    if rules is None:
+        if _rules is None:
+            _rules = ConditionRules.load(SYMPTOM_RULES_PATH)
+        rules = _rules
+    symptoms = SYMPTOM_EXTRACTOR.symptoms(normalize(text).text, "checker")
+    fired = rules.evaluate(symptoms)
+    severity = min((SEVERITIES.index(rule.severity) for rule in fired), default=None)
+    return {
+        "symptoms": symptoms,
+        "conditions": [rule.condition for rule in fired],
+        "severity": SEVERITIES[severity] if severity is not None else None,
+        "emergency": severity == 0,
+    }
+
+
+def _triage_chunk(rows: List[Tuple[Text, Text]]) -> List[Dict[Text, Any]]:
+    return [dict(id=row_id, **triage_text(text)) for row_id, text in rows]
+
+
+def _parse_row(
+    number: int, record: Any, fmt: Text, text_field: Text, id_field: Optional[Text]
+) -> Tuple[Text, Text]:
+    if fmt != "csv":
+        try:
+            record = json.loads(record)
+        except ValueError:
+            raise ValueError(f"Row {number} is not valid JSON") from None
+    if not isinstance(record, dict) or text_field not in record:
+        raise ValueError(f"Row {number} has no {text_field!r} field (use --text-column)")
+    text = record[text_field]
+    if text is None:
+        text = ""
+    elif isinstance(text, (int, float)) and not isinstance(text, bool):
+        text = str(text)
+    elif not isinstance(text, str):
+        raise ValueError(f"Row {number} has a {type(text).__name__} in {text_field!r}, not text")
+    row_id = record.get(id_field) if id_field else None
+    return str(row_id if row_id is not None else number), text
+
+
+def read_rows(
+    f: IO[Text],
+    fmt: Text,
+    text_field: Text,
+    id_field: Optional[Text],
+    on_error: Optional[Callable[[Text], None]] = None,
+) -> Iterator[Tuple[Text, Text]]:
+    """
+    (row id, complaint text) pairs; the id defaults to the 1-based row number.
+    A malformed row raises ValueError, or, given `on_error`, is skipped and
+    its message passed to on_error.
+    """
+    records: Iterator[Any]
+    if fmt == "csv":
+        reader = csv.DictReader(f)
+        # A missing column is a wrong --text-column, not a few bad rows
+        if reader.fieldnames is not None and text_field not in reader.fieldnames:
+            raise ValueError(f"No {text_field!r} column (use --text-column)")
+        records = reader
+    else:
+        records = (line for line in f if line.strip())
+    for number, record in enumerate(records, 1):
+        try:
+            row = _parse_row(number, record, fmt, text_field, id_field)
+        except ValueError as e:
+            if on_error is None:
+                raise
+            on_error(str(e))
+            continue
+        yield row
+
+
+def _chunks(rows: Iterator[Tuple[Text, Text]], size: int) -> Iterator[List[Tuple[Text, Text]]]:
+    chunk: List[Tuple[Text, Text]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class _Writer:
+    def __init__(self, f: IO[Text], fmt: Text):
+        self.f = f
+        self.csv = csv.DictWriter(f, OUTPUT_FIELDS) if fmt == "csv" else None
+        if self.csv:
+            self.csv.writeheader()
+
+    def write(self, result: Dict[Text, Any]) -> None:
+        if self.csv:
+            self.csv.writerow(dict(
+                result,
+                symptoms="; ".join(result["symptoms"]),
+                conditions="; ".join(result["conditions"]),
+                severity=result["severity"] or "",
+                emergency=int(result["emergency"]),
+            ))
+        else:
+            self.f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+def triage_file(
+    source: IO[Text],
+    sink: IO[Text],
+    in_format: Text = "csv",
+    out_format: Text = "jsonl",
+    text_field: Text = "text",
+    id_field: Optional[Text] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 500,
+    rules_path: Text = SYMPTOM_RULES_PATH,
+) -> Dict[Text, Any]:
+    """Triage every row of source into sink; returns row, emergency, skipped-row and timing totals"""
+    start = time.perf_counter()
+    writer = _Writer(sink, out_format)
+    workers = workers or os.cpu_count() or 1
+    rows = emergencies = skipped = 0
+    errors: List[Text] = []
+
+    def skip(error: Text) -> None:
+        nonlocal skipped
+        skipped += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append(error)
+
+    chunks = _chunks(read_rows(source, in_format, text_field, id_field, skip), chunk_size)
+
+    def drain(results: List[Dict[Text, Any]]) -> None:
+        nonlocal rows, emergencies
+        for result in results:
+            writer.write(result)
+            emergencies += result["emergency"]
+        rows += len(results)
+
+    if workers == 1:
+        _init_worker(rules_path)
+        for chunk in chunks:
+            drain(_triage_chunk(chunk))
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(rules_path,)) as pool:
+            # Two chunks per worker in flight: enough to keep the pool busy, bounded memory
+            pending: Deque[Future] = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(_triage_chunk, chunk))
+                if len(pending) >= 2 * workers:
+                    drain(pending.popleft().result())
+            while pending:
+                drain(pending.popleft().result())
+
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "emergencies": emergencies,
+        "skipped": skipped,
+        "errors": errors,
+        "seconds": elapsed,
+        "rows_per_second": rows / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def _format_of(path: Optional[Text], override: Optional[Text], default: Text) -> Text:
+    if override:
+        return override
+    if path and path.lower().endswith(".csv"):
+        return "csv"
+    if path and path.lower().endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    return default
+
+
+def main(argv: Optional[Sequence[Text]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Offline symptom triage of CSV/JSONL complaints")
+    parser.add_argument("input", help="CSV or JSONL file, '-' for stdin")
+    parser.add_argument("-o", "--output", help="CSV or JSONL file (default: JSONL on stdout)")
+    parser.add_argument("--input-format", choices=("csv", "jsonl"))
+    parser.add_argument("--output-format", choices=("csv", "jsonl"))
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--id-column")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="1 runs in-process")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--rules", default=SYMPTOM_RULES_PATH)
+    args = parser.parse_args(argv)
+
+    in_format = _format_of(None if args.input == "-" else args.input, args.input_format, "csv")
+    out_format = _format_of(args.output, args.output_format, "jsonl")
+    # utf-8-sig drops the byte-order mark spreadsheet exports tend to start with
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8-sig", newline="")
+    sink = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        stats = triage_file(
+            source, sink, in_format, out_format, args.text_column, args.id_column,
+            args.workers, args.chunk_size, args.rules,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    print(
+        f"{stats['rows']} rows in {stats['seconds']:.2f}s ({stats['rows_per_second']:,.0f} rows/sec), "
+        f"{stats['emergencies']} flagged emergency",
+        file=sys.stderr,
+    )
+    if stats["skipped"]:
+        print(f"{stats['skipped']} rows skipped:", file=sys.stderr)
+        for error in stats["errors"]:
+            print(f"  {error}", file=sys.stderr)
+        if stats["skipped"] > len(stats["errors"]):
+            print(f"  ... and {stats['skipped'] - len(stats['errors'])} more", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()